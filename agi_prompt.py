@@ -4,14 +4,16 @@ import random
 import readline
 import time
 
+from storage.backends import open_storage
+
 ENTITY_FILE = "entities.json"
 TRAINING_FILE = "training_knowledge.json"
 
 # === Load Entities ===
 def load_entities():
-    if os.path.exists(ENTITY_FILE):
-        with open(ENTITY_FILE, "r") as f:
-            return json.load(f)
+    storage = open_storage(ENTITY_FILE)
+    if storage.exists():
+        return storage.load_all()
     else:
         print(f"[⚠️] No entities found in {ENTITY_FILE}.")
         return {}
@@ -0,0 +1,76 @@
+import argparse
+import json
+import random
+import time
+
+from memory.memory_crystal import MemoryCrystal
+from memory.motif_vocabulary import HASHERS, VOCABULARY
+
+OUTPUT_FILE = "benchmark_crystal_embed.json"
+CRYSTALS = 20_000
+BATCH = 8  # motifs embedded per crystal
+VOCABULARY_SIZE = 2_000
+SEED = 1234
+
+def motif_batches(crystals, batch=BATCH, vocabulary=VOCABULARY_SIZE, seed=SEED):
+    """Batches drawn from a shared lore vocabulary, repeats included, like blooms and injections."""
+    rng = random.Random(seed)
+    words = [f"motif-{i}" for i in range(vocabulary)]
+    return [[rng.choice(words) for _ in range(batch)] for _ in range(crystals)]
+
+def measure_hashers(texts):
+    results = {}
+    for name, hasher in HASHERS.items():
+        start = time.perf_counter()
+        for text in texts:
+            hasher(text)
+        seconds = time.perf_counter() - start
+        results[name] = {"seconds": round(seconds, 4), "keys_per_sec": round(len(texts) / seconds)}
+    return results
+
+def embed_one_by_one(batches):
+    for batch in batches:
+        crystal = MemoryCrystal()
+        for text in batch:
+            crystal.embed(text)
+
+def embed_batched(batches):
+    for batch in batches:
+        MemoryCrystal().embed_many(batch)
+
+def measure_embed(batches):
+    motifs = sum(len(b) for b in batches)
+    results = {}
+    for label, run in (("embed", embed_one_by_one), ("embed_many", embed_batched)):
+        start = time.perf_counter()
+        run(batches)
+        seconds = time.perf_counter() - start
+        results[label] = {"seconds": round(seconds, 4), "motifs_per_sec": round(motifs / seconds)}
+    return results
+
+def run_benchmark(crystals=CRYSTALS):
+    texts = [f"cold motif {i}" for i in range(crystals)]
+    batches = motif_batches(crystals)
+    VOCABULARY.ids_of(t for b in batches for t in b)  # warm: time the crystal, not first-sight hashing
+    hashers = measure_hashers(texts)
+    embed = measure_embed(batches)
+
+    print(f"\n🔑 Motif keys — {len(texts):,} distinct texts")
+    print("═══════════════════════════════════════════════════")
+    for name, r in hashers.items():
+        print(f"{name:<10} {r['keys_per_sec']:>12,} keys/s")
+    print(f"\n💎 Embed throughput — {crystals:,} crystals × {BATCH} motifs")
+    print("═══════════════════════════════════════════════════")
+    for label, r in embed.items():
+        print(f"{label:<10} {r['motifs_per_sec']:>12,} motifs/s  {r['seconds']:.3f}s")
+    print("═══════════════════════════════════════════════════")
+
+    with open(OUTPUT_FILE, "w") as f:
+        json.dump({"crystals": crystals, "batch": BATCH, "hashers": hashers, "embed": embed}, f, indent=2)
+    print(f"📁 Saved benchmark results to {OUTPUT_FILE}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Motif hasher and crystal embed throughput")
+    parser.add_argument("--crystals", type=int, default=CRYSTALS)
+    args = parser.parse_args()
+    run_benchmark(args.crystals)
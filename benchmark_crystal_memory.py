@@ -0,0 +1,99 @@
+import argparse
+import gc
+import hashlib
+import json
+import random
+import time
+import tracemalloc
+from datetime import datetime
+
+from memory.memory_crystal import MemoryCrystal
+from memory.motif_vocabulary import VOCABULARY
+
+OUTPUT_FILE = "benchmark_crystal_memory.json"
+POPULATION = 100_000
+MOTIFS_PER_CRYSTAL = 6
+ARCHETYPE_MOTIFS = [
+    "veil", "glyph", "echo", "threshold", "stars", "mirror", "ash", "bloom",
+    "spiral", "hollow", "lantern", "tide", "root", "ember", "crown", "void",
+]
+VOCABULARY_SIZE = 100_000  # distinct motifs interned before the large-vocabulary run
+SEED = 1234
+
+def legacy_crystal(texts):
+    """The per-crystal layout before interning: hex keys, text and ISO time per fragment."""
+    fragments, vault = {}, []
+    for text in texts:
+        h = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if h not in fragments:
+            fragments[h] = {"text": text, "added_time": datetime.now().isoformat()}
+            vault.append(h)
+    return {"fragments": fragments, "vault": vault, "rewrite_log": []}
+
+def interned_crystal(texts):
+    crystal = MemoryCrystal()
+    for text in texts:
+        crystal.embed(text)
+    return crystal
+
+def large_vocabulary(size=VOCABULARY_SIZE):
+    """Distinct motifs as a long-running world accumulates them: archetypes with epithets."""
+    return [f"{ARCHETYPE_MOTIFS[i % len(ARCHETYPE_MOTIFS)]} of the {i // len(ARCHETYPE_MOTIFS)}th tide"
+            for i in range(size)]
+
+def motif_lists(population, pool=ARCHETYPE_MOTIFS, per_crystal=MOTIFS_PER_CRYSTAL, seed=SEED):
+    """Motifs drawn from pool, decoded separately per entity as a loader would."""
+    rng = random.Random(seed)
+    return [[m.encode("utf-8").decode("utf-8") for m in rng.sample(pool, per_crystal)]
+            for _ in range(population)]
+
+def measure(label, build, population, pool=ARCHETYPE_MOTIFS):
+    gc.collect()
+    tracemalloc.start()
+    texts = motif_lists(population, pool)  # traced: whatever a layout keeps of them counts
+    start = time.perf_counter()
+    crystals = [build(t) for t in texts]
+    elapsed = time.perf_counter() - start
+    del texts
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del crystals
+    return {
+        "label": label,
+        "crystals": population,
+        "build_sec": round(elapsed, 2),
+        "total_MB": round(current / (1024 ** 2), 2),
+        "bytes_per_crystal": round(current / population),
+    }
+
+def compare(title, population, pool):
+    before = measure("per-crystal strings (before)", legacy_crystal, population, pool)
+    after = measure("interned motif ids (after)", interned_crystal, population, pool)
+
+    print(f"\n💎 Crystal memory footprint — {title}: {population:,} crystals × {MOTIFS_PER_CRYSTAL} motifs")
+    print("═══════════════════════════════════════════════════")
+    for r in (before, after):
+        print(f"{r['label']:<30} {r['bytes_per_crystal']:>6} B/crystal  {r['total_MB']:>8} MB  {r['build_sec']}s")
+    print("═══════════════════════════════════════════════════")
+    print(f"💾 Saved {before['bytes_per_crystal'] - after['bytes_per_crystal']} B per crystal")
+    return {"vocabulary": len(VOCABULARY), "before": before, "after": after}
+
+def run_benchmark(population=POPULATION, vocabulary=VOCABULARY_SIZE):
+    results = {"archetypes": compare(f"{len(ARCHETYPE_MOTIFS)} archetype motifs", population, ARCHETYPE_MOTIFS)}
+
+    pool = large_vocabulary(vocabulary)
+    VOCABULARY.ids_of(pool)  # interned up front, outside the trace: the table is shared process-wide
+    results["large_vocabulary"] = compare(f"{len(VOCABULARY):,} interned motifs", population, pool)
+    print()
+
+    with open(OUTPUT_FILE, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"📁 Saved benchmark results to {OUTPUT_FILE}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Crystal memory before/after motif interning")
+    parser.add_argument("--entities", type=int, default=POPULATION)
+    parser.add_argument("--vocabulary", type=int, default=VOCABULARY_SIZE)
+    args = parser.parse_args()
+    run_benchmark(args.entities, args.vocabulary)
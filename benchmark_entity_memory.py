@@ -0,0 +1,135 @@
+import gc
+import hashlib
+import json
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+
+from core.emotion_engine import DEFAULT_LEVELS
+from core.entity import Entity
+from core.entity_store import EntityStore
+from inventory.inventory_engine import Inventory
+
+OUTPUT_FILE = "benchmark_entity_memory.json"
+POPULATION = 100_000
+
+SAMPLE_RECORD = {
+    "name": "K7Q2Z",
+    "archetype": "mystic",
+    "memory_snapshot": "veil\nstars\nthreshold\necho",
+    "current_memory": "veil\nstars\nthreshold\necho",
+    "memory": ["veil", "stars", "threshold", "echo"],
+    "tokens": ["wonder", "awe", "regret"],
+    "stats": {"sd": 0.7, "ess": 0.9},
+    "drift_level": 0.21,
+    "status": "active",
+    "inventory": [],
+}
+
+# === The entity as it was before the store and lazy subsystems (baseline) ===
+class BaselineCrystal:
+    def __init__(self):
+        self.fragments = {}
+        self.vault = []
+        self.rewrite_log = []
+
+    def hash_motif(self, text):
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class BaselineEmotion:
+    def __init__(self):
+        self.levels = DEFAULT_LEVELS.copy()
+
+class BaselineDream:
+    def __init__(self):
+        self.current_layer = "active"
+        self.entered = datetime.now()
+        self.cycles_in = 0
+        self.layer_log = []
+
+class BaselineEntity:
+    def __init__(self, name=None, memory_snapshot="", archetype="generic"):
+        self.name = name or 'Unnamed'
+        self.archetype = archetype or 'unknown'
+        self.memory_snapshot = memory_snapshot
+        self.current_memory = memory_snapshot
+        self.memory = []
+        self.tokens = []
+        self.stats = {'sd': 0, 'ess': 0}
+        self.id = str(uuid.uuid4())[:8]
+        self.drift_level = 0.0
+        self.status = "active"
+        self.crystal = BaselineCrystal()
+        self.emotion = BaselineEmotion()
+        self.dream = BaselineDream()
+        self.inventory = Inventory()
+
+    @staticmethod
+    def from_dict(data, store=None):
+        e = BaselineEntity(
+            name=data.get("name", "Unnamed"),
+            memory_snapshot=data.get("memory_snapshot", ""),
+            archetype=data.get("archetype", "generic")
+        )
+        e.id = data.get("id", str(uuid.uuid4())[:8])
+        e.current_memory = data.get("current_memory", e.memory_snapshot)
+        e.memory = data.get("memory", [])
+        e.tokens = data.get("tokens", [])
+        e.stats = data.get("stats", {"sd": 0, "ess": 0})
+        e.drift_level = data.get("drift_level", 0.0)
+        e.status = data.get("status", "active")
+        if "inventory" in data:
+            e.inventory = Inventory.from_dict({"items": data["inventory"]})
+        return e
+
+def materialize(entity):
+    """Touch every subsystem: the worst case for the lazy entity."""
+    entity.metadata
+    entity.crystal
+    entity.emotion
+    entity.dream
+    entity.inventory
+
+def measure(label, population, cls=Entity, eager=False):
+    gc.collect()
+    tracemalloc.start()  # before the store: its column arrays count too
+    start = time.perf_counter()
+    store = EntityStore(capacity=population) if cls is Entity else None
+    entities = []
+    for i in range(population):
+        record = dict(SAMPLE_RECORD, id=f"{i:08x}")
+        e = cls.from_dict(record, store=store)
+        if eager:
+            materialize(e)
+        entities.append(e)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "label": label,
+        "entities": population,
+        "load_sec": round(elapsed, 2),
+        "total_MB": round(current / (1024 ** 2), 2),
+        "bytes_per_entity": round(current / population),
+    }
+
+def run_benchmark(population=POPULATION):
+    before = measure("baseline entity (before)", population, cls=BaselineEntity)
+    lazy = measure("lazy, slotted (after)", population)
+    touched = measure("after, subsystems touched", population, eager=True)
+
+    print(f"\n📏 Entity memory footprint — {population:,} loaded entities")
+    print("═══════════════════════════════════════════════════")
+    for r in (before, lazy, touched):
+        print(f"{r['label']:<28} {r['bytes_per_entity']:>6} B/entity  {r['total_MB']:>8} MB  {r['load_sec']}s")
+    print("═══════════════════════════════════════════════════")
+    print(f"💾 Saved {before['bytes_per_entity'] - lazy['bytes_per_entity']} B per entity\n")
+
+    with open(OUTPUT_FILE, "w") as f:
+        json.dump({"before": before, "lazy": lazy, "touched": touched}, f, indent=2)
+    print(f"📁 Saved benchmark results to {OUTPUT_FILE}")
+
+if __name__ == "__main__":
+    run_benchmark()
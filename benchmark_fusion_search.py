@@ -0,0 +1,68 @@
+import argparse
+import json
+import random
+import time
+
+from core.fusion_engine import rank_pairs
+
+OUTPUT_FILE = "benchmark_fusion_search.json"
+POPULATION = 10_000
+VOCABULARY = 3_000
+FAMILIES = 400  # entities drawn from one family share most of their glyphs
+SEED = 1234
+
+def synthetic_glyph_sets(population, vocabulary=VOCABULARY, families=FAMILIES, seed=SEED):
+    """Glyph sets with near-duplicate families, like crystals seeded from shared lore."""
+    rng = random.Random(seed)
+    glyphs = [f"glyph-{i}" for i in range(vocabulary)]
+    roots = [set(rng.sample(glyphs, rng.randint(4, 10))) for _ in range(families)]
+    sets = []
+    for _ in range(population):
+        glyph_set = set(rng.choice(roots))
+        if rng.random() < 0.5:
+            glyph_set.discard(rng.choice(sorted(glyph_set)))
+        if rng.random() < 0.5:
+            glyph_set.add(rng.choice(glyphs))
+        sets.append(glyph_set)
+    return sets
+
+def measure(items, glyph_sets, method):
+    start = time.perf_counter()
+    ranked = rank_pairs(items, glyph_sets, method=method)
+    return time.perf_counter() - start, [(a, b, c) for a, b, _, c in ranked]
+
+def run_benchmark(population=POPULATION, seed=SEED):
+    glyph_sets = synthetic_glyph_sets(population, seed=seed)
+    items = list(range(population))
+    results = {}
+    reference = None
+    for method in ("brute", "index", "lsh"):
+        seconds, ranked = measure(items, glyph_sets, method)
+        if reference is None:
+            reference = ranked
+        found = set(ranked)
+        results[method] = {
+            "seconds": round(seconds, 4),
+            "pairs": len(ranked),
+            "identical_to_brute": ranked == reference,
+            "recall": round(len(found & set(reference)) / len(reference), 4) if reference else 1.0,
+        }
+
+    print(f"\n🔗 Fusion pair search — {population:,} entities")
+    print("═══════════════════════════════════════════════════")
+    for method, r in results.items():
+        speedup = results["brute"]["seconds"] / r["seconds"] if r["seconds"] else 0.0
+        match = "identical" if r["identical_to_brute"] else f"recall {r['recall']:.2%}"
+        print(f"{method:<6} {r['seconds']:>9.3f}s  ×{speedup:7.1f}  {r['pairs']:,} pairs  {match}")
+    print("═══════════════════════════════════════════════════")
+
+    with open(OUTPUT_FILE, "w") as f:
+        json.dump({"population": population, "results": results}, f, indent=2)
+    print(f"📁 Saved benchmark results to {OUTPUT_FILE}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Brute-force vs indexed fusion pair search")
+    parser.add_argument("--entities", type=int, default=POPULATION)
+    parser.add_argument("--seed", type=int, default=SEED)
+    args = parser.parse_args()
+    run_benchmark(args.entities, args.seed)
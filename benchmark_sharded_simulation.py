@@ -0,0 +1,60 @@
+import argparse
+import json
+import logging
+import os
+
+from core.sharded_simulation import ShardedSimulation
+
+OUTPUT_FILE = "benchmark_sharded_simulation.json"
+POPULATION = 200_000
+TICKS = 5
+SEED = 1234
+
+def worker_counts(max_workers):
+    counts, n = [], 1
+    while n < max_workers:
+        counts.append(n)
+        n *= 2
+    return counts + [max_workers]
+
+def measure(population, workers, ticks, seed):
+    with ShardedSimulation(population, workers, seed=seed) as sim:
+        report = sim.run(ticks)
+        report["digest"] = sim.digest()
+    return report
+
+def run_benchmark(population=POPULATION, ticks=TICKS, max_workers=None, seed=SEED):
+    logging.disable(logging.WARNING)
+    max_workers = max_workers or os.cpu_count() or 1
+    results = []
+    for workers in worker_counts(max_workers):
+        report = measure(population, workers, ticks, seed)
+        results.append(report)
+
+    base = results[0]["entity_ticks_per_sec"]
+    print(f"\n🧮 Sharded simulation scaling — {population:,} entities × {ticks} ticks")
+    print("═══════════════════════════════════════════════════")
+    for r in results:
+        speedup = r["entity_ticks_per_sec"] / base if base else 0.0
+        efficiency = speedup / r["workers"]
+        r["speedup"] = round(speedup, 2)
+        r["efficiency"] = round(efficiency, 2)
+        print(f"{r['workers']:>3} workers  {r['entity_ticks_per_sec']:>12,} entity-ticks/s  "
+              f"×{speedup:5.2f}  ({efficiency:.0%} efficient)")
+    print("═══════════════════════════════════════════════════")
+
+    reproducible = len({r["digest"] for r in results}) == 1
+    print(f"🔁 Same seed, any worker count → identical state: {'yes' if reproducible else 'NO'}\n")
+
+    with open(OUTPUT_FILE, "w") as f:
+        json.dump({"results": results, "reproducible": reproducible}, f, indent=2)
+    print(f"📁 Saved benchmark results to {OUTPUT_FILE}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scaling benchmark for the sharded simulation")
+    parser.add_argument("--entities", type=int, default=POPULATION)
+    parser.add_argument("--ticks", type=int, default=TICKS)
+    parser.add_argument("--max-workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=SEED)
+    args = parser.parse_args()
+    run_benchmark(args.entities, args.ticks, args.max_workers, args.seed)
@@ -83,17 +83,17 @@ class Village:
             return True
         return False
 
-    def tick(self):
+    def tick(self, rng=random):
         """Simulate one passage of time in the village."""
         # Simulate drift and morale fluctuation
         old_drift = self.drift
-        self.drift = max(0.0, self.drift + random.uniform(-0.01, 0.03))
-        if self.drift > 0.5 and random.random() < 0.2:
+        self.drift = max(0.0, self.drift + rng.uniform(-0.01, 0.03))
+        if self.drift > 0.5 and rng.random() < 0.2:
             self.log("⚠️ Village drift is high — strange tensions emerge.")
 
         # Random building damage (simulated wear)
         for b in self.buildings.values():
-            b.health = max(0, b.health - random.randint(0, 2))
+            b.health = max(0, b.health - rng.randint(0, 2))
         self.log(f"🔁 Drift tick: {round(old_drift, 3)} → {round(self.drift, 3)}")
 
     def summary(self):
@@ -1,6 +1,7 @@
 import json
 from pathlib import Path
 from civilization.village_engine import Village
+from storage.atomic import write_json
 
 # === Persistent Storage Path ===
 VILLAGE_DATA_DIR = Path("data/villages")
@@ -9,8 +10,7 @@ VILLAGE_DATA_DIR.mkdir(parents=True, exist_ok=True)
 # === Save a single village ===
 def save_village(village: Village):
     path = VILLAGE_DATA_DIR / f"{village.id}.json"
-    with open(path, "w") as f:
-        json.dump(village.to_dict(), f, indent=2)
+    write_json(path, village.to_dict())
     print(f"[💾] Village '{village.name}' saved to {path}")
 
 # === Load a village by ID ===
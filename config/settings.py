@@ -126,3 +126,12 @@ SYMBOLIC_PRESSURE_CAP = 1.75
 ENTITY_DREAM_STATE_ENABLED = True
 ENTITY_PARADOX_TOLERANCE = 0.15
 PRIORITIZE_MYTHIC_ARCHETYPES = True
+
+# === MEMORY CRYSTAL ===
+# Motif keys are only used for in-process dedupe. "sha256" (64 hex chars),
+# "blake2b" (64-bit digest) or "fast" (64-bit non-crypto, differs per process).
+MOTIF_HASHER = "blake2b"
+
+# === ENTITY METADATA LOG ===
+ENTITY_LOG_CAPACITY = 128        # entries kept in memory per entity; older ones spill (see core.metadata_log)
+ENTITY_LOG_SPILL_DIR = None      # where the default entity store spills them; None drops them (counted, warned once)
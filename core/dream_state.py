@@ -1,22 +1,261 @@
 import random
 import logging
+import time
 from datetime import datetime
+
+import numpy as np
+
+from core.entity_store import CodeTable
 from utils.glyph_parser import extract_glyphs
 from inventory.inventory_engine import generate_item  # ✅ ONLY import generate_item
 
 DREAM_LAYERS = ["silent", "drift", "bloom"]
+DREAM_STATES = ["active"] + DREAM_LAYERS  # serialized layer codes; append only
+
+# layer -> (next layer, cycles required before moving on)
+TRANSITIONS = {
+    "active": ("silent", 0),
+    "silent": ("drift", 2),
+    "drift": ("bloom", 2),
+    "bloom": ("active", 1),
+}
+NO_TRANSITION = np.iinfo(np.int32).max
+
+
+def layer_code(layer: str):
+    return DREAM_STATES.index(layer) if layer in DREAM_STATES else layer
+
+
+def layer_name(code) -> str:
+    return DREAM_STATES[code] if isinstance(code, int) else code
+
+
+class DreamBank:
+    """
+    Dream layer and cycle counters for a population as arrays, one row per
+    DreamState, so a whole population evolves in a few vector operations.
+    Layers are interned codes; unknown layers entered by hand never advance.
+    Every write flags its rows in `dirty`, which saves read through the owning entity.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self._free = []
+        self.layers = CodeTable(DREAM_STATES)
+        self.layer = np.zeros(capacity, dtype=np.int16)
+        self.cycles = np.zeros(capacity, dtype=np.int32)
+        self.entered = np.zeros(capacity, dtype=np.float64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.dirty = np.zeros(capacity, dtype=bool)
+
+    _COLUMNS = ("layer", "cycles", "entered", "alive", "dirty")
+
+    @property
+    def capacity(self) -> int:
+        return len(self.alive)
+
+    def _grow(self):
+        new_capacity = max(1024, self.capacity * 2)
+        for name in self._COLUMNS:
+            old = getattr(self, name)
+            grown = np.zeros(new_capacity, dtype=old.dtype)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
+
+    def allocate(self) -> int:
+        if self._free:
+            row = self._free.pop()
+        else:
+            if self.size >= self.capacity:
+                self._grow()
+            row = self.size
+            self.size += 1
+        self.layer[row] = self.layers.code_of("active")
+        self.cycles[row] = 0
+        self.entered[row] = time.time()
+        self.alive[row] = True
+        self.dirty[row] = True
+        return row
+
+    def release(self, row: int):
+        if self.alive[row]:
+            self.alive[row] = False
+            self._free.append(row)
+
+    def _transition_tables(self):
+        """Per-code counting flag, required cycles and next code (codes may grow)."""
+        n = len(self.layers.values)
+        counting = np.zeros(n, dtype=bool)
+        required = np.full(n, NO_TRANSITION, dtype=np.int32)
+        next_code = np.arange(n, dtype=np.int16)
+        for layer, (target, cycles) in TRANSITIONS.items():
+            code = self.layers.code_of(layer)
+            required[code] = cycles
+            next_code[code] = self.layers.code_of(target)
+        for layer in DREAM_LAYERS:
+            counting[self.layers.code_of(layer)] = True
+        return counting, required, next_code
+
+    def evolve(self, rows: np.ndarray, entities, rng_for=None) -> int:
+        """
+        Advance rows one cycle; entities[i] owns rows[i] and receives the bloom.
+        rng_for(entity), if given, supplies the blooming entity's random stream.
+        Returns the number of rows that changed layer.
+        """
+        counting, required, next_code = self._transition_tables()
+        codes = self.layer[rows]
+        self.cycles[rows] += counting[codes]
+        advance = self.cycles[rows] >= required[codes]
+        self.dirty[rows[counting[codes] | advance]] = True
+        blooming = np.flatnonzero(advance & (codes == self.layers.code_of("bloom")))
+        for i in blooming:
+            entity = entities[i]
+            perform_dream_bloom(entity, rng_for(entity) if rng_for else random)
+        moved = rows[advance]
+        self.layer[moved] = next_code[codes[advance]]
+        self.cycles[moved] = 0
+        self.entered[moved] = time.time()
+        return len(moved)
+
+    def _lap(self, counting, required, next_code):
+        """
+        Ticks per layer when entered fresh, plus one lap of the cycle from
+        "active": (length, layer changes, bloom offsets), or length 0 if the
+        cycle stalls or never returns.
+        """
+        fresh = np.where(counting, np.maximum(required, 1),
+                         np.where(required == 0, 1, NO_TRANSITION)).astype(np.int64)
+        bloom, start = self.layers.code_of("bloom"), self.layers.code_of("active")
+        length, blooms, code = 0, [], start
+        for changes in range(1, len(fresh) + 1):
+            if fresh[code] >= NO_TRANSITION:
+                break
+            if code == bloom:
+                blooms.append(length + fresh[code] - 1)
+            length += fresh[code]
+            code = next_code[code]
+            if code == start:
+                return length, changes, blooms
+        return 0, 0, []
+
+    def fast_forward(self, rows: np.ndarray, ticks) -> tuple:
+        """
+        Advance rows by `ticks` cycles each (scalar or per row) in one step:
+        whole laps of the layer cycle are skipped arithmetically, so the cost
+        does not grow with the gap. Blooms are counted, not performed.
+        Returns (blooms, last_bloom, layer_changes): per row, how many blooms
+        fired and on which skipped tick (0-based) the last one did, or -1.
+        """
+        counting, required, next_code = self._transition_tables()
+        active, bloom = self.layers.code_of("active"), self.layers.code_of("bloom")
+        rows = np.asarray(rows, dtype=np.int64)
+        budget = np.array(np.broadcast_to(ticks, rows.shape), dtype=np.int64)
+        spent = np.zeros(len(rows), dtype=np.int64)
+        codes = self.layer[rows].astype(np.int64)
+        cycles = self.cycles[rows].astype(np.int64)
+        changes = np.zeros(len(rows), dtype=np.int64)
+        blooms = np.zeros(len(rows), dtype=np.int64)
+        last_bloom = np.full(len(rows), -1, dtype=np.int64)
+        lap, lap_changes, lap_blooms = self._lap(counting, required, next_code)
+
+        def walk(stop_at_lap_start):
+            # One layer change per pass; a row needs at most one lap's worth.
+            for _ in range(len(counting)):
+                left = np.where(counting[codes], np.maximum(required[codes] - cycles, 1),
+                                np.where(cycles >= required[codes], 1, NO_TRANSITION))
+                go = budget >= left
+                if stop_at_lap_start:
+                    go &= (codes != active) | (cycles != 0)
+                i = np.flatnonzero(go)
+                if not len(i):
+                    return
+                fired = i[codes[i] == bloom]
+                blooms[fired] += 1
+                last_bloom[fired] = spent[fired] + left[fired] - 1
+                budget[i] -= left[i]
+                spent[i] += left[i]
+                codes[i] = next_code[codes[i]]
+                cycles[i] = 0
+                changes[i] += 1
+
+        if lap:
+            walk(stop_at_lap_start=True)
+            i = np.flatnonzero((codes == active) & (cycles == 0) & (budget >= lap))
+            laps = budget[i] // lap
+            if lap_blooms:
+                blooms[i] += laps * len(lap_blooms)
+                last_bloom[i] = spent[i] + (laps - 1) * lap + lap_blooms[-1]
+            budget[i] -= laps * lap
+            spent[i] += laps * lap
+            changes[i] += laps * lap_changes
+        walk(stop_at_lap_start=False)
+        # What is left of each budget is spent inside the current layer.
+        cycles += np.where(counting[codes], budget, 0)
+
+        cycles = np.minimum(cycles, np.iinfo(np.int32).max)
+        self.dirty[rows[(changes > 0) | (cycles != self.cycles[rows])]] = True
+        self.layer[rows] = codes
+        self.cycles[rows] = cycles
+        self.entered[rows[changes > 0]] = time.time()
+        return blooms, last_bloom, int(changes.sum())
+
 
 class DreamState:
-    def __init__(self):
-        self.current_layer = "active"
-        self.entered = datetime.now()
-        self.cycles_in = 0
-        self.layer_log = []
+    """One entity's dream layer, stored as a row of a DreamBank."""
+
+    __slots__ = ("_bank", "_row", "_layer_log", "__weakref__")
+
+    def __init__(self, bank: DreamBank = None):
+        self._bank = bank or DEFAULT_BANK
+        self._row = self._bank.allocate()
+        self._layer_log = None
+
+    def __del__(self):
+        try:
+            self._bank.release(self._row)
+        except (AttributeError, TypeError):
+            pass  # partially constructed, or interpreter shutdown
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._bank.dirty[self._row])
+
+    def mark_clean(self):
+        self._bank.dirty[self._row] = False
+
+    @property
+    def current_layer(self) -> str:
+        return self._bank.layers.lookup(self._bank.layer[self._row])
+
+    @current_layer.setter
+    def current_layer(self, layer: str):
+        self._bank.layer[self._row] = self._bank.layers.intern(layer)
+        self._bank.dirty[self._row] = True
+
+    @property
+    def cycles_in(self) -> int:
+        return int(self._bank.cycles[self._row])
+
+    @cycles_in.setter
+    def cycles_in(self, value: int):
+        self._bank.cycles[self._row] = value
+        self._bank.dirty[self._row] = True
+
+    @property
+    def entered(self) -> datetime:
+        return datetime.fromtimestamp(self._bank.entered[self._row])
+
+    @property
+    def layer_log(self) -> list:
+        """Layers entered through enter(); population ticks only update the bank."""
+        if self._layer_log is None:
+            self._layer_log = []
+        return self._layer_log
 
     def enter(self, layer: str):
         self.current_layer = layer
-        self.entered = datetime.now()
         self.cycles_in = 0
+        self._bank.entered[self._row] = time.time()
         self.layer_log.append((layer, self.entered))
         logging.info(f"🌀 Dream Layer: Entered '{layer.upper()}' at {self.entered.isoformat()}")
 
@@ -25,26 +264,44 @@ class DreamState:
             self.cycles_in += 1
             logging.debug(f"  ↪ Dream Layer '{self.current_layer}' → {self.cycles_in} cycles")
 
-    def evolve(self, entity):
+    def to_dict(self) -> dict:
+        """Layer as its DREAM_STATES index (a name only for hand-entered layers), plus counters."""
+        return {
+            "layer": layer_code(self.current_layer),
+            "cycles": self.cycles_in,
+            "entered": float(self._bank.entered[self._row]),
+            "log": [[layer_code(layer), when.timestamp()] for layer, when in self._layer_log or ()],
+        }
+
+    @staticmethod
+    def from_dict(data: dict, bank: DreamBank = None) -> "DreamState":
+        state = DreamState(bank)
+        state.current_layer = layer_name(data.get("layer", 0))
+        state.cycles_in = data.get("cycles", 0)
+        state._bank.entered[state._row] = data.get("entered", state._bank.entered[state._row])
+        if data.get("log"):
+            state._layer_log = [(layer_name(code), datetime.fromtimestamp(when)) for code, when in data["log"]]
+        return state
+
+    def evolve(self, entity, rng=None):
         """Advance through dream layers and perform symbolic mutations."""
-        self.tick()
+        if self._bank.evolve(np.array([self._row]), [entity], (lambda _: rng) if rng else None):
+            self.layer_log.append((self.current_layer, self.entered))
+            logging.info(f"🌀 Dream Layer: Entered '{self.current_layer.upper()}' at {self.entered.isoformat()}")
 
-        transitions = {
-            "active": ("silent", 0),
-            "silent": ("drift", 2),
-            "drift": ("bloom", 2),
-            "bloom": ("active", 1),
-        }
 
-        if self.current_layer in transitions:
-            next_layer, required_cycles = transitions[self.current_layer]
-            if self.cycles_in >= required_cycles:
-                if self.current_layer == "bloom":
-                    perform_dream_bloom(entity)
-                self.enter(next_layer)
+def evolve_population(entities, rng_for=None) -> int:
+    """One dream tick for many entities, batched per DreamBank; returns layer changes."""
+    groups = {}
+    for e in entities:
+        dream = e.dream
+        bank, rows, members = groups.setdefault(id(dream._bank), (dream._bank, [], []))
+        rows.append(dream._row)
+        members.append(e)
+    return sum(bank.evolve(np.array(rows, dtype=np.int64), members, rng_for) for bank, rows, members in groups.values())
 
 
-def perform_dream_bloom(entity):
+def perform_dream_bloom(entity, rng=random):
     """Triggers mutation and symbolic reward during bloom."""
     if not hasattr(entity, "current_memory") or not entity.current_memory:
         logging.warning(f"⚠️ Entity {entity.id} lacks current_memory for dream mutation.")
@@ -55,7 +312,7 @@ def perform_dream_bloom(entity):
         logging.warning(f"⚠️ No motifs found to mutate for {entity.id}")
         return
 
-    selected = random.choice(glyphs)
+    selected = rng.choice(glyphs)
     new_phrase = f"{selected} fractal echoes of what was once forgotten"
     old_memory = entity.current_memory
 
@@ -68,7 +325,10 @@ def perform_dream_bloom(entity):
         "bloom_timestamp": datetime.now().isoformat()
     })
 
-    reward_item = generate_item(rarity="rare", source="dream_bloom")
-    entity.gain_item(reward_item["name"], rarity=reward_item["rarity"], props=reward_item.get("properties"))
+    reward_item = generate_item(rarity="rare", source="dream_bloom", rng=rng)
+    entity.gain_item(reward_item["name"], rarity=reward_item["rarity"], props=reward_item.get("properties"), rng=rng)
 
     logging.info(f"🌸 Dream Bloom for {entity.id}: '{old_memory}' → '{new_phrase}' + 🎁 Item gained: {reward_item['name']}")
+
+
+DEFAULT_BANK = DreamBank()
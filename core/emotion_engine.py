@@ -1,4 +1,8 @@
-import random
+from collections.abc import MutableMapping
+
+import numpy as np
+
+from utils.packing import from_b64, to_b64
 
 NEUROCHEMICALS = [
     "serotonin",      # mood, well-being
@@ -27,34 +31,206 @@ DEFAULT_LEVELS = {
     "cortisol": 0.5  # typically lower when relaxed
 }
 
+MIN_LEVEL, MAX_LEVEL = 0.0, 1.5
+FLUCTUATION = 0.05
+RELAXATION = 0.05  # fraction of the gap to BASELINE an idle entity closes per tick
+
+# Per-neurochemical response to drift, in NEUROCHEMICALS order
+DRIFT_SENSITIVITY = np.array([
+    {
+        "serotonin": -0.02,
+        "dopamine": 0.015,
+        "cortisol": 0.025,
+        "GABA": -0.015,
+        "glutamate": 0.02,
+    }.get(key, 0.0) for key in NEUROCHEMICALS
+], dtype=np.float32)
+
+BASELINE = np.array([DEFAULT_LEVELS[key] for key in NEUROCHEMICALS], dtype=np.float32)
+CHEMICAL_INDEX = {key: i for i, key in enumerate(NEUROCHEMICALS)}
+
+_rng = np.random.default_rng()
+
+
+class EmotionBank:
+    """
+    Population emotion levels as one N×10 float32 matrix (columns in
+    NEUROCHEMICALS order). Each EmotionState owns a row, so a whole
+    population mutates in a single array expression. Every write flags its
+    rows in `dirty`, which saves read through the owning entity.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self._free = []
+        self.levels = np.zeros((capacity, len(NEUROCHEMICALS)), dtype=np.float32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.dirty = np.zeros(capacity, dtype=bool)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.alive)
+
+    def _grow(self):
+        new_capacity = max(1024, self.capacity * 2)
+        levels = np.zeros((new_capacity, len(NEUROCHEMICALS)), dtype=np.float32)
+        levels[:len(self.levels)] = self.levels
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:len(self.alive)] = self.alive
+        dirty = np.zeros(new_capacity, dtype=bool)
+        dirty[:len(self.dirty)] = self.dirty
+        self.levels, self.alive, self.dirty = levels, alive, dirty
+
+    def allocate(self) -> int:
+        if self._free:
+            row = self._free.pop()
+        else:
+            if self.size >= self.capacity:
+                self._grow()
+            row = self.size
+            self.size += 1
+        self.levels[row] = BASELINE
+        self.alive[row] = True
+        self.dirty[row] = True
+        return row
+
+    def release(self, row: int):
+        if self.alive[row]:
+            self.alive[row] = False
+            self._free.append(row)
+
+    def live_rows(self) -> np.ndarray:
+        return np.flatnonzero(self.alive[:self.size])
+
+    def mutate(self, rows: np.ndarray, drift, rng=None, noise=None):
+        """
+        Fluctuate rows and push them along DRIFT_SENSITIVITY scaled by each row's drift.
+        noise, if given, is the (rows × 10) fluctuation (e.g. per-entity RngService draws);
+        otherwise it is drawn from rng, a numpy Generator.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        drift = np.broadcast_to(np.asarray(drift, dtype=np.float32), rows.shape)
+        if noise is None:
+            noise = (rng or _rng).uniform(-FLUCTUATION, FLUCTUATION, size=(len(rows), len(NEUROCHEMICALS)))
+        noise = np.asarray(noise, dtype=np.float32)
+        self.levels[rows] = np.clip(
+            self.levels[rows] + noise + drift[:, None] * DRIFT_SENSITIVITY, MIN_LEVEL, MAX_LEVEL)
+        self.dirty[rows] = True
+
+    def relax(self, rows: np.ndarray, ticks):
+        """Let rows settle toward BASELINE for `ticks` idle ticks (per row), in closed form."""
+        rows = np.asarray(rows, dtype=np.int64)
+        ticks = np.broadcast_to(np.asarray(ticks, dtype=np.float32), rows.shape)
+        keep = np.power(np.float32(1.0 - RELAXATION), ticks)[:, None]
+        self.levels[rows] = BASELINE + (self.levels[rows] - BASELINE) * keep
+        self.dirty[rows] = True
+
+
+class LevelsView(MutableMapping):
+    """Dict-like view of one bank row; keys are fixed to NEUROCHEMICALS."""
+
+    __slots__ = ("_bank", "_row")
+
+    def __init__(self, bank: EmotionBank, row: int):
+        self._bank = bank
+        self._row = row
+
+    def __getitem__(self, key):
+        return float(self._bank.levels[self._row, CHEMICAL_INDEX[key]])
+
+    def __setitem__(self, key, value):
+        self._bank.levels[self._row, CHEMICAL_INDEX[key]] = value
+        self._bank.dirty[self._row] = True
+
+    def __delitem__(self, key):
+        raise TypeError("Neurochemicals cannot be removed")
+
+    def __iter__(self):
+        return iter(NEUROCHEMICALS)
+
+    def __len__(self):
+        return len(NEUROCHEMICALS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
 class EmotionState:
-    def __init__(self):
-        self.levels = DEFAULT_LEVELS.copy()
+    """One entity's neurochemical levels, stored as a row of an EmotionBank."""
+
+    __slots__ = ("_bank", "_row", "__weakref__")
+
+    def __init__(self, bank: EmotionBank = None):
+        self._bank = bank or DEFAULT_BANK
+        self._row = self._bank.allocate()
+
+    def __del__(self):
+        try:
+            self._bank.release(self._row)
+        except (AttributeError, TypeError):
+            pass  # partially constructed, or interpreter shutdown
 
-    def mutate(self, drift_factor: float = 0.0):
+    @property
+    def dirty(self) -> bool:
+        return bool(self._bank.dirty[self._row])
+
+    def mark_clean(self):
+        self._bank.dirty[self._row] = False
+
+    @property
+    def levels(self) -> LevelsView:
+        return LevelsView(self._bank, self._row)
+
+    @levels.setter
+    def levels(self, values: dict):
+        for key, value in values.items():
+            self.set(key, value)
+
+    def mutate(self, drift_factor: float = 0.0, rng=None):
         """Apply nuanced modulation per neurotransmitter influenced by drift."""
-        for key in self.levels:
-            # Random fluctuation
-            fluctuation = random.uniform(-0.05, 0.05)
-            # Custom drift sensitivities
-            drift_influence = {
-                "serotonin": -0.02 * drift_factor,
-                "dopamine":  0.015 * drift_factor,
-                "cortisol":  0.025 * drift_factor,
-                "GABA":     -0.015 * drift_factor,
-                "glutamate": 0.02 * drift_factor
-            }.get(key, 0.0)
-
-            # Update level within bounded range
-            new_value = self.levels[key] + fluctuation + drift_influence
-            self.levels[key] = max(0.0, min(1.5, new_value))
+        self._bank.mutate(np.array([self._row]), drift_factor, rng)
 
     def set(self, key, value):
-        if key in self.levels:
-            self.levels[key] = max(0.0, min(1.5, value))
+        if key in CHEMICAL_INDEX:
+            self._bank.levels[self._row, CHEMICAL_INDEX[key]] = max(MIN_LEVEL, min(MAX_LEVEL, value))
+            self._bank.dirty[self._row] = True
 
     def get(self, key):
-        return self.levels.get(key, 0.0)
+        if key not in CHEMICAL_INDEX:
+            return 0.0
+        return float(self._bank.levels[self._row, CHEMICAL_INDEX[key]])
 
     def summary(self):
-        return {k: round(v, 2) for k, v in self.levels.items()}
+        return {k: round(float(v), 2) for k, v in zip(NEUROCHEMICALS, self._bank.levels[self._row])}
+
+    def to_dict(self) -> dict:
+        """The row as packed little-endian float32s, in NEUROCHEMICALS order."""
+        return {"levels": to_b64(self._bank.levels[self._row].astype("<f4").tobytes())}
+
+    @staticmethod
+    def from_dict(data: dict, bank: EmotionBank = None) -> "EmotionState":
+        state = EmotionState(bank)
+        if "levels" in data:
+            state._bank.levels[state._row] = np.frombuffer(from_b64(data["levels"]), dtype="<f4")
+        return state
+
+
+def mutate_population(entities, rng=None) -> int:
+    """
+    One emotion tick for many entities: rows sharing a bank are mutated in one
+    vectorized step, with each entity's drift as its drift factor.
+    Returns the number of entities mutated.
+    """
+    groups = {}
+    for e in entities:
+        emotion = e.emotion
+        groups.setdefault(id(emotion._bank), (emotion._bank, [], []))
+        _, rows, drift = groups[id(emotion._bank)]
+        rows.append(emotion._row)
+        drift.append(e.drift_level)
+    for bank, rows, drift in groups.values():
+        bank.mutate(np.array(rows, dtype=np.int64), np.array(drift, dtype=np.float32), rng)
+    return sum(len(rows) for _, rows, _ in groups.values())
+
+
+DEFAULT_BANK = EmotionBank()
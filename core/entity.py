@@ -1,14 +1,40 @@
 import uuid
+import weakref
+from collections import deque
 from datetime import datetime
+from functools import partial
 
 from core.dream_state import DreamState
 from core.emotion_engine import EmotionState
+from core.entity_store import DEFAULT_STORE, StatsView
+from core.metadata_log import as_iso, new_log
 from memory.memory_crystal import MemoryCrystal
-from inventory.inventory_engine import Inventory, InventoryItem
+from inventory.inventory_engine import ITEM_TYPES, Inventory, InventoryItem
+
+# Attributes that end up in to_dict(); assigning any of them marks the entity dirty.
+PERSISTED_FIELDS = frozenset({
+    "id", "name", "archetype", "memory_snapshot", "current_memory", "memory",
+    "tokens", "stats", "drift_level", "status", "inventory", "crystal", "emotion", "dream",
+})
 
 
 class Entity:
-    def __init__(self, name=None, memory_snapshot="", archetype="generic"):
+    """
+    Symbolic entity. Numeric state (drift, ess/sd, status, archetype) lives in a
+    row of an EntityStore so population scans can work on whole columns.
+    Cognitive subsystems are built the first time they are touched.
+    """
+
+    __slots__ = (
+        "_store", "_row", "_stats", "id", "name", "memory_snapshot", "current_memory",
+        "memory", "tokens", "village", "_metadata", "_crystal", "_emotion", "_dream",
+        "_inventory", "_snapshot", "soul_signature", "symbol_density", "glyph_trace", "__weakref__",
+    )
+
+    def __init__(self, name=None, memory_snapshot="", archetype="generic", store=None, eid=None):
+        self._store = store if store is not None else DEFAULT_STORE
+        self._row = self._store.allocate()
+
         self.name = name or 'Unnamed'
         self.archetype = archetype or 'unknown'
         self.memory_snapshot = memory_snapshot
@@ -16,18 +42,265 @@ class Entity:
         self.memory = []
         self.tokens = []
         self.stats = {'sd': 0, 'ess': 0}
-        self.id = str(uuid.uuid4())[:8]
-        self.drift_level = 0.0
+        self.id = eid or str(uuid.uuid4())[:8]
+        self.status = "active"
+        self.village = None
+
+        # Core cognitive systems, created on first access
+        self._metadata = None
+        self._crystal = None
+        self._emotion = None
+        self._dream = None
+        self._inventory = None
+        self._snapshot = None
+
+    def __setattr__(self, key, value):
+        object.__setattr__(self, key, value)
+        if key in PERSISTED_FIELDS:
+            self._store.dirty[self._row] = True
+
+    def __del__(self):
+        try:
+            self._store.release(self._row)
+        except (AttributeError, TypeError):
+            pass  # partially constructed, or interpreter shutdown
+
+    # === Change tracking ===
+    @property
+    def dirty(self) -> bool:
+        return bool(self._store.dirty[self._row]) or self.states_dirty()
+
+    def states_dirty(self) -> bool:
+        """Emotion and dream rows live in their own banks, which flag their own writes."""
+        return ((self._emotion is not None and self._emotion.dirty)
+                or (self._dream is not None and self._dream.dirty))
+
+    def touch(self):
+        """Mark as changed after editing memory/tokens/inventory in place."""
+        self._store.dirty[self._row] = True
+
+    def mark_clean(self):
+        self._store.dirty[self._row] = False
+        if self._emotion is not None:
+            self._emotion.mark_clean()
+        if self._dream is not None:
+            self._dream.mark_clean()
+
+    # === Store-backed state ===
+    @property
+    def drift_level(self) -> float:
+        return float(self._store.drift[self._row])
+
+    @drift_level.setter
+    def drift_level(self, value):
+        self._store.drift[self._row] = value
+
+    @property
+    def status(self) -> str:
+        return self._store.statuses.lookup(self._store.status[self._row])
+
+    @status.setter
+    def status(self, value: str):
+        self._store.status[self._row] = self._store.statuses.intern(value)
+
+    @property
+    def archetype(self) -> str:
+        return self._store.archetypes.lookup(self._store.archetype[self._row])
+
+    @archetype.setter
+    def archetype(self, value: str):
+        self._store.archetype[self._row] = self._store.archetypes.intern(value)
+
+    @property
+    def stats(self) -> StatsView:
+        return self._stats
+
+    @stats.setter
+    def stats(self, values: dict):
+        self._store.clear_stats(self._row)
+        self._stats = StatsView(self._store, self._row, values)
+
+    # === Lazy subsystems ===
+    @property
+    def metadata(self) -> dict:
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: dict):
+        self._metadata = value
+
+    @property
+    def crystal(self) -> MemoryCrystal:
+        if self._crystal is None:
+            self._crystal = self._watch(MemoryCrystal())
+        return self._crystal
+
+    @crystal.setter
+    def crystal(self, value: MemoryCrystal):
+        self._crystal = self._watch(value) if value is not None else None
+        if self._store.listeners:
+            self._store.notify("crystal", self)
+
+    def _watch(self, crystal: MemoryCrystal) -> MemoryCrystal:
+        """Forward the crystal's changes to the store's listeners as "crystal" events."""
+        crystal.on_change = partial(_crystal_changed, self._store, weakref.ref(self))
+        return crystal
+
+    @property
+    def emotion(self) -> EmotionState:
+        if self._emotion is None:
+            self._emotion = EmotionState()
+        return self._emotion
+
+    @emotion.setter
+    def emotion(self, value: EmotionState):
+        self._emotion = value
+
+    @property
+    def dream(self) -> DreamState:
+        if self._dream is None:
+            self._dream = DreamState()
+        return self._dream
+
+    @dream.setter
+    def dream(self, value: DreamState):
+        self._dream = value
+
+    @property
+    def inventory(self) -> Inventory:
+        if self._inventory is None:
+            self._inventory = Inventory()
+        return self._inventory
+
+    @inventory.setter
+    def inventory(self, value: Inventory):
+        self._inventory = value
+
+    # === Symbolic Memory & Drift ===
+    def update_memory(self, new_memory: str):
+        self._log("memory_update", {"from": self.current_memory, "to": new_memory})
+        self.current_memory = new_memory
+
+    def set_drift(self, value: float):
+        self.drift_level = max(0.0, min(value, 1.0))
+        self._log("drift_adjust", {"value": self.drift_level})
+
+    @property
+    def snapshot_hashes(self) -> list:
+        if self._snapshot is None:
+            return []
+        crystal, generation = self._snapshot
+        return crystal.vault[:generation]
+
+    def snapshot(self):
+        """O(1): remembers the crystal and its vault generation, not the hashes."""
+        crystal = self.crystal
+        self._snapshot = (crystal, crystal.generation)
+        self._log("snapshot", {"generation": crystal.generation})
+
+    def drift_from_snapshot(self) -> float:
+        if self._snapshot is None:
+            return 0.0
+        crystal, generation = self._snapshot
+        if crystal is self._crystal:
+            # The vault only grows, so every change since the snapshot is an
+            # append and none of the snapshot's hashes can have gone missing.
+            return 0.0
+        return self.crystal.compare_drift(self.snapshot_hashes)
+
+    # === Lifecycle & Status Management ===
+    def quarantine(self, reason: str):
+        self.status = "quarantined"
+        self.metadata["quarantine_reason"] = reason
+        self._log("quarantine", {"reason": reason})
+
+    def reintegrate(self):
         self.status = "active"
+        self.metadata["quarantine_reason"] = None
+        self._log("reintegrated")
+
+    def is_quarantined(self) -> bool:
+        return self.status == "quarantined"
 
-        # Core cognitive systems
-        self.crystal = MemoryCrystal()
-        self.emotion = EmotionState()
-        self.dream = DreamState()
-        self.inventory = Inventory()
+    @property
+    def fused(self) -> bool:
+        """True once the entity has fused into a child; it is never a fusion candidate again."""
+        return bool(self._store.fused[self._row])
+
+    def mark_fused(self, child_id: str):
+        self._store.fused[self._row] = True
+        self.metadata["fused_into"] = child_id
+        self.touch()
+        self._log("fused", {"into": child_id})
+
+    # === Inventory System ===
+    def gain_item(self, name, rarity: str = "common", props: dict = None, rng=None):
+        """Accepts an item name, or an item dict as produced by generate_item()."""
+        if isinstance(name, dict):
+            item = name
+        else:
+            item_type = rng.choice(ITEM_TYPES) if rng is not None else None
+            item = InventoryItem(name=name, rarity=rarity, item_type=item_type, properties=props or {}).to_dict()
+        self.inventory.add_item(item)
+        self.touch()
+        self._log("gain_item", {"item": item["name"], "rarity": item.get("rarity", rarity)})
+
+    def has_item(self, name: str) -> bool:
+        return self.inventory.has_item(name)
+
+    def list_inventory(self) -> list:
+        return self.inventory.list_items()
+
+    def log_event(self, action: str, data: dict = None):
+        """Record an event in the entity's bounded log (a ring that spills to disk; see core.metadata_log)."""
+        self._log(action, data)
+
+    def recent_events(self, action: str, count: int) -> list:
+        """The latest `count` log entries of one action, oldest first; the spill is read only if memory runs short."""
+        found = [entry for entry in self.metadata.get("log", ()) if entry["action"] == action]
+        if len(found) < count:
+            found = [entry for entry in self.log_history() if entry["action"] == action]
+        return found[-count:]
+
+    def _log(self, action: str, data: dict = None):
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "action": action
+        }
+        if data:
+            entry.update(data)
+        log = self.metadata.get("log")
+        if not isinstance(log, deque):
+            log, entries = new_log(), log or ()
+            self.metadata["log"] = log
+            for earlier in entries:
+                self._append_log(log, earlier)
+        self._append_log(log, entry)
+
+    def _append_log(self, log: deque, entry: dict):
+        """Append to the ring; the entry it pushes out goes to the store's LogSpill, or is dropped."""
+        if len(log) == log.maxlen:
+            spill = self._store.spill()
+            if spill is not None:
+                spill.append(self.id, (log[0],))
+            else:
+                self._store.drop_log_entry()
+        log.append(entry)
+
+    def log_history(self, since=None, until=None) -> list:
+        """Spilled and in-memory log entries, oldest first, optionally within [since, until]."""
+        spill = self._store.spill()
+        history = spill.entries(self.id, since, until) if spill is not None else []
+        since, until = as_iso(since), as_iso(until)
+        history.extend(entry for entry in self.metadata.get("log", ())
+                       if (since is None or entry["timestamp"] >= since)
+                       and (until is None or entry["timestamp"] <= until))
+        return history
 
     def to_dict(self):
-        return {
+        data = {
             "id": self.id,
             "name": self.name,
             "archetype": self.archetype,
@@ -35,20 +308,31 @@ class Entity:
             "current_memory": self.current_memory,
             "memory": self.memory,
             "tokens": self.tokens,
-            "stats": self.stats,
+            "stats": dict(self.stats),
             "drift_level": self.drift_level,
             "status": self.status,
-            "inventory": self.inventory.to_dict()["items"] if hasattr(self.inventory, "to_dict") else [],
+            "inventory": self._inventory.to_dict()["items"] if self._inventory is not None else [],
         }
+        # Subsystems only when built: an untouched one is rebuilt as new anyway.
+        if self._crystal is not None:
+            data["crystal"] = self._crystal.to_dict()
+        if self._emotion is not None:
+            data["emotion"] = self._emotion.to_dict()
+        if self._dream is not None:
+            data["dream"] = self._dream.to_dict()
+        if self.fused:
+            data["fused_into"] = self.metadata.get("fused_into")
+        return data
 
     @staticmethod
-    def from_dict(data: dict):
+    def from_dict(data: dict, store=None):
         e = Entity(
             name=data.get("name", "Unnamed"),
             memory_snapshot=data.get("memory_snapshot", ""),
-            archetype=data.get("archetype", "generic")
+            archetype=data.get("archetype", "generic"),
+            store=store,
+            eid=data.get("id")
         )
-        e.id = data.get("id", str(uuid.uuid4())[:8])
         e.current_memory = data.get("current_memory", e.memory_snapshot)
         e.memory = data.get("memory", [])
         e.tokens = data.get("tokens", [])
@@ -58,7 +342,17 @@ class Entity:
 
         if "inventory" in data:
             e.inventory = Inventory.from_dict({"items": data["inventory"]})
+        if "crystal" in data:
+            e.crystal = MemoryCrystal.from_dict(data["crystal"])
+        if "emotion" in data:
+            e.emotion = EmotionState.from_dict(data["emotion"])
+        if "dream" in data:
+            e.dream = DreamState.from_dict(data["dream"])
+        if "fused_into" in data:
+            e._store.fused[e._row] = True
+            e.metadata["fused_into"] = data["fused_into"]
 
+        e.mark_clean()
         return e
 
     def describe(self):
@@ -73,3 +367,12 @@ class Entity:
             "token_count": len(self.tokens),
             "memory_lines": len(self.memory)
         }
+
+
+def _crystal_changed(store, ref, crystal):
+    entity = ref()
+    if entity is None:
+        return
+    store.dirty[entity._row] = True  # the crystal is persisted with the entity
+    if store.listeners:
+        store.notify("crystal", entity)
@@ -0,0 +1,220 @@
+# entity_store.py
+
+import logging
+import weakref
+from collections.abc import MutableMapping
+
+import numpy as np
+
+from config.settings import ENTITY_LOG_SPILL_DIR
+from core.metadata_log import LogSpill
+
+# Statuses known up front; anything else is interned on first use.
+STATUS_CODES = ["active", "quarantined", "reintegrated", "dormant", "corrupted", "transcendent"]
+STAT_KEYS = ("ess", "sd")
+
+
+class CodeTable:
+    """Interns short labels (status, archetype) to small integer codes."""
+
+    def __init__(self, values=()):
+        self.values = []
+        self.codes = {}
+        for value in values:
+            self.intern(value)
+
+    def intern(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.codes[value] = code
+        return code
+
+    def code_of(self, value: str) -> int:
+        """Code for value, or -1 if it was never interned (matches no row)."""
+        return self.codes.get(value, -1)
+
+    def lookup(self, code: int) -> str:
+        return self.values[code]
+
+
+class EntityStore:
+    """
+    Struct-of-arrays population store.
+    Each Entity owns one row; population-wide scans read the columns directly.
+    A NaN in a stat column means the key is absent from that entity's stats.
+    Log entries its entities rotate out of memory go to log_dir/shard-<shard>.log
+    (stores sharing a directory need their own shards); without a log_dir they
+    are dropped and counted in log_dropped.
+    """
+
+    def __init__(self, capacity: int = 1024, log_dir: str = None, shard: int = 0):
+        self.size = 0
+        self._free = []
+        self.statuses = CodeTable(STATUS_CODES)
+        self.archetypes = CodeTable()
+        self.drift = np.zeros(capacity, dtype=np.float64)
+        self.ess = np.full(capacity, np.nan, dtype=np.float64)
+        self.sd = np.full(capacity, np.nan, dtype=np.float64)
+        self.status = np.zeros(capacity, dtype=np.int8)
+        self.archetype = np.zeros(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.fused = np.zeros(capacity, dtype=bool)  # already fused into a child: never fuses again
+        self.dirty = np.zeros(capacity, dtype=bool)
+        self.listeners = weakref.WeakSet()  # told about changes the columns don't show
+        self.log_dir = log_dir
+        self.shard = shard
+        self.log_spill = None  # LogSpill taking the log entries entities rotate out (core.metadata_log)
+        self.log_dropped = 0
+
+    _COLUMNS = ("drift", "ess", "sd", "status", "archetype", "alive", "fused", "dirty")
+
+    @property
+    def capacity(self) -> int:
+        return len(self.alive)
+
+    def _grow(self):
+        new_capacity = max(1024, self.capacity * 2)
+        for name in self._COLUMNS:
+            old = getattr(self, name)
+            fill = np.nan if name in STAT_KEYS else 0
+            grown = np.full(new_capacity, fill, dtype=old.dtype)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
+
+    def allocate(self) -> int:
+        if self._free:
+            row = self._free.pop()
+        else:
+            if self.size >= self.capacity:
+                self._grow()
+            row = self.size
+            self.size += 1
+        self.drift[row] = 0.0
+        self.ess[row] = np.nan
+        self.sd[row] = np.nan
+        self.status[row] = 0
+        self.archetype[row] = 0
+        self.alive[row] = True
+        self.fused[row] = False
+        self.dirty[row] = True
+        return row
+
+    def spill(self):
+        """The store's LogSpill, opened on first use; None if it has nowhere to spill."""
+        if self.log_spill is None and self.log_dir:
+            self.log_spill = LogSpill(self.log_dir, self.shard)
+        return self.log_spill
+
+    def drop_log_entry(self):
+        if not self.log_dropped:
+            logging.warning("⚠️ Entity logs are full and the store has no log_dir: "
+                            "older entries are being dropped (see ENTITY_LOG_SPILL_DIR).")
+        self.log_dropped += 1
+
+    def clear_stats(self, row: int):
+        self.ess[row] = np.nan
+        self.sd[row] = np.nan
+
+    def release(self, row: int):
+        if self.alive[row]:
+            self.alive[row] = False
+            self._free.append(row)
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive[:self.size]))
+
+    # === Change events ===
+    def subscribe(self, listener):
+        """listener.store_event(kind, entity) is called on each event; held weakly."""
+        self.listeners.add(listener)
+
+    def unsubscribe(self, listener):
+        self.listeners.discard(listener)
+
+    def notify(self, kind: str, entity):
+        for listener in list(self.listeners):
+            listener.store_event(kind, entity)
+
+    # === Population-wide views ===
+    def live_rows(self) -> np.ndarray:
+        return np.flatnonzero(self.alive[:self.size])
+
+    def rows_of(self, entities) -> np.ndarray:
+        return np.fromiter((e._row for e in entities), dtype=np.int64, count=len(entities))
+
+    def dirty_mask(self, rows: np.ndarray) -> np.ndarray:
+        return self.dirty[rows]
+
+    def status_code(self, status: str) -> int:
+        return self.statuses.code_of(status)
+
+    def status_counts(self, rows: np.ndarray) -> dict:
+        counts = np.bincount(self.status[rows], minlength=len(self.statuses.values))
+        return {self.statuses.lookup(code): int(n) for code, n in enumerate(counts) if n}
+
+
+class StatsView(MutableMapping):
+    """Dict-like view of an entity's stats; 'ess' and 'sd' live in the store columns."""
+
+    __slots__ = ("_store", "_row", "_extra")
+
+    def __init__(self, store: EntityStore, row: int, values: dict = None):
+        self._store = store
+        self._row = row
+        self._extra = {}
+        if values:
+            self.update(values)
+
+    def __getitem__(self, key):
+        if key in STAT_KEYS:
+            value = getattr(self._store, key)[self._row]
+            if np.isnan(value):
+                raise KeyError(key)
+            return float(value)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        if key in STAT_KEYS:
+            getattr(self._store, key)[self._row] = value
+        else:
+            self._extra[key] = value
+        self._store.dirty[self._row] = True
+
+    def __delitem__(self, key):
+        if key in STAT_KEYS:
+            if key not in self:
+                raise KeyError(key)
+            getattr(self._store, key)[self._row] = np.nan
+        else:
+            del self._extra[key]
+        self._store.dirty[self._row] = True
+
+    def __iter__(self):
+        for key in STAT_KEYS:
+            if not np.isnan(getattr(self._store, key)[self._row]):
+                yield key
+        yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+def shared_store(entities):
+    """Return the store every entity is a view over, or None if they don't share one."""
+    if not entities:
+        return None
+    store = getattr(entities[0], "_store", None)
+    if store is None:
+        return None
+    for e in entities:
+        if getattr(e, "_store", None) is not store:
+            return None
+    return store
+
+
+DEFAULT_STORE = EntityStore(log_dir=ENTITY_LOG_SPILL_DIR)
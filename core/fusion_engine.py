@@ -1,35 +1,86 @@
+import hashlib
 import logging
 from core.entity import Entity
 from collections import defaultdict
 from itertools import combinations
 from datetime import datetime
+from core.entity_store import shared_store
+from core.glyph_index import candidate_pairs
+from memory.memory_crystal import MemoryCrystal
+from memory.motif_vocabulary import VOCABULARY, frozen_ids, jaccard
 
 FUSION_DRIFT_THRESHOLD = 0.2
 FUSION_COHERENCE_MIN = 0.85
 MIN_SHARED_GLYPHS = 2
 MAX_FUSIONS_PER_CYCLE = 5  # throttle excessive chaining
+PAIR_SEARCH = "index"  # "brute", "index" (exact) or "lsh" (approximate)
 
 def extract_glyphs_from_crystal(crystal):
-    return set(fragment["text"] for fragment in crystal.fragments.values())
+    return set(crystal.texts())
 
-def find_fusion_pairs(entities):
-    candidates = []
-    for e1, e2 in combinations(entities, 2):
-        if e1.status != "active" or e2.status != "active":
-            continue
-        if e1.drift_level > FUSION_DRIFT_THRESHOLD or e2.drift_level > FUSION_DRIFT_THRESHOLD:
-            continue
+def eligible_for_fusion(entities):
+    """Active, low-drift entities that have not fused before, in their original order."""
+    entities = list(entities)
+    store = shared_store(entities)
+    if store is not None:
+        rows = store.rows_of(entities)
+        mask = ((store.status[rows] == store.status_code("active")) & (store.drift[rows] <= FUSION_DRIFT_THRESHOLD)
+                & ~store.fused[rows])
+        return [entities[i] for i in mask.nonzero()[0]]
+    return [e for e in entities if e.status == "active" and e.drift_level <= FUSION_DRIFT_THRESHOLD and not e.fused]
+
+def fusion_candidates(entities):
+    """Eligible entities whose crystal holds enough glyphs to share MIN_SHARED_GLYPHS."""
+    # An unbuilt crystal has no glyphs, so it is never materialized here.
+    return [e for e in eligible_for_fusion(entities)
+            if e._crystal is not None and len(e._crystal.fragments) >= MIN_SHARED_GLYPHS]
 
-        glyphs1 = extract_glyphs_from_crystal(e1.crystal)
-        glyphs2 = extract_glyphs_from_crystal(e2.crystal)
-        shared = glyphs1 & glyphs2
+def rank_pairs(items, glyph_sets, method: str = PAIR_SEARCH, ids=None):
+    """
+    (a, b, shared, coherence) for every qualifying pair of items, best first.
+    glyph_sets[i] belongs to items[i]; ties keep combination order.
+    method picks which pairs get checked: "brute" (all of them), "index"
+    (exact, same result) or "lsh" (approximate); see core.glyph_index.
+    ids[i] is glyph_sets[i] as a motif id set (memory.motif_vocabulary);
+    pairs are verified on ids and only winners get their shared set built.
+    """
+    if ids is None:
+        ids = [VOCABULARY.ids_of(glyphs) for glyphs in glyph_sets]
+    ids = [frozen_ids(item_ids) for item_ids in ids]  # once per item, not once per checked pair
+    if method == "brute":
+        pairs = combinations(range(len(items)), 2)
+    else:
+        pairs = candidate_pairs(glyph_sets, MIN_SHARED_GLYPHS, FUSION_COHERENCE_MIN, method)
+    candidates = []
+    for i, j in pairs:
+        ids1 = ids[i]
+        ids2 = ids[j]
+        shared = len(ids1 & ids2)
 
-        if len(shared) >= MIN_SHARED_GLYPHS:
-            coherence = compute_coherence(glyphs1, glyphs2)
+        if shared >= MIN_SHARED_GLYPHS:
+            coherence = shared / (len(ids1) + len(ids2) - shared)
             if coherence >= FUSION_COHERENCE_MIN:
-                candidates.append((e1, e2, shared, coherence))
+                candidates.append((items[i], items[j], glyph_sets[i] & glyph_sets[j], coherence))
     return sorted(candidates, key=lambda x: -x[3])  # sort by highest coherence
 
+def find_fusion_pairs(entities):
+    eligible = fusion_candidates(entities)
+    return rank_pairs(eligible, [extract_glyphs_from_crystal(e.crystal) for e in eligible],
+                      ids=[e.crystal.motif_ids for e in eligible])
+
+def select_fusions(pairs, limit: int = MAX_FUSIONS_PER_CYCLE):
+    """Greedy pick from ranked pairs: nobody fuses twice in one cycle."""
+    chosen = []
+    already_fused_ids = set()
+    for e1, e2, shared, _ in pairs:
+        if e1.id in already_fused_ids or e2.id in already_fused_ids:
+            continue
+        chosen.append((e1, e2, shared))
+        already_fused_ids.update([e1.id, e2.id])
+        if len(chosen) >= limit:
+            break
+    return chosen
+
 def compute_coherence(set1, set2):
     if not set1 or not set2:
         return 0.0
@@ -37,44 +88,37 @@ def compute_coherence(set1, set2):
     intersection = set1 & set2
     return len(intersection) / len(union)
 
-def fuse_entities(e1, e2, shared_motifs):
-    if not isinstance(entity_a, dict) or not isinstance(entity_b, dict):
-        raise TypeError('Entities must be dictionaries to fuse')
-    # Simple fusion strategy: A takes priority, B fills gaps
-    fused = entity_a.copy()
-    for k, v in entity_b.items():
-        if k not in fused or fused[k] in [None, '', []]:
-            fused[k] = v
-    return fused
+def fused_id(id1: str, id2: str) -> str:
+    """Fused entities get ids derived from their parents, so seeded reruns agree."""
+    return hashlib.sha256(f"{id1}+{id2}".encode("utf-8")).hexdigest()[:8]
+
+def fuse_entities(e1, e2, shared_motifs, eid=None):
     merged_memory = f"{e1.current_memory} + {e2.current_memory}"
-    merged_entity = Entity(memory_snapshot=merged_memory, archetype="mythic_nexus")
+    merged_entity = Entity(memory_snapshot=merged_memory, archetype="mythic_nexus", store=e1._store, eid=eid)
 
-    for frag in e1.crystal.fragments.values():
-        merged_entity.crystal.embed(frag["text"])
-    for frag in e2.crystal.fragments.values():
-        merged_entity.crystal.embed(frag["text"])
+    merged_entity.crystal = MemoryCrystal.merged(e1.crystal, e2.crystal)  # copy-on-write, O(1) in crystal size
 
     merged_entity.metadata["fused_from"] = [e1.id, e2.id]
     merged_entity.metadata["shared_motifs"] = list(shared_motifs)
     merged_entity.metadata["fusion_time"] = datetime.now().isoformat()
     merged_entity.status = "active"
     merged_entity.set_drift((e1.drift_level + e2.drift_level) / 2)
-    merged_entity.metadata["fusion_score"] = compute_coherence(
-        extract_glyphs_from_crystal(e1.crystal), extract_glyphs_from_crystal(e2.crystal))
+    merged_entity.metadata["fusion_score"] = jaccard(e1.crystal.motif_ids, e2.crystal.motif_ids)
+    for parent in (e1, e2):
+        if isinstance(parent, Entity):  # a shard's stand-in for a remote parent is marked by its own shard
+            parent.mark_fused(merged_entity.id)
 
     logging.info(f"⚡ Fusion Event: {e1.id} + {e2.id} → {merged_entity.id} with {len(shared_motifs)} shared motifs")
+    return merged_entity
 
-def run_fusion_cycle(entities):
-    fusions = []
-    fusion_pairs = find_fusion_pairs(entities)
-    already_fused_ids = set()
-
-    for e1, e2, shared, _ in fusion_pairs:
-        if e1.id in already_fused_ids or e2.id in already_fused_ids:
-            continue
-        fused = fuse_entities(e1, e2, shared)
-        fusions.append(fused)
-        already_fused_ids.update([e1.id, e2.id])
-
-        if len(fusions) >= MAX_FUSIONS_PER_CYCLE:
-            break
+def run_fusion_cycle(entities, maintainer=None):
+    """
+    Fuse the best disjoint pairs. With a FusionCandidateMaintainer
+    (core.fusion_maintainer) only what changed since its last cycle is re-checked.
+    """
+    if maintainer is not None:
+        maintainer.sync(entities)
+        pairs = maintainer.select()
+    else:
+        pairs = select_fusions(find_fusion_pairs(entities))
+    return [fuse_entities(e1, e2, shared) for e1, e2, shared in pairs]
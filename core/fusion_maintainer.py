@@ -0,0 +1,180 @@
+# fusion_maintainer.py
+
+import heapq
+
+import numpy as np
+
+from core.fusion_engine import (
+    FUSION_COHERENCE_MIN, FUSION_DRIFT_THRESHOLD, MAX_FUSIONS_PER_CYCLE, MIN_SHARED_GLYPHS,
+    extract_glyphs_from_crystal,
+)
+from core.glyph_index import required_overlap
+
+
+class FusionCandidateMaintainer:
+    """
+    Keeps the qualifying fusion pairs of one store's population up to date
+    between cycles instead of rebuilding them.
+
+    Change events drive it: crystal embeds and rewrites arrive through the
+    store's listeners, and drift, status and fused-parent changes — written
+    straight into the store columns — show up as eligibility flips in one
+    vectorized compare per sync(). Only the entities involved have their pairs re-verified,
+    probing a prefix-filtered inverted glyph index (see core.glyph_index).
+
+    Qualifying pairs sit in a heap ordered like rank_pairs(): coherence
+    first, then population position, so select() returns exactly what
+    select_fusions(find_fusion_pairs(...)) would, popping O(k log n).
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._eligible = np.zeros(store.capacity, dtype=bool)  # by row, as of the last sync
+        self._position = np.zeros(store.capacity, dtype=np.int64)  # population order, by row
+        self._entities = {}   # row -> tracked entity (eligible, with enough glyphs)
+        self._glyphs = {}     # row -> frozenset of its glyphs
+        self._ids = {}        # row -> its glyphs' motif ids, as a frozenset
+        self._prefix = {}     # row -> glyphs it posted to the index
+        self._index = {}      # glyph -> rows whose prefix holds it
+        self._partners = {}   # row -> rows it forms a qualifying pair with
+        self._pairs = {}      # (row_a, row_b), a before b -> (coherence, serial)
+        self._heap = []
+        self._serial = 0
+        self._pending = {}    # row -> entity whose crystal changed since the last sync
+        store.subscribe(self)
+
+    def close(self):
+        self.store.unsubscribe(self)
+
+    def store_event(self, kind: str, entity):
+        if kind == "crystal":
+            self._pending[entity._row] = entity
+
+    def _fit(self):
+        if len(self._eligible) < self.store.capacity:
+            grow = self.store.capacity - len(self._eligible)
+            self._eligible = np.concatenate([self._eligible, np.zeros(grow, dtype=bool)])
+            self._position = np.concatenate([self._position, np.zeros(grow, dtype=np.int64)])
+
+    # === Maintenance ===
+    def sync(self, entities, rows=None, positions=None):
+        """
+        Catch up with changes since the last sync. entities is the tracked
+        population in order (it may grow between syncs; entities dropped from
+        it must be discard()ed); rows and positions default to their store
+        rows and list positions. Positions must not change once given.
+        """
+        self._fit()
+        rows = self.store.rows_of(entities) if rows is None else rows
+        positions = np.arange(len(rows), dtype=np.int64) if positions is None else positions
+        self._position[rows] = positions
+        mask = ((self.store.status[rows] == self.store.status_code("active"))
+                & (self.store.drift[rows] <= FUSION_DRIFT_THRESHOLD) & ~self.store.fused[rows])
+        flipped = np.flatnonzero(mask != self._eligible[rows])
+        self._eligible[rows] = mask
+        for i in flipped:
+            self._pending.pop(int(rows[i]), None)
+            if mask[i]:
+                self._track(entities[i])
+            else:
+                self._untrack(int(rows[i]))
+        pending, self._pending = self._pending, {}
+        for row, entity in pending.items():
+            if self._eligible[row] and entity._row == row:
+                self._untrack(row)
+                self._track(entity)
+
+    def discard(self, entity):
+        self._pending.pop(entity._row, None)
+        self._untrack(entity._row)
+        self._eligible[entity._row] = False
+
+    def _track(self, entity):
+        crystal = entity._crystal
+        if crystal is None or len(crystal.fragments) < MIN_SHARED_GLYPHS:
+            return
+        row = entity._row
+        glyphs = frozenset(extract_glyphs_from_crystal(crystal))
+        self._entities[row] = entity
+        self._glyphs[row] = glyphs
+        self._ids[row] = ids = frozenset(crystal.motif_ids)  # a snapshot: the crystal's own set changes in place
+        self._partners[row] = set()
+
+        prefix = sorted(glyphs)[:len(glyphs) - required_overlap(len(glyphs), MIN_SHARED_GLYPHS, FUSION_COHERENCE_MIN) + 1]
+        candidates = set()
+        for glyph in prefix:
+            postings = self._index.setdefault(glyph, set())
+            candidates.update(postings)
+            postings.add(row)
+        self._prefix[row] = prefix
+
+        for other in candidates:
+            other_ids = self._ids[other]
+            shared = len(ids & other_ids)
+            if shared < MIN_SHARED_GLYPHS:
+                continue
+            coherence = shared / (len(ids) + len(other_ids) - shared)
+            if coherence >= FUSION_COHERENCE_MIN:
+                self._add_pair(row, other, coherence)
+
+    def _untrack(self, row: int):
+        if row not in self._entities:
+            return
+        for other in self._partners.pop(row):
+            self._partners[other].discard(row)
+            self._pairs.pop((row, other), None)
+            self._pairs.pop((other, row), None)
+        for glyph in self._prefix.pop(row):
+            postings = self._index[glyph]
+            postings.discard(row)
+            if not postings:
+                del self._index[glyph]
+        del self._entities[row]
+        del self._glyphs[row]
+        del self._ids[row]
+
+    def _add_pair(self, row, other, coherence):
+        a, b = (row, other) if self._position[row] < self._position[other] else (other, row)
+        self._serial += 1
+        self._pairs[(a, b)] = (coherence, self._serial)
+        self._partners[a].add(b)
+        self._partners[b].add(a)
+        heapq.heappush(self._heap, (-coherence, int(self._position[a]), int(self._position[b]), self._serial, a, b))
+
+    # === Queries ===
+    def __len__(self):
+        return len(self._pairs)
+
+    def ranked(self) -> list:
+        """Every qualifying pair as (e1, e2, shared, coherence), in rank_pairs() order."""
+        order = sorted(self._pairs.items(), key=lambda kv: (-kv[1][0], self._position[kv[0][0]], self._position[kv[0][1]]))
+        return [(self._entities[a], self._entities[b], set(self._glyphs[a] & self._glyphs[b]), coherence)
+                for (a, b), (coherence, _) in order]
+
+    def select(self, limit: int = MAX_FUSIONS_PER_CYCLE) -> list:
+        """
+        Best disjoint pairs as (e1, e2, shared), like select_fusions(). Stale
+        heap entries are dropped as they surface; live ones go back afterwards.
+        """
+        chosen, used, keep = [], set(), []
+        while self._heap and len(chosen) < limit:
+            entry = heapq.heappop(self._heap)
+            _, _, _, serial, a, b = entry
+            pair = self._pairs.get((a, b))
+            if pair is None or pair[1] != serial:
+                continue
+            keep.append(entry)
+            if a in used or b in used:
+                continue
+            chosen.append((self._entities[a], self._entities[b], set(self._glyphs[a] & self._glyphs[b])))
+            used.update((a, b))
+        for entry in keep:
+            heapq.heappush(self._heap, entry)
+        if len(self._heap) > 2 * len(self._pairs) + 64:
+            self._rebuild_heap()
+        return chosen
+
+    def _rebuild_heap(self):
+        self._heap = [(-coherence, int(self._position[a]), int(self._position[b]), serial, a, b)
+                      for (a, b), (coherence, serial) in self._pairs.items()]
+        heapq.heapify(self._heap)
@@ -0,0 +1,79 @@
+# glyph_index.py
+
+import math
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from core.rng import MASK64, key_of, splitmix64
+
+MINHASH_PERMUTATIONS = 32
+LSH_BANDS = 8  # 8 bands × 4 rows: ~99.7% of pairs at Jaccard 0.85 become candidates
+MERSENNE_61 = (1 << 61) - 1
+
+
+def required_overlap(size: int, min_shared: int, min_jaccard: float) -> int:
+    """Fewest glyphs a set of this size must share with any partner that qualifies."""
+    # Jaccard ≥ t implies |A ∩ B| ≥ t·|A ∪ B| ≥ t·|A|; the epsilon only guards float error.
+    return max(min_shared, math.ceil(min_jaccard * size - 1e-9))
+
+
+def candidate_pairs(glyph_sets, min_shared: int, min_jaccard: float, method: str = "index") -> list:
+    """
+    Index pairs (i, j), i < j, in combination order, that may reach both
+    thresholds; callers still verify each one exactly.
+    "index" (exact): prefix filtering over an inverted glyph index — with
+    glyphs ordered rarest first, two qualifying sets always share a glyph
+    among their first size − required_overlap + 1, so nothing is missed.
+    "lsh" (approximate): MinHash banding; cheaper on huge populations with
+    long glyph sets, but may drop a rare qualifying pair.
+    """
+    if method == "index":
+        pairs = _prefix_pairs(glyph_sets, min_shared, min_jaccard)
+    elif method == "lsh":
+        pairs = _lsh_pairs(glyph_sets, min_shared)
+    else:
+        raise ValueError(f"Unknown pair search method: {method}")
+    return sorted(pairs)
+
+
+def _prefix_pairs(glyph_sets, min_shared, min_jaccard) -> set:
+    frequency = Counter(g for glyphs in glyph_sets for g in glyphs)
+    index = defaultdict(list)  # glyph -> items whose prefix holds it
+    pairs = set()
+    for j, glyphs in enumerate(glyph_sets):
+        prefix_len = len(glyphs) - required_overlap(len(glyphs), min_shared, min_jaccard) + 1
+        if prefix_len <= 0:
+            continue  # too small to ever share min_shared glyphs
+        prefix = sorted(glyphs, key=lambda g: (frequency[g], g))[:prefix_len]
+        for glyph in prefix:
+            postings = index[glyph]
+            pairs.update((i, j) for i in postings)
+            postings.append(j)
+    return pairs
+
+
+def minhash_signatures(glyph_sets, permutations: int = MINHASH_PERMUTATIONS, seed: int = 0) -> np.ndarray:
+    """(n, permutations) MinHash signatures; glyphs hash stably across processes."""
+    params = [(splitmix64(seed + 2 * k) % (MERSENNE_61 - 1) + 1, splitmix64(seed + 2 * k + 1) % MERSENNE_61)
+              for k in range(permutations)]
+    signatures = np.full((len(glyph_sets), permutations), MASK64, dtype=np.uint64)
+    for i, glyphs in enumerate(glyph_sets):
+        if glyphs:
+            keys = [key_of(g) % MERSENNE_61 for g in glyphs]
+            signatures[i] = [min((a * x + b) % MERSENNE_61 for x in keys) for a, b in params]
+    return signatures
+
+
+def _lsh_pairs(glyph_sets, min_shared, bands: int = LSH_BANDS) -> set:
+    signatures = minhash_signatures(glyph_sets)
+    rows = signatures.shape[1] // bands
+    pairs = set()
+    eligible = [i for i, glyphs in enumerate(glyph_sets) if len(glyphs) >= min_shared]
+    for band in range(bands):
+        buckets = defaultdict(list)
+        for i in eligible:
+            buckets[signatures[i, band * rows:(band + 1) * rows].tobytes()].append(i)
+        for members in buckets.values():
+            pairs.update((members[x], members[y]) for x in range(len(members)) for y in range(x + 1, len(members)))
+    return pairs
@@ -0,0 +1,85 @@
+# metadata_log.py
+
+import json
+import os
+from bisect import bisect_left, bisect_right
+from collections import deque
+
+from config.settings import ENTITY_LOG_CAPACITY
+
+
+def new_log(entries=(), capacity: int = ENTITY_LOG_CAPACITY) -> deque:
+    """An entity's in-memory log: a ring of its latest entries, oldest first."""
+    return deque(entries, maxlen=capacity)
+
+
+def as_iso(moment):
+    """Datetimes as ISO strings; strings and None pass through."""
+    return moment.isoformat() if hasattr(moment, "isoformat") else moment
+
+
+class LogSpill:
+    """
+    Append-only JSON-lines file of the log entries a shard's entities have
+    rotated out of memory. A time index — per entity, entry timestamps and
+    file offsets in append order — is kept in memory and rebuilt by one scan
+    on open, so lookups seek straight to the entries they need.
+    ISO timestamps from one clock sort as strings, so the index bisects them.
+    """
+
+    def __init__(self, directory: str, shard: int = 0):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"shard-{shard}.log")
+        self.index = {}  # entity id -> ([timestamps], [offsets])
+        self._rebuild()
+        self._file = open(self.path, "ab")
+
+    def _rebuild(self):
+        if not os.path.exists(self.path):
+            return
+        offset = 0
+        with open(self.path, "r+b") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # torn write at the tail
+                self._add(record["entity"], record.get("timestamp", ""), offset)
+                offset += len(line)
+            f.truncate(offset)
+
+    def _add(self, entity_id: str, timestamp: str, offset: int):
+        times, offsets = self.index.setdefault(entity_id, ([], []))
+        times.append(timestamp)
+        offsets.append(offset)
+
+    def append(self, entity_id: str, entries):
+        for entry in entries:
+            record = dict(entry, entity=entity_id)
+            offset = self._file.tell()
+            self._file.write(json.dumps(record, separators=(",", ":"), default=str).encode("utf-8") + b"\n")
+            self._add(entity_id, entry.get("timestamp", ""), offset)
+
+    def entries(self, entity_id: str, since=None, until=None) -> list:
+        """An entity's spilled entries, oldest first, optionally within [since, until]."""
+        times, offsets = self.index.get(entity_id, ((), ()))
+        lo = bisect_left(times, as_iso(since)) if since is not None else 0
+        hi = bisect_right(times, as_iso(until)) if until is not None else len(times)
+        if lo >= hi:
+            return []
+        self._file.flush()
+        found = []
+        with open(self.path, "rb") as f:
+            for offset in offsets[lo:hi]:
+                f.seek(offset)
+                record = json.loads(f.readline())
+                del record["entity"]
+                found.append(record)
+        return found
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
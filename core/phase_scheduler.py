@@ -0,0 +1,120 @@
+# phase_scheduler.py
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class Phase:
+    """A unit of tick work and the pieces of state it reads and writes."""
+
+    __slots__ = ("name", "run", "reads", "writes")
+
+    def __init__(self, name: str, run, reads=(), writes=()):
+        self.name = name
+        self.run = run
+        self.reads = frozenset(reads)
+        self.writes = frozenset(writes)
+
+    def conflicts_with(self, other: "Phase") -> bool:
+        """Two phases must not overlap if either writes what the other touches."""
+        return bool(self.writes & (other.reads | other.writes) or other.writes & self.reads)
+
+    def __repr__(self):
+        return f"Phase({self.name!r})"
+
+
+class PhaseScheduler:
+    """
+    Runs one tick's phases as a DAG. Phases are declared in their sequential
+    order; a phase waits for every earlier phase it conflicts with, so any
+    overlap the scheduler picks gives the same result as running them in order.
+    Phases share in-memory state, so they run on a thread pool: NumPy kernels
+    release the GIL, and pure-Python phases still overlap with them.
+    (Process-level parallelism is core.sharded_simulation's job.)
+    """
+
+    def __init__(self, phases, workers: int = 2):
+        self.phases = list(phases)
+        self.workers = max(1, workers)
+        self.after = {
+            p.name: [q.name for q in self.phases[:i] if p.conflicts_with(q)]
+            for i, p in enumerate(self.phases)
+        }
+        self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="phase") if self.workers > 1 else None
+
+    def describe(self) -> dict:
+        """Phase → the phases it waits for."""
+        return {name: list(deps) for name, deps in self.after.items()}
+
+    @staticmethod
+    def _timed(phase: Phase):
+        start = time.perf_counter()
+        phase.run()
+        return start, time.perf_counter()
+
+    def run(self) -> dict:
+        """Run every phase once; returns this tick's timing and critical-path report."""
+        began = time.perf_counter()
+        spans = {}
+        if self._pool is None:
+            for phase in self.phases:
+                spans[phase.name] = self._timed(phase)
+        else:
+            self._run_parallel(spans)
+        wall = time.perf_counter() - began
+        return self.report(spans, began, wall)
+
+    def _run_parallel(self, spans: dict):
+        pending = {p.name: p for p in self.phases}
+        running = {}
+        error = None
+        while pending or running:
+            if error is None:
+                for name in [n for n in pending if all(d in spans for d in self.after[n])]:
+                    running[self._pool.submit(self._timed, pending.pop(name))] = name
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    spans[name] = future.result()
+                except BaseException as ex:  # let the running phases finish, then re-raise
+                    error = error or ex
+        if error is not None:
+            raise error
+
+    def critical_path(self, seconds: dict) -> tuple:
+        """Longest dependency chain by phase time: (phase names, total seconds)."""
+        best = {}
+        for phase in self.phases:
+            deps = self.after[phase.name]
+            prev = max(deps, key=lambda d: best[d][0], default=None)
+            base = best[prev][0] if prev else 0.0
+            best[phase.name] = (base + seconds[phase.name], prev)
+        if not best:
+            return [], 0.0
+        name = max(best, key=lambda n: best[n][0])
+        total = best[name][0]
+        path = []
+        while name:
+            path.append(name)
+            name = best[name][1]
+        return path[::-1], total
+
+    def report(self, spans: dict, began: float, wall: float) -> dict:
+        seconds = {name: end - start for name, (start, end) in spans.items()}
+        path, critical = self.critical_path(seconds)
+        return {
+            "wall_seconds": wall,
+            "serial_seconds": sum(seconds.values()),
+            "critical_seconds": critical,
+            "critical_path": path,
+            "phases": {name: {"start": start - began, "seconds": seconds[name]}
+                       for name, (start, _) in spans.items()},
+        }
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
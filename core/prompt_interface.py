@@ -38,6 +38,6 @@ def query_entity(entity, prompt: str) -> str:
     memory_entry = f"💭 Prompt:\n{formatted_prompt}\n→ Reply:\n{formatted_reply}"
 
     entity.current_memory = formatted_reply  # Update core memory trace
-    entity.metadata.setdefault("dialogue_log", []).append(memory_entry)
+    entity.log_event("dialogue", {"exchange": memory_entry})
 
     return reply
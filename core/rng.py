@@ -0,0 +1,118 @@
+# rng.py
+
+import hashlib
+import secrets
+
+import numpy as np
+
+MASK64 = (1 << 64) - 1
+GOLDEN = 0x9E3779B97F4A7C15
+TO_UNIT = 2.0 ** -53
+
+# Stream ids keep phases independent of each other for the same entity and tick.
+STREAMS = {name: i for i, name in enumerate(
+    ["emotion", "dream", "quest", "drift", "healing", "fusion", "village", "environment"])}
+
+
+def splitmix64(x: int) -> int:
+    z = (x + GOLDEN) & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+
+def splitmix64_array(x: np.ndarray) -> np.ndarray:
+    """splitmix64 over a uint64 array; wraps modulo 2**64 exactly like the scalar version."""
+    z = x + np.uint64(GOLDEN)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def key_of(name: str) -> int:
+    """Stable 64-bit key for an entity id (or any name)."""
+    return int.from_bytes(hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def stream_id(stream) -> int:
+    return STREAMS[stream] if isinstance(stream, str) else int(stream)
+
+
+class CounterRandom:
+    """
+    The slice of the `random` module API the simulation uses, drawn from a
+    counter-based splitmix64 stream. Cheap to create, so every entity gets a
+    fresh, independent stream per tick and phase.
+    """
+
+    __slots__ = ("_state",)
+
+    def __init__(self, base: int):
+        self._state = base
+
+    def _next(self) -> int:
+        z = self._state
+        self._state = (z + GOLDEN) & MASK64
+        return splitmix64(z)
+
+    def getrandbits(self, k: int) -> int:
+        return self._next() >> (64 - k)
+
+    def random(self) -> float:
+        return (self._next() >> 11) * TO_UNIT
+
+    def uniform(self, a: float, b: float) -> float:
+        return a + (b - a) * self.random()
+
+    def randint(self, a: int, b: int) -> int:
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
+
+
+class RngService:
+    """
+    Seedable source of independent random streams keyed by (entity, tick, stream).
+    A draw depends only on those coordinates and the seed — never on which
+    process runs it or in what order — so single-process and sharded runs
+    with the same seed are bit-identical. Vectorized phases take bulk NumPy
+    draws; per-entity code takes a CounterRandom from for_entity().
+    """
+
+    def __init__(self, seed: int = None):
+        self.seed = secrets.randbits(64) if seed is None else seed & MASK64
+        self._seed_mix = splitmix64(self.seed)
+        self._keys = {}
+
+    def key(self, eid: str) -> int:
+        k = self._keys.get(eid)
+        if k is None:
+            k = self._keys[eid] = key_of(eid)
+        return k
+
+    def keys(self, entities) -> np.ndarray:
+        return np.fromiter((self.key(e.id) for e in entities), dtype=np.uint64, count=len(entities))
+
+    def _counter(self, tick: int, stream) -> int:
+        return splitmix64(((tick & 0xFFFFFFFFFF) << 20) ^ stream_id(stream))
+
+    def base(self, key: int, tick: int, stream) -> int:
+        return splitmix64(self._seed_mix ^ splitmix64(key ^ self._counter(tick, stream)))
+
+    def for_entity(self, eid: str, tick: int, stream) -> CounterRandom:
+        return CounterRandom(self.base(self.key(eid), tick, stream))
+
+    def unit(self, keys: np.ndarray, tick: int, stream, width: int = 1) -> np.ndarray:
+        """
+        Uniform [0, 1) draws, shape (len(keys), width). Column j equals the
+        (j+1)-th random() of the same entity's CounterRandom stream.
+        """
+        keys = np.asarray(keys, dtype=np.uint64)
+        base = splitmix64_array(np.uint64(self._seed_mix) ^ splitmix64_array(keys ^ np.uint64(self._counter(tick, stream))))
+        steps = np.arange(width, dtype=np.uint64) * np.uint64(GOLDEN)
+        z = splitmix64_array(base[:, None] + steps[None, :])
+        return (z >> np.uint64(11)).astype(np.float64) * TO_UNIT
+
+    def uniform(self, keys: np.ndarray, tick: int, stream, low: float, high: float, width: int = 1) -> np.ndarray:
+        return low + (high - low) * self.unit(keys, tick, stream, width)
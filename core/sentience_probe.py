@@ -1,4 +1,3 @@
-from collections import Counter
 from utils.glyph_parser import extract_glyphs
 from config.settings import SRQ_KEYWORDS
 import statistics
@@ -11,19 +10,18 @@ def compute_srq(memory_text: str) -> float:
 
 def memory_entropy(entity) -> float:
     """Motif diversity score across memory crystal (0.0 – 1.0)."""
-    motifs = [frag["text"] for frag in entity.crystal.fragments.values()]
-    count = Counter(motifs)
-    if not count:
+    crystal = entity.crystal
+    if not crystal.fragments:
         return 0.0
-    diversity_ratio = len(count) / max(1, sum(count.values()))
+    diversity_ratio = len(crystal.motif_ids) / len(crystal.fragments)
     return round(min(diversity_ratio, 1.0), 3)
 
 def dialogue_depth(entity) -> float:
     """Estimates symbolic depth by referencing past dialogic moments."""
     if hasattr(entity, "dialogue") and hasattr(entity.dialogue, "get_recent_responses"):
         lines = entity.dialogue.get_recent_responses(5)
-    elif "dialogue_log" in entity.metadata:
-        lines = entity.metadata["dialogue_log"][-5:]
+    elif hasattr(entity, "recent_events"):
+        lines = [entry["exchange"] for entry in entity.recent_events("dialogue", 5)]
     else:
         return 0.0
 
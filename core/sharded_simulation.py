@@ -0,0 +1,263 @@
+# sharded_simulation.py
+
+import time
+from multiprocessing import get_all_start_methods, get_context
+
+from core.fusion_engine import (
+    extract_glyphs_from_crystal, fuse_entities, fused_id, fusion_candidates, rank_pairs, select_fusions,
+)
+from core.simulation_loop import (
+    PHASES, NUMERIC_PHASES, SimulationEngine, demo_entity, population_digest,
+)
+from drift.drift_engine import MAX_QUARANTINE_PER_CYCLE
+from memory.memory_crystal import MemoryCrystal
+
+LOCAL_PHASES = tuple(p for p in PHASES if p != "fusion")
+
+
+class FusionCandidate:
+    """
+    What a shard exports about one fusion-eligible entity: enough for the
+    merge step to rank pairs, and for another shard to fuse with it.
+    """
+
+    __slots__ = ("shard", "index", "order", "id", "current_memory", "drift_level", "texts", "glyphs")
+
+    def __init__(self, shard: int, index: int, order: int, entity):
+        self.shard = shard
+        self.index = index
+        self.order = order
+        self.id = entity.id
+        self.current_memory = entity.current_memory
+        self.drift_level = entity.drift_level
+        self.texts = entity.crystal.texts()
+        self.glyphs = extract_glyphs_from_crystal(entity.crystal)
+
+    @property
+    def crystal(self) -> MemoryCrystal:
+        crystal = MemoryCrystal()
+        crystal.embed_many(self.texts)
+        return crystal
+
+
+def shard_bounds(population: int, shards: int) -> list:
+    """Contiguous [start, stop) index ranges, so shard order is population order."""
+    size, extra = divmod(population, shards)
+    bounds, start = [], 0
+    for shard in range(shards):
+        stop = start + size + (1 if shard < extra else 0)
+        bounds.append((start, stop))
+        start = stop
+    return bounds
+
+
+def split_phases(phases):
+    """Local phases before the drift scan, and the ones after it."""
+    phases = tuple(phases)
+    if "drift" not in phases:
+        return phases, ()
+    at = phases.index("drift")
+    return phases[:at], phases[at + 1:]
+
+
+def _shard_worker(conn, shard: int, start: int, stop: int, make_entity, seed, phases, log_dir=None):
+    """
+    Owns one shard. A tick takes two round trips: "head" runs the phases up to
+    the drift scan's proposal and reports the shard's earliest flagged entities;
+    "tail" applies the scan up to the global quota cutoff, finishes the local
+    phases and exports fusion candidates.
+    """
+    engine = SimulationEngine([make_entity(i) for i in range(start, stop)], phases=phases,
+                              seed=seed, order=range(start, stop), log_dir=log_dir, shard=shard)
+    head, tail = split_phases(phases)
+    scan = None
+    conn.send("ready")
+    while True:
+        command, payload = conn.recv()
+        if command == "head":
+            events_before = dict(engine.events)
+            engine.begin_tick()
+            spent = engine.run_phases(head)
+            flagged = []
+            if "drift" in phases:
+                population = len(engine.entities)
+                started = time.perf_counter()
+                scan = engine.drift_propose()
+                flagged = engine.drift_flagged_order(scan).tolist()
+                spent["drift"] = time.perf_counter() - started
+                engine.record("drift", spent["drift"], population)
+            conn.send((spent, flagged))
+        elif command == "tail":
+            spent = {}
+            if scan is not None:
+                started = time.perf_counter()
+                engine.drift_apply(scan, payload)
+                spent["drift"] = time.perf_counter() - started
+                engine.timings["drift"] += spent["drift"]
+                scan = None
+            spent.update(engine.run_phases(tail))
+            engine.tick_count += 1
+            events = {k: v - events_before[k] for k, v in engine.events.items()}
+            eligible = {id(e) for e in fusion_candidates(engine.entities)}
+            candidates = [FusionCandidate(shard, i, int(engine.order[i]), e)
+                          for i, e in enumerate(engine.entities) if id(e) in eligible]
+            conn.send((spent, events, len(engine.entities), candidates))
+        elif command == "adopt":
+            fusions, retired = payload
+            fused, orders = [], []
+            for index, partner, shared, order in fusions:
+                if isinstance(partner, int):
+                    partner = engine.entities[partner]
+                owner = engine.entities[index]
+                fused.append(fuse_entities(owner, partner, shared, eid=fused_id(owner.id, partner.id)))
+                orders.append(order)
+            for index, child_id in retired:  # this shard's parents of fusions adopted elsewhere
+                engine.entities[index].mark_fused(child_id)
+            engine.add_entities(fused, orders)
+            conn.send(len(fused))
+        elif command == "fingerprints":
+            conn.send(engine.fingerprints())
+        elif command == "stop":
+            engine.close()
+            conn.send(None)
+            conn.close()
+            return
+
+
+def quota_cutoff(flagged_orders, limit: int = MAX_QUARANTINE_PER_CYCLE):
+    """Global position of the entity that fills the quarantine quota, or None."""
+    flagged = sorted(o for shard in flagged_orders for o in shard)
+    return flagged[limit - 1] if len(flagged) >= limit else None
+
+
+class ShardedSimulation:
+    """
+    The simulation split across worker processes. Each worker owns a
+    contiguous shard and runs emotion → dream → quest → drift → healing
+    locally; only fusion candidates travel to the parent, which ranks pairs
+    across shards and tells each shard which fusions to adopt.
+    Draws come from per-entity RNG streams and the quarantine quota and fusion
+    ties follow global population order, so a run is bit-identical to a
+    single-process SimulationEngine with the same seed, for any worker count.
+    With log_dir, each shard spills its entities' old log entries to its own
+    log_dir/shard-<n>.log.
+    """
+
+    def __init__(self, population: int, workers: int, seed=None, make_entity=demo_entity,
+                 phases=LOCAL_PHASES, fusion_interval: int = 1, log_dir: str = None):
+        self.population = population
+        self.workers = max(1, min(workers, population))
+        self.fusion_interval = max(1, fusion_interval)
+        self.tick_count = 0
+        self.next_order = population
+        self.fused_ids = set()  # ids of every fused entity so far
+        self.timings = {phase: 0.0 for phase in tuple(phases) + ("fusion",)}
+        self.entity_ticks = 0
+        self.wall_seconds = 0.0
+        self.events = {"alerts": 0, "healed": 0, "fusions": 0, "dream_transitions": 0, "caught_up": 0}
+        ctx = get_context("fork" if "fork" in get_all_start_methods() else None)
+        self._conns = []
+        self._procs = []
+        for shard, (start, stop) in enumerate(shard_bounds(population, self.workers)):
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_shard_worker, daemon=True,
+                               args=(child, shard, start, stop, make_entity, seed, tuple(phases), log_dir))
+            proc.start()
+            self._conns.append(parent)
+            self._procs.append(proc)
+        for conn in self._conns:
+            conn.recv()
+
+    def _broadcast(self, command, payload=None) -> list:
+        for conn in self._conns:
+            conn.send((command, payload))
+        return [conn.recv() for conn in self._conns]
+
+    def merge_fusions(self, candidates) -> dict:
+        """
+        Rank pairs over every shard's candidates in global population order,
+        group the chosen fusions by the shard owning the first entity and give
+        each fused entity the next global position. Per shard: (fusions to
+        adopt, (index, child id) of its parents fused on another shard).
+        Pairs whose child id already exists are never fused again.
+        """
+        candidates = sorted(candidates, key=lambda c: c.order)
+        ranked = [pair for pair in rank_pairs(candidates, [c.glyphs for c in candidates])
+                  if fused_id(pair[0].id, pair[1].id) not in self.fused_ids]
+        orders = {}
+        for a, b, shared in select_fusions(ranked):
+            child_id = fused_id(a.id, b.id)
+            self.fused_ids.add(child_id)
+            if b.shard == a.shard:
+                partner = b.index
+            else:
+                partner = b
+                orders.setdefault(b.shard, ([], []))[1].append((b.index, child_id))
+            orders.setdefault(a.shard, ([], []))[0].append((a.index, partner, shared, self.next_order))
+            self.next_order += 1
+        return orders
+
+    def tick(self) -> dict:
+        tick_start = time.perf_counter()
+        heads = self._broadcast("head")
+        results = self._broadcast("tail", quota_cutoff(flagged for _, flagged in heads))
+        spent = {}
+        # Shards run in parallel, so a phase costs as much as its slowest shard.
+        for phase in self.timings:
+            if phase != "fusion":
+                spent[phase] = max(h[0].get(phase, 0.0) + r[0].get(phase, 0.0) for h, r in zip(heads, results))
+                self.timings[phase] += spent[phase]
+        for _, events, _, _ in results:
+            for key, value in events.items():
+                self.events[key] += value
+        self.entity_ticks += sum(r[2] for r in results)
+
+        start = time.perf_counter()
+        if self.tick_count % self.fusion_interval == 0:
+            candidates = [c for r in results for c in r[3]]
+            orders = self.merge_fusions(candidates)
+            for shard, fusions in orders.items():
+                self._conns[shard].send(("adopt", fusions))
+            for shard in orders:
+                self.events["fusions"] += self._conns[shard].recv()
+        spent["fusion"] = time.perf_counter() - start
+        self.timings["fusion"] += spent["fusion"]
+        self.wall_seconds += time.perf_counter() - tick_start
+        self.tick_count += 1
+        return spent
+
+    def run(self, ticks: int) -> dict:
+        for _ in range(ticks):
+            self.tick()
+        return self.report()
+
+    def digest(self) -> str:
+        """Same value as SimulationEngine.digest() for the equivalent single-process run."""
+        return population_digest(fp for shard in self._broadcast("fingerprints") for fp in shard)
+
+    def report(self) -> dict:
+        numeric = sum(self.timings[p] for p in NUMERIC_PHASES if p in self.timings)
+        return {
+            "workers": self.workers,
+            "ticks": self.tick_count,
+            "population": self.population,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "phases": {phase: round(s, 4) for phase, s in self.timings.items()},
+            "entity_ticks_per_sec": round(self.entity_ticks / self.wall_seconds) if self.wall_seconds else None,
+            "numeric_entity_ticks_per_sec": round(self.entity_ticks / numeric) if numeric else None,
+            "events": dict(self.events),
+        }
+
+    def close(self):
+        if not self._conns:
+            return
+        self._broadcast("stop")
+        for proc in self._procs:
+            proc.join()
+        self._conns, self._procs = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,98 +1,500 @@
-import uuid
-from datetime import datetime
-
-from core.dream_state import DreamState
-from core.emotion_engine import EmotionState
-from memory.memory_crystal import MemoryCrystal
-from inventory.inventory_engine import Inventory, InventoryItem
-
-
-class Entity:
-    def __init__(self, memory_snapshot: str, archetype: str = "generic"):
-        self.id = str(uuid.uuid4())[:8]
-        self.archetype = archetype
-        self.memory_snapshot = memory_snapshot
-        self.current_memory = memory_snapshot
-
-        # Core cognitive systems
-        self.crystal = MemoryCrystal()
-        self.emotion = EmotionState()
-        self.dream = DreamState()
-        self.inventory = Inventory()
-
-        # Symbolic state
-        self.drift_level = 0.0
-        self.status = "active"
-        self.snapshot_hashes = {}
-
-        # Metadata
-        self.metadata = {
-            "created_at": datetime.now().isoformat(),
-            "archetype_flags": [],
-            "log": [],
-            "quarantine_reason": None,
-        }
+# simulation_loop.py
 
-    # === Symbolic Memory & Drift ===
-    def update_memory(self, new_memory: str):
-        self._log("memory_update", {"from": self.current_memory, "to": new_memory})
-        self.current_memory = new_memory
-
-    def set_drift(self, value: float):
-        self.drift_level = max(0.0, min(value, 1.0))
-        self._log("drift_adjust", {"value": self.drift_level})
-
-    def snapshot(self):
-        self.snapshot_hashes = self.crystal.vault.copy()
-        self._log("snapshot", {"hashes": list(self.snapshot_hashes.keys())})
-
-    def drift_from_snapshot(self) -> float:
-        return self.crystal.compare_drift(self.snapshot_hashes)
-
-    # === Lifecycle & Status Management ===
-    def quarantine(self, reason: str):
-        self.status = "quarantined"
-        self.metadata["quarantine_reason"] = reason
-        self._log("quarantine", {"reason": reason})
-
-    def reintegrate(self):
-        self.status = "active"
-        self.metadata["quarantine_reason"] = None
-        self._log("reintegrated")
-
-    def is_quarantined(self) -> bool:
-        return self.status == "quarantined"
-
-    # === Inventory System ===
-    def gain_item(self, name: str, rarity: str = "common", props: dict = None):
-        item = InventoryItem(name=name, rarity=rarity, properties=props or {})
-        self.inventory.add_item(item)
-        self._log("gain_item", {"item": item.name, "rarity": rarity})
-
-    def has_item(self, name: str) -> bool:
-        return self.inventory.has_item(name)
-
-    def list_inventory(self) -> list:
-        return self.inventory.list_items()
-
-    # === Metadata & Description ===
-    def _log(self, action: str, data: dict = None):
-        entry = {
-            "timestamp": datetime.now().isoformat(),
-            "action": action
-        }
-        if data:
-            entry.update(data)
-        self.metadata["log"].append(entry)
+import argparse
+import hashlib
+import logging
+import time
+
+import numpy as np
+
+from civilization.village_engine import Village
+from config.settings import DRIFT_DECAY_RATE
+from core.dream_state import evolve_population, perform_dream_bloom
+from core.emotion_engine import FLUCTUATION, NEUROCHEMICALS
+from core.entity import Entity
+from core.entity_store import shared_store
+from core.fusion_engine import find_fusion_pairs, fuse_entities, fused_id, select_fusions
+from core.fusion_maintainer import FusionCandidateMaintainer
+from core.metadata_log import LogSpill
+from core.phase_scheduler import Phase, PhaseScheduler
+from core.rng import RngService
+from drift.drift_engine import (
+    MAX_QUARANTINE_PER_CYCLE, DriftScan, apply_drift_scan, propose_drift_scan, run_drift_scan,
+)
+from drift.healing_rituals import healing_echo, reweaving_ritual
+from environment.envgen import Nation
+from quests.quest_engine import progress_quest
+
+PHASES = ("emotion", "dream", "quest", "drift", "healing", "fusion")
+NUMERIC_PHASES = ("emotion", "dream", "drift")
+WORLD_PHASES = ("village", "environment")
+
+# (reads, writes) per phase, for the phase scheduler. "population" is the
+# stepped entity list and its cached arrays; emotion reads drift as of the
+# start of the tick (a snapshot), so later drift writers don't order it.
+PHASE_ACCESS = {
+    "emotion": ({"population", "tick_drift", "emotion"}, {"emotion"}),
+    "dream": ({"population", "dream", "memory"}, {"dream", "memory", "drift", "status", "inventory", "metadata"}),
+    "quest": ({"population", "quests", "drift"}, {"quests", "inventory", "drift", "metadata"}),
+    "drift": ({"population", "drift", "status"}, {"drift", "status", "metadata"}),
+    "healing": ({"population", "status", "drift", "memory"}, {"status", "drift", "memory", "inventory", "metadata"}),
+    "fusion": ({"population", "crystal", "memory", "drift", "status"}, {"population", "metadata"}),
+    "village": ({"villages"}, {"villages"}),
+    "environment": ({"nations"}, {"nations"}),
+}
+
+DEMO_MOTIFS = ["veil", "glyph", "echo", "threshold", "stars", "mirror", "ash", "bloom"]
+DEMO_CRYSTAL_EVERY = 100  # one demo entity in this many carries motifs (fusion candidates)
+
+
+def demo_entity(index: int) -> Entity:
+    """Deterministic synthetic entity for benchmarks; a function of its index only."""
+    motif = DEMO_MOTIFS[index % len(DEMO_MOTIFS)]
+    e = Entity(name=f"sim-{index}", memory_snapshot=f"{motif} of the veil", eid=f"{index:08x}")
+    if index % DEMO_CRYSTAL_EVERY == 0:
+        e.crystal.embed_many(DEMO_MOTIFS[(index // DEMO_CRYSTAL_EVERY + k) % len(DEMO_MOTIFS)] for k in range(3))
+    return e
+
+
+class SimulationEngine:
+    """
+    Advances a whole population one tick at a time through ordered phases:
+    emotion → dream → quest → drift scan → healing → fusion.
+    Each phase runs as one batch over the population and its wall time is
+    accumulated in `timings`. Fused entities join the population.
+
+    Every random draw comes from an RngService stream keyed by (entity, tick,
+    phase), so a seed reproduces a run exactly — also when the same population
+    is split across shards (see core.sharded_simulation). `order` holds each
+    entity's global population position, which the order-dependent policies
+    (quarantine quota, fusion ties) follow.
+
+    With dormant_after set, entities nobody has touched for that many ticks go
+    dormant and are skipped by every phase, so a tick costs in proportion to
+    the active population. touch() wakes entities; their dream cycles, drift
+    decay and emotion relaxation since they went dormant are caught up in
+    closed form first (see catch_up()).
+
+    Villages and nations, if given, tick alongside as the "village" and
+    "environment" phases. Each tick runs through a PhaseScheduler built from
+    PHASE_ACCESS; with workers > 1, phases that don't conflict (emotion beside
+    the drift chain, the world phases beside everything) overlap on threads.
+    Per-tick critical paths are kept in `schedule`.
+
+    With log_dir set, log entries entities rotate out of their in-memory ring
+    (ENTITY_LOG_CAPACITY) are spilled to log_dir/shard-<shard>.log.
+    """
+
+    def __init__(self, entities, phases=PHASES, fusion_interval: int = 1, seed=None, order=None,
+                 dormant_after: int = None, villages=(), nations=(), workers: int = 1,
+                 log_dir: str = None, shard: int = 0):
+        self.entities = list(entities)
+        self.dormant_after = dormant_after
+        self.rng = RngService(seed)
+        self.villages = list(villages)
+        self.nations = list(nations)
+        world = [p for p, members in zip(WORLD_PHASES, (self.villages, self.nations)) if members and p not in phases]
+        self.phases = tuple(phases) + tuple(world)
+        self.workers = workers
+        self._scheduler = None
+        self._fusion = None
+        self.schedule = {"wall_seconds": 0.0, "serial_seconds": 0.0, "critical_seconds": 0.0, "last": None}
+        self.fusion_interval = max(1, fusion_interval)
+        self.tick_count = 0
+        self.order = np.asarray(order if order is not None else range(len(self.entities)), dtype=np.int64)
+        self.next_order = int(self.order[-1]) + 1 if len(self.order) else 0
+        self.timings = {phase: 0.0 for phase in self.phases}
+        self.entity_ticks = {phase: 0 for phase in self.phases}
+        self.events = {"alerts": 0, "healed": 0, "fusions": 0, "dream_transitions": 0, "caught_up": 0}
+        self._index = {e.id: i for i, e in enumerate(self.entities)}
+        self.touched = np.zeros(len(self.entities), dtype=np.int64)  # tick each entity was last touched
+        self.since = np.full(len(self.entities), -1, dtype=np.int64)  # tick it went dormant, -1 if active
+        self.active = np.arange(len(self.entities), dtype=np.int64)
+        self._reindex()
+        self.log_spill = None
+        if log_dir and self.store is not None:
+            self.log_spill = self.store.log_spill = LogSpill(log_dir, shard)
+
+    def _reindex(self):
+        """
+        Cache the entities stepped this tick and the row and key arrays batch
+        phases index with; rebuilt when the population or the active set changes.
+        """
+        self.stepped = [self.entities[i] for i in self.active] if self.dormant_after else self.entities
+        self._order = self.order[self.active]
+        self.store = shared_store(self.stepped)
+        self._rows = self.store.rows_of(self.stepped) if self.store is not None else None
+        self.keys = self.rng.keys(self.stepped)
+        emotions = [e.emotion for e in self.stepped]
+        banks = {id(em._bank) for em in emotions}
+        if len(banks) == 1:
+            self._emotion_bank = emotions[0]._bank
+            self._emotion_rows = np.fromiter((em._row for em in emotions), dtype=np.int64, count=len(emotions))
+        else:
+            self._emotion_bank = self._emotion_rows = None
+        dreams = [e.dream for e in self.stepped]
+        banks = {id(d._bank) for d in dreams}
+        if len(banks) == 1:
+            self._dream_bank = dreams[0]._bank
+            self._dream_rows = np.fromiter((d._row for d in dreams), dtype=np.int64, count=len(dreams))
+        else:
+            self._dream_bank = self._dream_rows = None
+
+    def add_entities(self, entities, order=None):
+        """Append entities; order gives their global positions (default: next in line)."""
+        if order is None:
+            order = range(self.next_order, self.next_order + len(entities))
+        order = np.asarray(order, dtype=np.int64)
+        start = len(self.entities)
+        self.entities.extend(entities)
+        self._index.update((e.id, start + i) for i, e in enumerate(entities))
+        self.order = np.concatenate([self.order, order])
+        if len(order):
+            self.next_order = max(self.next_order, int(order.max()) + 1)
+        added = np.arange(start, len(self.entities), dtype=np.int64)
+        self.touched = np.concatenate([self.touched, np.full(len(added), self.tick_count, dtype=np.int64)])
+        self.since = np.concatenate([self.since, np.full(len(added), -1, dtype=np.int64)])
+        self.active = np.concatenate([self.active, added])
+        self._reindex()
+
+    # === Level of detail ===
+    def touch(self, entities):
+        """
+        Mark entities as in use (queried, dueled, shown): dormant ones are caught
+        up and rejoin the stepped population until left alone again.
+        """
+        idx = np.fromiter((self._index[e.id] for e in entities), dtype=np.int64)
+        self.catch_up(idx)
+        self.touched[idx] = self.tick_count
+        woken = idx[self.since[idx] >= 0]
+        if len(woken):
+            self.since[woken] = -1
+            self.active = np.union1d(self.active, woken)
+            self._reindex()
+
+    def _settle(self):
+        """Entities untouched for dormant_after ticks stop being stepped."""
+        if not self.dormant_after:
+            return
+        idle = self.touched[self.active] <= self.tick_count - self.dormant_after
+        if idle.any():
+            self.since[self.active[idle]] = self.tick_count
+            self.active = self.active[~idle]
+            self._reindex()
+
+    def catch_up(self, idx=None):
+        """
+        Bring dormant entities (all of them by default) up to the current tick
+        without waking them, at a cost independent of how long they slept.
+        For the ticks they sat out: dream cycles advance in closed form and the
+        last bloom among them fires, from the stream of the tick it fell on
+        (earlier ones only count toward dream_transitions); drift decays by
+        DRIFT_DECAY_RATE per tick after that bloom's reset; emotions relax
+        toward baseline.
+        """
+        idx = np.flatnonzero(self.since >= 0) if idx is None else np.asarray(idx, dtype=np.int64)
+        idx = idx[(self.since[idx] >= 0) & (self.since[idx] < self.tick_count)]
+        if not len(idx):
+            return
+        entities = [self.entities[i] for i in idx]
+        since = self.since[idx]
+        elapsed = self.tick_count - since
+
+        last_bloom = np.full(len(idx), -1, dtype=np.int64)
+        for bank, members in _group_by_bank(entities, lambda e: e.dream).items():
+            members = np.asarray(members, dtype=np.int64)
+            rows = np.fromiter((entities[m].dream._row for m in members), dtype=np.int64, count=len(members))
+            _, last_bloom[members], moved = bank.fast_forward(rows, elapsed[members])
+            self.events["dream_transitions"] += moved
+        for m in np.flatnonzero(last_bloom >= 0):
+            e = entities[m]
+            perform_dream_bloom(e, self.rng.for_entity(e.id, int(since[m] + last_bloom[m]), "dream"))
+
+        # A bloom resets drift; decay runs over the ticks after the last one.
+        decaying = elapsed - (last_bloom + 1)
+        store = shared_store(entities)
+        if store is not None:
+            rows = store.rows_of(entities)
+            store.drift[rows] = np.round(np.maximum(0.0, store.drift[rows] - DRIFT_DECAY_RATE * decaying), 3)
+            store.dirty[rows] = True
+        else:
+            for e, ticks in zip(entities, decaying):
+                e.drift_level = round(max(0.0, e.drift_level - DRIFT_DECAY_RATE * ticks), 3)
+        for bank, members in _group_by_bank(entities, lambda e: e.emotion).items():
+            rows = np.fromiter((entities[m].emotion._row for m in members), dtype=np.int64, count=len(members))
+            bank.relax(rows, elapsed[members])
+
+        self.since[idx] = self.tick_count
+        self.events["caught_up"] += len(idx)
+
+    def stream(self, stream: str):
+        """rng_for(entity) for this tick's per-entity draws in one phase."""
+        tick = self.tick_count
+        return lambda e: self.rng.for_entity(e.id, tick, stream)
+
+    # === Phases ===
+    def phase_emotion(self):
+        noise = self.rng.uniform(self.keys, self.tick_count, "emotion",
+                                 -FLUCTUATION, FLUCTUATION, width=len(NEUROCHEMICALS))
+        if self._emotion_bank is not None:
+            self._emotion_bank.mutate(self._emotion_rows, self._tick_drift, noise=noise)
+        else:
+            for e, drift, row_noise in zip(self.stepped, self._tick_drift, noise):
+                e.emotion._bank.mutate(np.array([e.emotion._row]), drift, noise=row_noise[None, :])
+
+    def phase_dream(self):
+        rng_for = self.stream("dream")
+        if self._dream_bank is not None:
+            moved = self._dream_bank.evolve(self._dream_rows, self.stepped, rng_for)
+        else:
+            moved = evolve_population(self.stepped, rng_for)
+        self.events["dream_transitions"] += moved
+
+    def phase_quest(self):
+        rng_for = self.stream("quest")
+        for e in self.stepped:
+            progress_quest(e, rng_for(e))
+
+    def drift_propose(self) -> DriftScan:
+        draws = self.rng.unit(self.keys, self.tick_count, "drift", width=2)
+        return propose_drift_scan(self.store, self._rows, draws=draws)
 
-    def describe(self) -> dict:
+    def drift_flagged_order(self, scan: DriftScan):
+        """Global positions of the flagged entities that could fill the quota."""
+        return self._order[scan.flagged[:MAX_QUARANTINE_PER_CYCLE]]
+
+    def drift_apply(self, scan: DriftScan, cutoff_order=None):
+        """Apply a proposed scan to every entity at or before global position cutoff_order."""
+        scanned = None if cutoff_order is None else int(np.searchsorted(self._order, cutoff_order, side="right"))
+        self.events["alerts"] += len(apply_drift_scan(self.stepped, self.store, self._rows, scan, scanned))
+
+    def phase_drift(self):
+        if self.store is None:
+            self.events["alerts"] += len(run_drift_scan(self.stepped, self.stream("drift")))
+            return
+        scan = self.drift_propose()
+        flagged = self.drift_flagged_order(scan)
+        self.drift_apply(scan, flagged[-1] if len(flagged) >= MAX_QUARANTINE_PER_CYCLE else None)
+
+    def phase_healing(self):
+        """Rituals only visit entities whose status makes them eligible."""
+        if self.store is not None:
+            status = self.store.status[self._rows]
+            wanted = (status == self.store.status_code("reintegrated")) | (status == self.store.status_code("quarantined"))
+            candidates = [self.stepped[i] for i in np.flatnonzero(wanted)]
+        else:
+            candidates = [e for e in self.stepped if e.status in ("reintegrated", "quarantined")]
+        rng_for = self.stream("healing")
+        for e in candidates:
+            rng = rng_for(e)
+            if healing_echo(e, rng) or reweaving_ritual(e, rng):
+                self.events["healed"] += 1
+
+    def phase_fusion(self):
+        if self.tick_count % self.fusion_interval:
+            return
+        fused = [fuse_entities(e1, e2, shared, eid=fused_id(e1.id, e2.id)) for e1, e2, shared in self.fusion_pairs()]
+        if fused:
+            self.events["fusions"] += len(fused)
+            self.add_entities(fused)
+
+    def fusion_pairs(self) -> list:
+        """
+        This cycle's fusions. A full, single-store population keeps a
+        FusionCandidateMaintainer between cycles; a changing active set
+        (dormant_after) is searched from scratch.
+        """
+        if self.dormant_after or self.store is None:
+            return select_fusions(find_fusion_pairs(self.stepped))
+        if self._fusion is None or self._fusion.store is not self.store:
+            self._fusion = FusionCandidateMaintainer(self.store)
+        self._fusion.sync(self.stepped, self._rows, self._order)
+        return self._fusion.select()
+
+    def phase_village(self):
+        for village in self.villages:
+            village.tick(self.rng.for_entity(village.id, self.tick_count, "village"))
+
+    def phase_environment(self):
+        for nation in self.nations:
+            nation.simulate_cycle(self.rng.for_entity(nation.name, self.tick_count, "environment"))
+
+    # === Driver ===
+    def begin_tick(self):
+        """Settle the active set and snapshot the drift levels this tick's emotions react to."""
+        self._settle()
+        if self._rows is not None:
+            self._tick_drift = self.store.drift[self._rows]
+        else:
+            self._tick_drift = np.array([e.drift_level for e in self.stepped], dtype=np.float64)
+
+    def scheduler(self) -> PhaseScheduler:
+        if self._scheduler is None:
+            phases = [Phase(name, getattr(self, f"phase_{name}"), *PHASE_ACCESS[name]) for name in self.phases]
+            self._scheduler = PhaseScheduler(phases, self.workers)
+        return self._scheduler
+
+    def record(self, phase: str, seconds: float, population: int):
+        self.timings[phase] += seconds
+        self.entity_ticks[phase] += population
+
+    def run_phases(self, phases) -> dict:
+        """Run some phases of the current tick; returns seconds per phase."""
+        spent = {}
+        for phase in phases:
+            population = len(self.stepped)
+            start = time.perf_counter()
+            getattr(self, f"phase_{phase}")()
+            spent[phase] = time.perf_counter() - start
+            self.record(phase, spent[phase], population)
+        return spent
+
+    def tick(self) -> dict:
+        """Run every phase once; returns this tick's seconds per phase."""
+        self.begin_tick()
+        population = len(self.stepped)
+        tick_report = self.scheduler().run()
+        spent = {}
+        for phase, span in tick_report["phases"].items():
+            spent[phase] = span["seconds"]
+            self.record(phase, span["seconds"], population)
+        for key in ("wall_seconds", "serial_seconds", "critical_seconds"):
+            self.schedule[key] += tick_report[key]
+        self.schedule["last"] = tick_report
+        self.tick_count += 1
+        return spent
+
+    def close(self):
+        if self.log_spill is not None:
+            self.log_spill.close()
+            if self.store.log_spill is self.log_spill:
+                self.store.log_spill = None
+            self.log_spill = None
+        if self._fusion is not None:
+            self._fusion.close()
+            self._fusion = None
+        if self._scheduler is not None:
+            self._scheduler.close()
+            self._scheduler = None
+
+    def run(self, ticks: int) -> dict:
+        for _ in range(ticks):
+            self.tick()
+        return self.report()
+
+    def report(self) -> dict:
+        phases = {}
+        for phase in self.phases:
+            seconds = self.timings[phase]
+            phases[phase] = {
+                "seconds": round(seconds, 4),
+                "entity_ticks_per_sec": round(self.entity_ticks[phase] / seconds) if seconds else None,
+            }
+        numeric = [p for p in NUMERIC_PHASES if p in self.phases]
+        numeric_seconds = sum(self.timings[p] for p in numeric)
+        numeric_ticks = self.entity_ticks[numeric[0]] if numeric else 0
         return {
-            "id": self.id,
-            "archetype": self.archetype,
-            "status": self.status,
-            "memory": self.current_memory,
-            "drift": round(self.drift_level, 3),
-            "essence": self.emotion.summary(),
-            "inventory": self.list_inventory(),
-            "snapshot_taken": bool(self.snapshot_hashes),
+            "ticks": self.tick_count,
+            "population": len(self.entities),
+            "active": len(self.active),
+            "phases": phases,
+            "numeric_entity_ticks_per_sec": round(numeric_ticks / numeric_seconds) if numeric_seconds else None,
+            "events": dict(self.events),
+            "schedule": {
+                "workers": self.workers,
+                "wall_seconds": round(self.schedule["wall_seconds"], 4),
+                "serial_seconds": round(self.schedule["serial_seconds"], 4),
+                "critical_seconds": round(self.schedule["critical_seconds"], 4),
+                "waits_for": self.scheduler().describe(),
+            },
         }
+
+    def fingerprints(self) -> list:
+        """(global position, state hash) per entity; see population_digest()."""
+        self.catch_up()
+        return [(int(o), entity_fingerprint(e)) for o, e in zip(self.order, self.entities)]
+
+    def digest(self) -> str:
+        return population_digest(self.fingerprints())
+
+
+def _group_by_bank(entities, part) -> dict:
+    """Positions of entities grouped by the bank behind part(entity)."""
+    groups = {}
+    for i, e in enumerate(entities):
+        view = part(e)
+        groups.setdefault(view._bank, []).append(i)
+    return groups
+
+
+def entity_fingerprint(e) -> bytes:
+    """Hash of an entity's simulated state (wall-clock timestamps and uuids excluded)."""
+    h = hashlib.blake2b(digest_size=16)
+    quests = [(q["type"], q["progress"], q["complete"]) for q in e.metadata.get("active_quests", [])]
+    h.update(repr((e.id, e.status, e.drift_level, e.current_memory, e.dream.current_layer,
+                   e.dream.cycles_in, quests, [i["name"] for i in e.list_inventory()])).encode("utf-8"))
+    h.update(e.emotion._bank.levels[e.emotion._row].tobytes())
+    return h.digest()
+
+
+def population_digest(fingerprints) -> str:
+    """Order-independent of sharding: entities are hashed by global position."""
+    h = hashlib.sha256()
+    for _, fp in sorted(fingerprints):
+        h.update(fp)
+    return h.hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the batch simulation loop")
+    parser.add_argument("--entities", type=int, default=10000, help="Population size")
+    parser.add_argument("--ticks", type=int, default=10, help="Ticks to run")
+    parser.add_argument("--phases", default=",".join(PHASES), help="Comma-separated phases to run, in order")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for a reproducible run")
+    parser.add_argument("--dormant-after", type=int, default=None,
+                        help="Stop stepping entities left untouched this many ticks")
+    parser.add_argument("--touch", type=int, default=0, help="Entities touched per tick (with --dormant-after)")
+    parser.add_argument("--villages", type=int, default=0, help="Villages ticking alongside the population")
+    parser.add_argument("--nations", type=int, default=0, help="Nations evolving alongside the population")
+    parser.add_argument("--workers", type=int, default=1, help="Threads for overlapping independent phases")
+    parser.add_argument("--schedule", action="store_true", help="Print each tick's critical path")
+    parser.add_argument("--log-dir", default=None, help="Spill entity log entries beyond the in-memory cap here")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    population = [demo_entity(i) for i in range(args.entities)]
+    villages = [Village(f"Village {i}", id=f"v{i:07d}", population=100) for i in range(args.villages)]
+    nations = [Nation(f"Nation-{i}") for i in range(args.nations)]
+    engine = SimulationEngine(population, phases=args.phases.split(","), seed=args.seed,
+                              dormant_after=args.dormant_after, villages=villages, nations=nations,
+                              workers=args.workers, log_dir=args.log_dir)
+    picker = np.random.default_rng(args.seed)
+    for _ in range(args.ticks):
+        if args.touch:
+            chosen = picker.choice(len(engine.entities), min(args.touch, len(engine.entities)), replace=False)
+            engine.touch([engine.entities[i] for i in chosen])
+        engine.tick()
+        if args.schedule:
+            last = engine.schedule["last"]
+            print(f"⏱ Tick {engine.tick_count - 1}: {' → '.join(last['critical_path'])} "
+                  f"{last['critical_seconds']:.3f}s critical / {last['serial_seconds']:.3f}s serial "
+                  f"/ {last['wall_seconds']:.3f}s wall")
+    report = engine.report()
+    engine.close()
+
+    print(f"🌀 {report['ticks']} ticks over {report['population']} entities ({report['active']:,} active)")
+    for phase, row in report["phases"].items():
+        rate = f"{row['entity_ticks_per_sec']:,}" if row["entity_ticks_per_sec"] else "—"
+        print(f"  {phase:<11} {row['seconds']:>8.3f}s  {rate} entity-ticks/s")
+    if report["numeric_entity_ticks_per_sec"]:
+        print(f"📊 Numeric phases: {report['numeric_entity_ticks_per_sec']:,} entity-ticks/s")
+    print(f"🔔 Events: {report['events']}")
+    schedule = report["schedule"]
+    print(f"🧵 {schedule['workers']} worker(s): {schedule['wall_seconds']:.3f}s wall, "
+          f"{schedule['critical_seconds']:.3f}s critical path, {schedule['serial_seconds']:.3f}s serial")
+    if args.seed is not None:
+        print(f"🔁 State digest: {engine.digest()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,8 +14,8 @@ def export_entity(entity):
         "memory": entity.current_memory,
         "drift": entity.drift_level,
         "status": entity.status,
-        "motifs": [frag["text"] for frag in entity.crystal.fragments.values()],
-        "emotions": entity.emotion.levels,
+        "motifs": entity.crystal.texts(),
+        "emotions": dict(entity.emotion.levels),
         "dream": entity.dream.current_layer,
         "timestamp": datetime.now().isoformat()
     }
@@ -3,7 +3,7 @@ import json
 import random
 import zipfile
 from datetime import datetime
-from flask import Flask, render_template_string, request
+from flask import Flask, render_template_string, request, jsonify
 
 # === App Setup and Blueprints ===
 from dashboard_entity_manager import entity_bp
@@ -11,7 +11,7 @@ from dashboard_arena_extension import arena_bp
 from dashboard_prompt_extension import prompt_ui
 from village_dashboard import village_bp
 from world_map import world_bp
-from utils.entity_loader import load_entities, save_entities
+from utils.entity_cache import init_app as init_entity_cache, current_cache
 
 app = Flask(__name__)
 app.register_blueprint(entity_bp, url_prefix="/entities")
@@ -19,6 +19,7 @@ app.register_blueprint(arena_bp, url_prefix="/arena")
 app.register_blueprint(prompt_ui, url_prefix="/prompts")
 app.register_blueprint(village_bp)
 app.register_blueprint(world_bp)
+entity_cache = init_entity_cache(app)
 
 # === Fallback Reader ===
 def read_lines_with_fallback(path):
@@ -34,7 +35,7 @@ def read_lines_with_fallback(path):
 # === Symbolic Training ===
 @app.route("/train")
 def symbolic_training():
-    entities = load_entities()
+    entities = current_cache().all()
     training_logs = []
     training_path = "training_data"
     trained = 0
@@ -89,6 +90,7 @@ def symbolic_training():
                     if lines:
                         for ent in entities.values():
                             ent.memory.extend(lines)
+                            ent.touch()
                             ent.stats["ess"] = round(min(ent.stats.get("ess", 0.5) + 0.01, 1.5), 3)
                         training_logs.append(f"📦 {inner} ({len(lines)} lines, {enc})")
                         trained += 1
@@ -99,13 +101,14 @@ def symbolic_training():
             if lines:
                 for ent in entities.values():
                     ent.memory.extend(lines)
+                    ent.touch()
                     ent.stats["ess"] = round(min(ent.stats.get("ess", 0.5) + 0.01, 1.5), 3)
                 training_logs.append(f"📚 {fname} ({len(lines)} lines, {enc})")
                 trained += 1
             else:
                 training_logs.append(f"❌ {fname}: unreadable")
 
-    save_entities(entities)
+    current_cache().save(entities)
 
     return render_template_string("""
     <html>
@@ -123,6 +126,11 @@ def symbolic_training():
     </html>
     """, logs=training_logs, count=trained)
 
+# === Cache Diagnostics ===
+@app.route("/cache")
+def cache_stats():
+    return jsonify(current_cache().stats())
+
 # === Homepage ===
 @app.route("/")
 def index():
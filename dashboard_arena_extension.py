@@ -1,5 +1,5 @@
 from flask import Blueprint, request, render_template_string
-from utils.entity_loader import load_entities  # Added missing import
+from utils.entity_cache import current_cache
 import json
 import os
 import random
@@ -219,7 +219,7 @@ def generate_prompt():
 # === Base Arena Duel ===
 @arena_bp.route("/", methods=["GET", "POST"])
 def arena_duel():
-    entities = load_entities()
+    entities = current_cache().all()
     villages = load_all_villages()
     ids = list(entities.keys())
     log = ""
@@ -272,7 +272,7 @@ def arena_duel():
 # === Group Symbolic Debate ===
 @arena_bp.route("/group")
 def group_debate():
-    entities = load_entities()
+    entities = current_cache().all()
     villages = load_all_villages()
     prompt = generate_prompt()
 
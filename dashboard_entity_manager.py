@@ -1,5 +1,7 @@
 from flask import Blueprint, request, render_template_string, redirect, url_for
-from utils.entity_loader import load_entities, save_entities
+from utils.entity_cache import current_cache
+from utils.sqlite_repository import SQLiteEntityRepository, sqlite_enabled
+import math
 import os
 import json
 
@@ -27,14 +29,59 @@ def load_village_names():
                     continue
     return sorted(names)
 
+LIST_FILTERS = ("status", "archetype", "drift_min", "drift_max", "ess_min", "sd_min")
+
+def filtered_entities(filters: dict) -> dict:
+    """Entities matching the list-page filters, resolved through the SQLite index when present."""
+    cache = current_cache()
+    if not filters:
+        return cache.all()
+    if sqlite_enabled():
+        ids = SQLiteEntityRepository().query_ids(**filters)
+        found = {eid: cache.get(eid) for eid in ids}
+        return {eid: e for eid, e in found.items() if e is not None}
+
+    def matches(e):
+        checks = {
+            "status": lambda v: e.status == v,
+            "archetype": lambda v: e.archetype == v,
+            "drift_min": lambda v: e.drift_level >= v,
+            "drift_max": lambda v: e.drift_level <= v,
+            "ess_min": lambda v: e.stats.get("ess", 0) >= v,
+            "sd_min": lambda v: e.stats.get("sd", 0) >= v,
+        }
+        return all(checks[k](v) for k, v in filters.items())
+    return {eid: e for eid, e in cache.all().items() if matches(e)}
+
 @entity_bp.route("/", methods=["GET"])
 def list_entities():
-    entities = load_entities()
+    filters = {}
+    for key in LIST_FILTERS:
+        value = request.args.get(key)
+        if not value:
+            continue
+        if key in ("status", "archetype"):
+            filters[key] = value
+            continue
+        try:
+            number = float(value)
+        except ValueError:
+            number = math.nan
+        if not math.isfinite(number):  # nan/inf parse, but match nothing sensibly
+            return f"❌ Invalid {key}: '{value}' is not a number.", 400
+        filters[key] = number
+    entities = filtered_entities(filters)
     summaries = {eid: e.describe() for eid, e in entities.items()}
     return render_template_string("""
 <html>
 <body style="background:#000;color:#0f0;font-family:monospace;padding:2rem;">
   <h1>📋 Entity List</h1>
+  <form method="get" style="margin-bottom:1rem;">
+    Status: <input name="status" value="{{ filters.get('status', '') }}" size="10">
+    Archetype: <input name="archetype" value="{{ filters.get('archetype', '') }}" size="10">
+    Drift ≥ <input name="drift_min" value="{{ filters.get('drift_min', '') }}" size="4">
+    <button type="submit">🔎 Filter</button>
+  </form>
   {% for eid, ent in entities.items() %}
     <div style="margin-bottom:1rem;padding:1rem;border:1px solid #0f0;">
       <a href="{{ url_for('entity_bp.entity_detail', eid=eid) }}">
@@ -48,12 +95,11 @@ def list_entities():
   <a href="/">← Back</a>
 </body>
 </html>
-""", entities=summaries)
+""", entities=summaries, filters=filters)
 
 @entity_bp.route("/<eid>", methods=["GET", "POST"])
 def entity_detail(eid):
-    entities = load_entities()
-    entity = entities.get(eid)
+    entity = current_cache().get(eid)
     msg = ""
 
     if not entity:
@@ -61,8 +107,7 @@ def entity_detail(eid):
 
     if request.method == "POST":
         if "delete" in request.form:
-            entities.pop(eid)
-            save_entities(entities)
+            current_cache().delete(eid)
             return redirect(url_for("entity_bp.list_entities"))
 
         entity.name = request.form.get("name", entity.name)
@@ -71,13 +116,14 @@ def entity_detail(eid):
         entity.stats["ess"] = float(request.form.get("ess", entity.stats.get("ess", 0.5)))
         entity.stats["sd"] = float(request.form.get("sd", entity.stats.get("sd", 0.5)))
         entity.drift_level = float(request.form.get("drift", entity.drift_level))
-        entity.village = request.form.get("village", entity.__dict__.get("village", "None"))
+        entity.village = request.form.get("village", entity.village or "None")
 
         new_item = request.form.get("new_item")
         if new_item:
             entity.inventory.add_item({"name": new_item, "rarity": "manual"})
+            entity.touch()
 
-        save_entities(entities)
+        current_cache().save(entity)
         msg = "✅ Changes saved."
 
     villages = load_village_names()
@@ -106,7 +152,7 @@ def entity_detail(eid):
             <select name="village">
                 <option value="">None</option>
                 {% for v in villages %}
-                    <option value="{{ v }}" {% if v == entity.__dict__.get('village') %}selected{% endif %}>{{ v }}</option>
+                    <option value="{{ v }}" {% if v == entity.village %}selected{% endif %}>{{ v }}</option>
                 {% endfor %}
             </select><br>
 
@@ -3,7 +3,7 @@ import random
 from datetime import datetime
 import os
 from inventory.inventory_engine import generate_item, add_item_to_inventory
-from utils.entity_loader import load_entities, save_entities
+from utils.entity_cache import current_cache
 
 prompt_ui = Blueprint("prompt_ui", __name__, url_prefix="/prompts")
 
@@ -89,7 +89,7 @@ def get_feelings(ent):
 
 @prompt_ui.route("/", methods=["GET", "POST"])
 def prompt():
-    entities = load_entities()
+    entities = current_cache().all()
     if not entities:
         return "⚠️ No entities found."
 
@@ -147,6 +147,7 @@ def prompt():
                     # Update memory
                     memory_line = f"💭 Prompt: '{user_input}'\n→ Reply:\n{reply}"
                     ent.memory.insert(0, memory_line)
+                    ent.touch()
                     ent.stats["ess"] = round(min(ent.stats.get("ess", 0.5) + 0.01, 1.5), 3)
 
                     # Reward system
@@ -155,7 +156,7 @@ def prompt():
                         add_item_to_inventory(ent, reward)
                         replies[eid] += f"\n\n🎁 Received: {reward['name']}"
 
-            save_entities(entities)
+            current_cache().save(entities)
 
         elif action == "save" and user_input:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
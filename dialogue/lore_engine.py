@@ -6,7 +6,7 @@ from utils.glyph_parser import extract_glyphs
 def generate_lore_scroll(entity) -> str:
     name = entity.id
     archetype = entity.archetype
-    motifs = [frag["text"] for frag in entity.crystal.fragments.values()]
+    motifs = entity.crystal.texts()
     recent_prompts = entity.dialogue.get_recent_prompts(3) if hasattr(entity, "dialogue") else []
     fusion_from = entity.metadata.get("fused_from", [])
     dream_state = entity.dream.current_layer if hasattr(entity, "dream") else "unknown"
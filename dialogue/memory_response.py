@@ -32,4 +32,4 @@ def reflective_memory_reply(entity, prompt: str) -> str:
 
 def get_recent_motifs(entity, limit=3):
     """Return N most recent motifs from memory."""
-    return [frag["text"] for frag in list(entity.crystal.fragments.values())[-limit:]]
+    return entity.crystal.texts()[-limit:]
@@ -1,17 +1,18 @@
 import logging
 from datetime import datetime
-from random import uniform, random
+import random
 from math import exp
 
+import numpy as np
+
+from core.entity_store import shared_store
+
 # === Thresholds & Quarantine Policy ===
 DRIFT_THRESHOLD = 0.35
 HOLLOW_THRESHOLD = 0.50
 COHERENCE_MIN = 0.50
 MAX_QUARANTINE_PER_CYCLE = 20
 
-# === In-Memory Quarantine Tracker ===
-quarantined_entities = set()
-
 def drift_alert(entity_id, level):
     log_msg = f"[{datetime.now()}] 🚨 DRIFT ALERT: {entity_id} → {level.upper()}"
     logging.warning(log_msg)
@@ -22,37 +23,51 @@ def drift_alert(entity_id, level):
         "timestamp": datetime.now().isoformat()
     }
 
-def memory_drift(entity):
+def memory_drift(entity, rng=random):
     """
     Simulate symbolic drift based on emotion state, SD, or raw uniform entropy.
     If entity has 'sd', we bias the drift upward logarithmically.
     """
-    base = uniform(0.05, 0.25)
+    base = rng.uniform(0.05, 0.25)
     if hasattr(entity, "sd"):
         normalized_sd = min(entity.sd / 6000, 1.5)
         return base + min(0.5, 0.3 * exp(normalized_sd - 1.0))
     return base
 
-def mythic_coherence(entity):
+def mythic_coherence(entity, rng=random):
     """
     Simulate symbolic coherence.
     Biases higher if ESS is high and drift is low.
     """
-    base = uniform(0.3, 1.0)
+    base = rng.uniform(0.3, 1.0)
     ess = getattr(entity, "ess", 0.5)
     drift = getattr(entity, "drift_level", 0.3)
     return round(min(1.0, base * (0.8 + ess) / (1.0 + drift)), 3)
 
 def quarantine(entity, reason):
-    if entity.id in quarantined_entities:
+    """Quarantine an entity once: its own status says whether it already is."""
+    if entity.status == "quarantined":
         return
-    quarantined_entities.add(entity.id)
     entity.status = "quarantined"
     entity.metadata["quarantine_reason"] = reason
     entity.metadata["quarantined_at"] = datetime.now().isoformat()
     logging.info(f"🛑 Entity {entity.id} quarantined for {reason}")
 
-def run_drift_scan(entities):
+def run_drift_scan(entities, rng_for=None, batch_rng=None):
+    """
+    rng_for(entity), if given, supplies each entity's random stream; otherwise
+    the `random` module does, so random.seed() reproduces a scan.
+    batch_rng (a numpy Generator) opts entities sharing an EntityStore into
+    the column-wise scan instead: much faster on large populations, but its
+    draws come from batch_rng and it writes the drift column directly, without
+    per-entity drift_adjust log entries.
+    """
+    entities = list(entities)
+    if batch_rng is not None and rng_for is None:
+        store = shared_store(entities)
+        if store is not None:
+            return run_drift_scan_batch(entities, store, rng=batch_rng)
+
     quarantined_this_cycle = 0
     alerts = []
 
@@ -61,8 +76,9 @@ def run_drift_scan(entities):
             logging.warning("⚠️ Max quarantine limit reached for this cycle.")
             break
 
-        drift = memory_drift(entity)
-        coherence = mythic_coherence(entity)
+        rng = rng_for(entity) if rng_for else random
+        drift = memory_drift(entity, rng)
+        coherence = mythic_coherence(entity, rng)
 
         entity.set_drift(round((entity.drift_level + drift) / 2, 3))
 
@@ -83,3 +99,82 @@ def run_drift_scan(entities):
             quarantined_this_cycle += 1
 
     return alerts
+
+
+class DriftScan:
+    """Draws and verdicts of a column-wise scan, computed before anything is written."""
+
+    __slots__ = ("previous", "drift", "emergent", "flagged")
+
+    def __init__(self, previous, drift, emergent, flagged):
+        self.previous = previous
+        self.drift = drift
+        self.emergent = emergent
+        self.flagged = flagged
+
+
+def propose_drift_scan(store, rows, rng=None, draws=None) -> DriftScan:
+    """
+    Draw drift and coherence for every row and classify it, without writing.
+    draws, if given, is an (n, 2) array of uniform [0, 1) values (e.g. per-entity
+    RngService draws); otherwise rng (a numpy Generator) or np.random is used.
+    """
+    if draws is None:
+        rng = rng or np.random
+        drift = rng.uniform(0.05, 0.25, len(rows))
+        base = rng.uniform(0.3, 1.0, len(rows))
+    else:
+        drift = 0.05 + (0.25 - 0.05) * draws[:, 0]
+        base = 0.3 + (1.0 - 0.3) * draws[:, 1]
+    previous = store.drift[rows]
+    # Entity exposes no 'ess' attribute, so mythic_coherence's 0.5 default applies.
+    coherence = np.round(np.minimum(1.0, base * 1.3 / (1.0 + previous)), 3)
+
+    emergent = (drift >= DRIFT_THRESHOLD) & (coherence >= COHERENCE_MIN)
+    hollow = ~emergent & ((drift >= HOLLOW_THRESHOLD) | (coherence < COHERENCE_MIN))
+    return DriftScan(previous, drift, emergent, np.flatnonzero(emergent | hollow))
+
+
+def quarantine_cutoff(flagged, total: int, limit: int = MAX_QUARANTINE_PER_CYCLE) -> int:
+    """How many rows the scan covers: up to and including the one that fills the quota."""
+    if len(flagged) >= limit:
+        return int(flagged[limit - 1]) + 1
+    return total
+
+
+def apply_drift_scan(entities, store, rows, scan: DriftScan, scanned: int = None):
+    """
+    Write the first `scanned` rows of a proposed scan and quarantine their
+    flagged entities. Drift goes straight into the store column: unlike
+    Entity.set_drift, no drift_adjust entries are logged.
+    """
+    scanned = len(rows) if scanned is None else scanned
+    if scanned < len(rows):
+        logging.warning("⚠️ Max quarantine limit reached for this cycle.")
+    store.dirty[rows[:scanned]] = True
+    store.drift[rows[:scanned]] = np.clip(np.round((scan.previous[:scanned] + scan.drift[:scanned]) / 2, 3), 0.0, 1.0)
+
+    alerts = []
+    for i in scan.flagged[:np.searchsorted(scan.flagged, scanned)]:
+        entity = entities[i]
+        if scan.emergent[i]:
+            quarantine(entity, "Emergent Drift")
+            alerts.append(drift_alert(entity.id, "emergent"))
+        else:
+            quarantine(entity, "Hollow Echo")
+            alerts.append(drift_alert(entity.id, "hollow"))
+    return alerts
+
+
+def run_drift_scan_batch(entities, store, rows=None, rng=None, draws=None):
+    """
+    Column-wise drift scan for entities backed by one EntityStore.
+    Same policy as the per-entity loop: entities after the one that fills the
+    quarantine quota are left untouched for this cycle.
+    Callers that scan the same population every tick can pass its rows,
+    and a numpy Generator or precomputed draws for reproducible runs.
+    """
+    if rows is None:
+        rows = store.rows_of(entities)
+    scan = propose_drift_scan(store, rows, rng, draws)
+    return apply_drift_scan(entities, store, rows, scan, quarantine_cutoff(scan.flagged, len(rows)))
@@ -1,11 +1,11 @@
 import logging
 from datetime import datetime
-from random import uniform
+import random
 
 from inventory.inventory_engine import generate_item  # Make sure this exists and is up to date
 
 
-def healing_echo(entity):
+def healing_echo(entity, rng=random):
     """
     Healing ritual: blend nostalgia + symbolic comfort to reduce drift.
     Simulated coherence improvement with symbolic placebo and reward.
@@ -14,7 +14,7 @@ def healing_echo(entity):
         return False
 
     pre_drift = entity.drift_level
-    recovery_bonus = uniform(0.05, 0.15)
+    recovery_bonus = rng.uniform(0.05, 0.15)
 
     # Simulate healing improvement
     entity.memory_snapshot = entity.current_memory
@@ -25,13 +25,12 @@ def healing_echo(entity):
         entity.status = "active"
 
     # Award healing item
-    item = generate_item(name="Echo Salve", rarity="uncommon", source="healing_ritual")
+    item = generate_item(name="Echo Salve", rarity="uncommon", source="healing_ritual", rng=rng)
     entity.gain_item(item)
 
     # Log healing details
     logging.info(f"[{datetime.now()}] Healing Echo on {entity.id}: Drift {pre_drift:.2f} → {entity.drift_level:.2f}, item granted: {item['name']}")
-    entity.metadata.setdefault("healing_history", []).append({
-        "timestamp": datetime.now().isoformat(),
+    entity.log_event("healing_echo", {
         "drift_before": round(pre_drift, 3),
         "drift_after": round(entity.drift_level, 3),
         "item": item["name"]
@@ -40,7 +39,7 @@ def healing_echo(entity):
     return True
 
 
-def reweaving_ritual(entity):
+def reweaving_ritual(entity, rng=random):
     """
     Deep symbolic reintegration for Hollow Echo state.
     Used when mythic coherence < 0.5 or drift > 0.5.
@@ -56,13 +55,10 @@ def reweaving_ritual(entity):
     entity.status = "reintegrated"
 
     # Grant deeper ritual item
-    item = generate_item(name="Weave Fragment", rarity="rare", source="reweaving_ritual")
+    item = generate_item(name="Weave Fragment", rarity="rare", source="reweaving_ritual", rng=rng)
     entity.gain_item(item)
 
     logging.info(f"[{datetime.now()}] Reweaving Ritual for {entity.id} — reintegrated with item: {item['name']}")
-    entity.metadata.setdefault("reweaving_log", []).append({
-        "timestamp": datetime.now().isoformat(),
-        "item": item["name"]
-    })
+    entity.log_event("reweaving_ritual", {"item": item["name"]})
 
     return True
@@ -1,25 +1,25 @@
 
-import json
 import os
 import random
 import time
 
+from storage.backends import open_storage
+
 ENTITY_FILE = "entities.json"
 MAX_ECHO_LENGTH = 300
 REVERENCE_INTERVAL = 4  # Every 4th interaction
 
 # === Load Entities from File ===
 def load_entities():
-    if os.path.exists(ENTITY_FILE):
-        with open(ENTITY_FILE, "r") as f:
-            return json.load(f)
+    storage = open_storage(ENTITY_FILE)
+    if storage.exists():
+        return storage.load_all()
     else:
         print(f"[⚠️] No entity file found at {ENTITY_FILE}")
         return {}
 
 def save_entities(entities):
-    with open(ENTITY_FILE, "w") as f:
-        json.dump(entities, f, indent=2)
+    open_storage(ENTITY_FILE).replace_all(entities.items())
 
 def resolve_entity(name_input, entity_dict):
     for name in entity_dict:
@@ -1,11 +1,8 @@
-import json
 import random
 import string
-import os
 from core.entity import Entity
 from core.archetypes import ARCHETYPES
-
-ENTITY_DIR = "entity_data"
+from utils.entity_loader import ENTITY_DIR, save_entities
 
 # Expanded symbolic pools
 EMOTIONS = [
@@ -97,12 +94,8 @@ def generate_entity(archetype=None):
     return entity
 
 def save_entity(entity):
-    if not os.path.exists(ENTITY_DIR):
-        os.makedirs(ENTITY_DIR)
-    path = os.path.join(ENTITY_DIR, f"{entity.id}.json")
-    with open(path, "w") as f:
-        json.dump(entity.to_dict(), f, indent=2)
-    print(f"[+] New entity '{entity.name}' ({entity.archetype}) saved to {path}")
+    save_entities({entity.id: entity})
+    print(f"[+] New entity '{entity.name}' ({entity.archetype}) saved to {ENTITY_DIR}/")
 
 def main():
     print("\n🧬 Evolved Entity Generator — AGIBuddy v0.4")
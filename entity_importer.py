@@ -1,32 +1,28 @@
 
 import os
-import json
+from storage.backends import open_storage, copy_records
 
 SOURCE_FILE = "entities.json"
 DEST_DIR = "entity_data"
 
+def with_id(eid, data):
+    data["id"] = eid  # Ensure ID is included
+    return eid, data
+
 def main():
-    if not os.path.exists(SOURCE_FILE):
+    source = open_storage(SOURCE_FILE)
+    if not source.exists():
         print(f"❌ Source file '{SOURCE_FILE}' not found.")
         return
 
-    with open(SOURCE_FILE, "r") as f:
-        try:
-            all_entities = json.load(f)
-        except Exception as e:
-            print(f"❌ Failed to parse JSON: {e}")
-            return
-
     os.makedirs(DEST_DIR, exist_ok=True)
+    try:
+        count = copy_records(source, open_storage(DEST_DIR), transform=with_id)
+    except ValueError as e:
+        print(f"❌ Failed to parse JSON: {e}")
+        return
 
-    for eid, data in all_entities.items():
-        data["id"] = eid  # Ensure ID is included
-        path = os.path.join(DEST_DIR, f"{eid}.json")
-        with open(path, "w") as out:
-            json.dump(data, out, indent=2)
-        print(f"✅ Imported: {eid} → {path}")
-
-    print(f"✅ All entities imported to '{DEST_DIR}/'")
+    print(f"✅ Imported {count} entities into '{DEST_DIR}/'")
 
 if __name__ == "__main__":
     main()
@@ -1,7 +1,8 @@
 
 import os
-import json
 from datetime import datetime
+from storage.backends import open_storage
+from storage.pipeline import transform_stream
 
 ENTITY_FILE = "entities.json"
 RITUAL_LOG_DIR = "ritual_logs/"
@@ -49,15 +50,14 @@ def reinforce_entity(name, entity):
     return entity, log, reinforced
 
 def load_entities():
-    if not os.path.exists(ENTITY_FILE):
+    storage = open_storage(ENTITY_FILE)
+    if not storage.exists():
         print(f"[❌] Missing {ENTITY_FILE}")
         return {}
-    with open(ENTITY_FILE, "r") as f:
-        return json.load(f)
+    return storage.load_all()
 
 def save_entities(entities):
-    with open(ENTITY_FILE, "w") as f:
-        json.dump(entities, f, indent=2)
+    open_storage(ENTITY_FILE).replace_all(entities.items())
 
 def save_log(name, log):
     stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -66,21 +66,45 @@ def save_log(name, log):
         f.write("\n".join(log))
     print(f"[📜] Ritual log saved: {path}")
 
+def needs_reinforcement(entity):
+    return entity.get("drift", 0) >= 0.25 or entity.get("needs_reinforcement", False)
+
+def reinforce_record(name, entity):
+    """Pipeline transform: the ritual log is the note for entities that changed."""
+    if not needs_reinforcement(entity):
+        return entity, None
+    entity, log, changed = reinforce_entity(name, entity)
+    return entity, log if changed else None
+
+def load_candidates(index):
+    """Only the entities that may need reinforcement, selected through the file's SQLite mirror."""
+    candidates = dict(index.query(drift_min=0.25))
+    candidates.update(index.query(flag="needs_reinforcement"))
+    return candidates
+
 def main():
     print("🌀 Running Entity Reinforcement Cycle...")
-    entities = load_entities()
-    updated = 0
-
-    for name, entity in entities.items():
-        if entity.get("drift", 0) >= 0.25 or entity.get("needs_reinforcement", False):
-            updated_entity, log, changed = reinforce_entity(name, entity)
-            entities[name] = updated_entity
-            if changed:
-                save_log(name, log)
-                updated += 1
+    storage = open_storage(ENTITY_FILE)
+    if not storage.exists():
+        print(f"[❌] Missing {ENTITY_FILE}")
+        return
+    index = storage.index()
+    if index is not None:
+        reinforced = {}
+        with storage.locked():  # candidates read, reinforced and written back as one step
+            for name, entity in load_candidates(index).items():
+                entity, log = reinforce_record(name, entity)
+                if log is not None:
+                    reinforced[name] = entity
+                    save_log(name, log)
+            updated = len(reinforced)
+            if updated > 0:
+                storage.upsert(reinforced.items())  # the file stays primary; its rewrite refreshes the mirror
+    else:
+        # Streams the file through in chunks; it is only rewritten if something changed.
+        updated = transform_stream(storage, reinforce_record, sink=save_log).changed
 
     if updated > 0:
-        save_entities(entities)
         print(f"✅ Reinforced {updated} entity(ies).")
     else:
         print("✨ No entities required reinforcement.")
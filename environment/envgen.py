@@ -51,15 +51,15 @@ class SymbolicArea:
         self.visits += 1
         self.drift = max(0.0, self.drift - 0.03)
 
-    def decay(self, external_drift=0.0):
+    def decay(self, external_drift=0.0, rng=random):
         drift_gain = 0.01 + external_drift * 0.05
         self.drift += drift_gain
-        if self.drift > 0.5 and random.random() < 0.3:
-            self.mutate()
+        if self.drift > 0.5 and rng.random() < 0.3:
+            self.mutate(rng)
 
-    def mutate(self):
+    def mutate(self, rng=random):
         old_type = self.type
-        self.type = random.choice(list(AREA_ARCHETYPES.keys()))
+        self.type = rng.choice(list(AREA_ARCHETYPES.keys()))
         archetype = AREA_ARCHETYPES[self.type]
         self.motifs = archetype["motifs"]
         self.effects = archetype["boost"]
@@ -83,9 +83,9 @@ class Town:
         self.foundation = datetime.now()
         self.culture_bias = random.choice(["fire", "veil", "mirror", "storm", "glyph"])
 
-    def evolve(self):
+    def evolve(self, rng=random):
         for area in self.areas:
-            area.decay(external_drift=random.uniform(0.01, 0.05))
+            area.decay(external_drift=rng.uniform(0.01, 0.05), rng=rng)
 
     def summary(self):
         return {
@@ -102,9 +102,10 @@ class Nation:
         self.ideological_drift = random.uniform(0.1, 0.4)
         self.symbolic_trait = random.choice(["dream", "grief", "pride", "light", "threshold"])
 
-    def simulate_cycle(self):
+    def simulate_cycle(self, rng=random):
+        """rng: any random.Random-like stream (e.g. an RngService stream)."""
         for town in self.towns:
-            town.evolve()
+            town.evolve(rng)
 
     def summary(self):
         return {
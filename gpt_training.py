@@ -1,20 +1,18 @@
-import json
 import os
 import time
 from datetime import datetime
 from gpt_bridge_optimized import GPTCommunicator
+from storage.backends import open_storage
 
 ENTITY_FILE = "entities.json"
 TRAINING_LOG_PATH = "training_logs"
 os.makedirs(TRAINING_LOG_PATH, exist_ok=True)
 
 def load_entities():
-    with open(ENTITY_FILE, "r") as f:
-        return json.load(f)
+    return open_storage(ENTITY_FILE).load_all()
 
 def save_entities(entities):
-    with open(ENTITY_FILE, "w") as f:
-        json.dump(entities, f, indent=2)
+    open_storage(ENTITY_FILE).replace_all(entities.items())
 
 def build_prompt(entity_name, data):
     tokens = ", ".join(data.get("tokens", []))
@@ -38,13 +36,14 @@ Output the response as a structured message including: [Echoes], [Metaphor], [Id
 """
 
 def train_entity(name):
-    entities = load_entities()
-    if name not in entities:
+    storage = open_storage(ENTITY_FILE)
+    entity = storage.get(name)
+    if entity is None:
         print(f"[❌] Entity '{name}' not found.")
         return
 
     gpt = GPTCommunicator()
-    prompt = build_prompt(name, entities[name])
+    prompt = build_prompt(name, entity)
     print(f"[🔁] Sending to GPT for symbolic training...")
     response = gpt.ask(prompt)
 
@@ -53,17 +52,24 @@ def train_entity(name):
         f.write(prompt + "\n\n---\n\n" + response)
     print(f"[📁] GPT training response saved to training_logs/{name}_{stamp}.txt")
 
+    echoes = []
     if "Echoes" in response:
-        echoes = []
         for line in response.splitlines():
             if line.startswith("- "):
                 echoes.append(line.strip("- ").strip())
-        if echoes:
-            entities[name]["memory"] = echoes + entities[name]["memory"]
-            entities[name]["drift"] = round(max(0.0, entities[name]["drift"] - 0.05), 3)
-            print(f"[📈] Entity memory reinforced with {len(echoes)} new entries.")
+    if not echoes:
+        return
 
-    save_entities(entities)
+    # The GPT call can take a while: apply the echoes to the entity as it is now.
+    with storage.locked():
+        entity = storage.get(name)
+        if entity is None:
+            print(f"[❌] Entity '{name}' was removed during training.")
+            return
+        entity["memory"] = echoes + entity["memory"]
+        entity["drift"] = round(max(0.0, entity["drift"] - 0.05), 3)
+        storage.upsert([(name, entity)])
+    print(f"[📈] Entity memory reinforced with {len(echoes)} new entries.")
 
 if __name__ == "__main__":
     name = input("Enter entity name to train with GPT: ").strip()
@@ -99,20 +99,23 @@ class Inventory:
 
 # === UTILITY FUNCTION FOR RANDOM ITEM GENERATION ===
 
-def generate_item(source="system", rarity=None, name=None):
+def generate_item(source="system", rarity=None, name=None, rng=None):
+    """rng: a random.Random-like stream; with one, the item id is drawn from it too."""
     item = {
-        "id": str(uuid.uuid4())[:8],
-        "name": name or random.choice(ITEM_TEMPLATES)["name"],
-        "rarity": rarity or random.choice(["common", "uncommon", "rare"]),
+        "id": f"{rng.getrandbits(32):08x}" if rng is not None else str(uuid.uuid4())[:8],
+        "name": name or (rng or random).choice(ITEM_TEMPLATES)["name"],
+        "rarity": rarity or (rng or random).choice(["common", "uncommon", "rare"]),
         "source": source,
         "timestamp": uuid.uuid1().time
     }
     return item
 
 def add_item_to_inventory(entity, item):
-    """Adds item to Entity object or dict's inventory."""
+    """Adds item to Entity object or dict's inventory; an Entity is marked dirty for the next save."""
     if hasattr(entity, 'inventory') and hasattr(entity.inventory, 'add_item'):
         entity.inventory.add_item(item)
+        if hasattr(entity, 'touch'):
+            entity.touch()
     elif isinstance(entity, dict):
         entity.setdefault("inventory", []).append(item)
     else:
@@ -1,44 +1,312 @@
 # memory_crystal.py
 
-import hashlib
+import math
+import time
+from array import array
+from collections.abc import Mapping
 from datetime import datetime
 
+from memory.motif_vocabulary import VOCABULARY, add_id, discard_id, has_id, id_set
+from utils.packing import decode_deltas, decode_varints, encode_deltas, encode_varints, from_b64, to_b64
+
+MAX_LAYERS = 8  # a merged crystal over more parent tables than this is flattened
+
+
+class FragmentTable:
+    """
+    A crystal's own fragments in embed order: motif ids (see
+    memory.motif_vocabulary) and added times packed as POSIX seconds.
+    """
+
+    __slots__ = ("ids", "times")
+
+    def __init__(self, ids=None, times=None):
+        self.ids = ids if ids is not None else array("q")
+        self.times = times if times is not None else array("d")
+
+    def __len__(self):
+        return len(self.ids)
+
+    def append(self, motif_id: int, added: float):
+        self.ids.append(motif_id)
+        self.times.append(added)
+
+    def remove(self, motif_id: int):
+        i = self.ids.index(motif_id)
+        del self.ids[i]
+        del self.times[i]
+
+    def copy(self) -> "FragmentTable":
+        return FragmentTable(array("q", self.ids), array("d", self.times))
+
+
+def added_micros(added: float) -> int:
+    """
+    An added time as the whole microseconds fragment() shows for it:
+    datetime.fromtimestamp rounds the fraction half-even on its own, which
+    round(added * 1_000_000) misses by one in about one case in seven.
+    """
+    fraction, whole = math.modf(added)
+    return int(whole) * 1_000_000 + round(fraction * 1_000_000)
+
+
+def fragment(motif_id: int, added: float) -> dict:
+    return {"text": VOCABULARY.texts[motif_id], "added_time": datetime.fromtimestamp(added).isoformat()}
+
+
+class FragmentView(Mapping):
+    """
+    A crystal's fragments as the hash -> {text, added_time} mapping they
+    used to be stored as, built on demand from its fragment tables. With
+    several tables (a merged crystal) earlier tables win on a shared motif.
+    """
+
+    __slots__ = ("tables", "ids")
+
+    def __init__(self, tables: tuple, ids: array):
+        self.tables = tables
+        self.ids = ids  # the fragments' motif ids as a sorted id set
+
+    def entries(self):
+        """(motif id, added time) per fragment, in order."""
+        if len(self.tables) == 1:
+            yield from zip(self.tables[0].ids, self.tables[0].times)
+            return
+        seen = set()
+        for table in self.tables:
+            for motif_id, added in zip(table.ids, table.times):
+                if motif_id not in seen:
+                    seen.add(motif_id)
+                    yield motif_id, added
+
+    def __getitem__(self, h):
+        motif_id = VOCABULARY.id_of_hash(h)
+        if motif_id >= 0 and has_id(self.ids, motif_id):
+            for table in self.tables:
+                if motif_id in table.ids:
+                    return fragment(motif_id, table.times[table.ids.index(motif_id)])
+        raise KeyError(h)
+
+    def __contains__(self, h):
+        motif_id = VOCABULARY.id_of_hash(h)
+        return motif_id >= 0 and has_id(self.ids, motif_id)
+
+    def __iter__(self):
+        digests = VOCABULARY.digests
+        return (digests[motif_id] for motif_id, _ in self.entries())
+
+    def __len__(self):
+        return len(self.ids)  # hashes and motif texts are 1:1
+
+    def values(self) -> list:
+        return [fragment(motif_id, added) for motif_id, added in self.entries()]
+
+    def items(self) -> list:
+        digests = VOCABULARY.digests
+        return [(digests[motif_id], fragment(motif_id, added)) for motif_id, added in self.entries()]
+
+
 class MemoryCrystal:
+    """
+    Motif memory. Fragment text and hashes live once per process in
+    memory.motif_vocabulary; a crystal holds only motif ids, packed added
+    times and sorted id sets, and shows them through the `fragments` mapping.
+    """
+
+    __slots__ = ("_tables", "_shared", "_vault", "rewrite_log", "motif_ids", "_vault_ids", "on_change")
+
     def __init__(self):
-        self.fragments = {}  # key: hash, value: {text, added_time}
-        self.vault = []      # historical motif hashes
+        self._tables = (FragmentTable(),)  # its own table, or a merged crystal's parents' tables
+        self._shared = False  # another crystal also holds _tables[0]: copy before writing
+        self._vault = array("q")  # historical motif ids; None until a merged crystal needs it
         self.rewrite_log = []
+        self.motif_ids = array("q")  # sorted id set of the fragments' motifs
+        self._vault_ids = None  # sorted id set of every motif the vault has held; None while it equals motif_ids
+        self.on_change = None  # called with the crystal whenever its fragments change
+
+    @classmethod
+    def merged(cls, *crystals) -> "MemoryCrystal":
+        """
+        A crystal holding every fragment of the given ones, as if each had
+        been embedded in turn (fragments keep their original added_time).
+        Copy-on-write: it references the parents' fragment tables, and
+        whoever writes first — a parent or the merged crystal — copies.
+        """
+        crystal = cls()
+        tables = []
+        for parent in crystals:
+            parent._shared = True
+            for table in parent._tables:
+                if not any(table is seen for seen in tables):
+                    tables.append(table)
+        crystal.motif_ids = id_set(motif_id for parent in crystals for motif_id in parent.motif_ids)
+        crystal._tables = tuple(tables)
+        crystal._shared = True  # the tables are borrowed
+        crystal._vault = None
+        if len(tables) > MAX_LAYERS:
+            crystal._own()
+        return crystal
+
+    def _own(self):
+        """Give the crystal a private fragment table (and vault) before it is written."""
+        if self._vault is None:
+            self._vault = array("q", (motif_id for motif_id, _ in self.fragments.entries()))
+        if len(self._tables) > 1:
+            table = FragmentTable()
+            for motif_id, added in self.fragments.entries():
+                table.append(motif_id, added)
+            self._tables = (table,)
+        elif self._shared:
+            self._tables = (self._tables[0].copy(),)
+        self._shared = False
+
+    @property
+    def fragments(self) -> FragmentView:
+        return FragmentView(self._tables, self.motif_ids)
+
+    def texts(self) -> list:
+        """Fragment texts in order, without building fragment dicts."""
+        texts = VOCABULARY.texts
+        return [texts[motif_id] for motif_id, _ in self.fragments.entries()]
+
+    @property
+    def vault(self) -> list:
+        """Historical motif hashes."""
+        if self._vault is None:
+            return list(self.fragments)
+        digests = VOCABULARY.digests
+        return [digests[motif_id] for motif_id in self._vault]
+
+    @property
+    def vault_ids(self) -> array:
+        """Sorted id set of every motif the vault has held."""
+        return self.motif_ids if self._vault_ids is None else self._vault_ids
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change(self)
 
     def hash_motif(self, text: str) -> str:
-        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+        """The key this process gives a motif text (see MOTIF_HASHER)."""
+        return VOCABULARY.digests[VOCABULARY.intern(text)]
 
     def embed(self, motif_text: str) -> str:
-        h = self.hash_motif(motif_text)
-        if h not in self.fragments:
-            self.fragments[h] = {
-                "text": motif_text,
-                "added_time": datetime.now().isoformat()
-            }
-            self.vault.append(h)
-        return h
+        motif_id = VOCABULARY.intern(motif_text)
+        if not has_id(self.motif_ids, motif_id):
+            self._own()
+            self._tables[0].append(motif_id, time.time())
+            self._vault.append(motif_id)
+            add_id(self.motif_ids, motif_id)
+            if self._vault_ids is not None:
+                add_id(self._vault_ids, motif_id)
+            self._changed()
+        return VOCABULARY.digests[motif_id]
+
+    def embed_many(self, motif_texts) -> list:
+        """
+        embed() for a batch: duplicates (within it or already held) are
+        dropped in one pass, and the new fragments share one timestamp,
+        one copy-on-write check and one change event.
+        """
+        intern = VOCABULARY.intern
+        ids = [intern(text) for text in motif_texts]
+        held = self.motif_ids
+        seen = set()
+        new = []
+        for motif_id in ids:
+            if motif_id not in seen:
+                seen.add(motif_id)
+                if not has_id(held, motif_id):
+                    new.append(motif_id)
+        if new:
+            self._own()
+            table = self._tables[0]
+            table.ids.extend(new)
+            table.times.extend([time.time()] * len(new))
+            self._vault.extend(new)
+            self.motif_ids = id_set(held.tolist() + new)
+            if self._vault_ids is not None:
+                self._vault_ids = id_set(self._vault_ids.tolist() + new)
+            self._changed()
+        digests = VOCABULARY.digests
+        return [digests[motif_id] for motif_id in ids]
 
     def retrieve(self, h: str) -> str:
-        return self.fragments.get(h, {}).get("text", "")
+        motif_id = VOCABULARY.id_of_hash(h)
+        if motif_id >= 0 and has_id(self.motif_ids, motif_id):
+            return VOCABULARY.texts[motif_id]
+        return ""
 
     def rewrite_fragment(self, old_hash: str, new_text: str):
         if old_hash in self.fragments:
+            self._own()
+            old_id = VOCABULARY.id_of_hash(old_hash)
             self.rewrite_log.append({
                 "old_hash": old_hash,
-                "old_text": self.fragments[old_hash]["text"],
+                "old_text": VOCABULARY.texts[old_id],
                 "new_text": new_text,
                 "timestamp": datetime.now().isoformat()
             })
-            del self.fragments[old_hash]
+            if self._vault_ids is None:
+                self._vault_ids = array("q", self.motif_ids)  # the vault keeps the old motif
+            discard_id(self.motif_ids, old_id)
+            self._tables[0].remove(old_id)
+            self._changed()
         return self.embed(new_text)
 
+    # === Persistence ===
+    def to_dict(self) -> dict:
+        """
+        Compact form: the crystal's motif texts once each (fragments first,
+        then motifs only the vault remembers), added times as varint
+        microsecond deltas and the vault as varint positions in that list.
+        Motif ids are per process, so they are never written.
+        """
+        entries = list(self.fragments.entries())
+        vault = self._vault if self._vault is not None else [motif_id for motif_id, _ in entries]
+        position = {motif_id: i for i, (motif_id, _) in enumerate(entries)}
+        for motif_id in vault:
+            position.setdefault(motif_id, len(position))
+        texts = VOCABULARY.texts
+        return {
+            "motifs": [texts[motif_id] for motif_id in position],
+            "fragments": len(entries),
+            "added": to_b64(encode_deltas(added_micros(added) for _, added in entries)),
+            "vault": to_b64(encode_varints(position[motif_id] for motif_id in vault)),
+            "rewrite_log": list(self.rewrite_log),
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "MemoryCrystal":
+        crystal = MemoryCrystal()
+        ids = [VOCABULARY.intern(text) for text in data.get("motifs", [])]
+        count = data.get("fragments", 0)
+        added = [micros / 1_000_000 for micros in decode_deltas(from_b64(data.get("added", "")))]
+        crystal._tables = (FragmentTable(array("q", ids[:count]), array("d", added)),)
+        crystal._vault = array("q", (ids[i] for i in decode_varints(from_b64(data.get("vault", "")))))
+        crystal.motif_ids = id_set(ids[:count])
+        vault_ids = id_set(crystal._vault)
+        if vault_ids != crystal.motif_ids:
+            crystal._vault_ids = vault_ids
+        crystal.rewrite_log = list(data.get("rewrite_log", []))
+        return crystal
+
+    # === Vault history ===
+    @property
+    def generation(self) -> int:
+        """
+        Bumped by every vault change. The vault only ever grows, so this is
+        its length and vault[generation:] is the journal of later changes.
+        """
+        return len(self._vault) if self._vault is not None else len(self.motif_ids)
+
+    def in_vault(self, h: str) -> bool:
+        motif_id = VOCABULARY.id_of_hash(h)
+        return motif_id >= 0 and has_id(self.vault_ids, motif_id)
+
     def compare_drift(self, snapshot: list) -> float:
         """Compare current vault vs. a snapshot of hashes."""
         if not snapshot:
             return 0.0
-        differences = sum(1 for h in snapshot if h not in self.vault)
+        differences = sum(1 for h in snapshot if not self.in_vault(h))
         return differences / len(snapshot)
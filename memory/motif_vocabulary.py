@@ -0,0 +1,126 @@
+# motif_vocabulary.py
+
+import hashlib
+from array import array
+from bisect import bisect_left
+
+from config.settings import MOTIF_HASHER
+
+MASK64 = (1 << 64) - 1
+
+
+def sha256_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def blake2b_key(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def fast_key(text: str) -> str:
+    """Python's own string hash: several times cheaper, but salted per process."""
+    return format(hash(text) & MASK64, "016x")
+
+
+HASHERS = {"sha256": sha256_key, "blake2b": blake2b_key, "fast": fast_key}
+
+
+class MotifVocabulary:
+    """
+    Process-wide motif table: every distinct motif text is stored once,
+    with its key (see HASHERS), under a small integer id. Crystals keep only ids,
+    and a crystal's motif set is a sorted array('q') of them (see id_set), so
+    it costs 8 bytes per motif it holds whatever the size of the vocabulary.
+    Ids are handed out first come, first served and never reused; they are
+    local to the process, so ids must not cross process boundaries.
+    """
+
+    def __init__(self, hasher: str = MOTIF_HASHER):
+        self.hasher = HASHERS[hasher]
+        self.texts = []    # id -> motif text
+        self.digests = []  # id -> hex key of the text
+        self.ids = {}      # motif text -> id
+        self.hashes = {}   # hex key -> id
+
+    def __len__(self):
+        return len(self.texts)
+
+    def intern(self, text: str) -> int:
+        """Id of a motif text; only texts new to the process get hashed."""
+        motif_id = self.ids.get(text)
+        if motif_id is None:
+            motif_id = len(self.texts)
+            h = self.hasher(text)
+            if h in self.hashes:  # a 64-bit key collided with another text's
+                h = sha256_key(text)
+            self.texts.append(text)
+            self.digests.append(h)
+            self.ids[text] = motif_id
+            self.hashes[h] = motif_id
+        return motif_id
+
+    def id_of_hash(self, h: str) -> int:
+        """Id of the motif with this key, or -1 if no crystal ever held it."""
+        return self.hashes.get(h, -1)
+
+    def ids_of(self, texts) -> array:
+        """The texts' motif ids as a sorted id set."""
+        return id_set(self.intern(text) for text in texts)
+
+    def texts_of(self, ids) -> set:
+        return {self.texts[motif_id] for motif_id in ids}
+
+
+VOCABULARY = MotifVocabulary()
+
+
+def id_set(ids) -> array:
+    """Distinct motif ids as a sorted array('q'): a crystal's motif set."""
+    return array("q", sorted(set(ids)))
+
+
+def has_id(ids: array, motif_id: int) -> bool:
+    """Membership in a sorted id set, by bisection."""
+    i = bisect_left(ids, motif_id)
+    return i < len(ids) and ids[i] == motif_id
+
+
+def add_id(ids: array, motif_id: int) -> bool:
+    """Insert into a sorted id set in place; False if it was already there."""
+    i = bisect_left(ids, motif_id)
+    if i < len(ids) and ids[i] == motif_id:
+        return False
+    ids.insert(i, motif_id)
+    return True
+
+
+def discard_id(ids: array, motif_id: int):
+    i = bisect_left(ids, motif_id)
+    if i < len(ids) and ids[i] == motif_id:
+        del ids[i]
+
+
+def overlap(ids1, ids2) -> int:
+    """
+    |A ∩ B| of two id sets. Code that checks one set against many others
+    should pass frozensets (see frozen_ids): building a set per call costs
+    several times the intersection itself.
+    """
+    if isinstance(ids1, frozenset) and isinstance(ids2, frozenset):
+        return len(ids1 & ids2)
+    if len(ids1) > len(ids2):
+        ids1, ids2 = ids2, ids1
+    return len(set(ids1).intersection(ids2))
+
+
+def frozen_ids(ids) -> frozenset:
+    """An id set as a frozenset, for repeated overlap() checks."""
+    return ids if isinstance(ids, frozenset) else frozenset(ids)
+
+
+def jaccard(ids1, ids2) -> float:
+    """|A ∩ B| / |A ∪ B| of two id sets; 0.0 if either is empty."""
+    if not ids1 or not ids2:
+        return 0.0
+    shared = overlap(ids1, ids2)
+    return shared / (len(ids1) + len(ids2) - shared)
@@ -8,6 +8,8 @@ import logging
 import psutil
 from codecarbon import EmissionsTracker
 from typing import Dict, List, Tuple
+from storage.backends import open_storage
+from storage.pipeline import transform_stream
 
 # Constants
 ENTITY_FILE = Path("entities.json.gz")
@@ -31,9 +33,8 @@ def load_entities() -> Dict:
         if not ENTITY_FILE.exists():
             logging.warning(f"[⚠️] {ENTITY_FILE} not found, returning empty dict.")
             return {}
-        with gzip.open(ENTITY_FILE, "rt", encoding="utf-8") as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
+        return open_storage(str(ENTITY_FILE)).load_all()
+    except ValueError as e:
         logging.error(f"[❌] Failed to parse {ENTITY_FILE}: {e}")
         return {}
     except Exception as e:
@@ -43,8 +44,7 @@ def load_entities() -> Dict:
 def save_entities(data: Dict) -> None:
     """Save entities with gzip compression."""
     try:
-        with gzip.open(ENTITY_FILE, "wt", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        open_storage(str(ENTITY_FILE)).replace_all(data.items())
         logging.info(f"[💾] Entities saved to {ENTITY_FILE}")
     except Exception as e:
         logging.error(f"[❌] Error saving entities: {e}")
@@ -121,6 +121,22 @@ def check_resources(max_cpu: float = MAX_CPU_PERCENT) -> bool:
         return False
     return True
 
+def prune_record(name: str, ent: Dict) -> Tuple[Dict, Tuple | None]:
+    """Pipeline transform: the note is (before, after) memory for pruned entities."""
+    memory = ent.get("memory", [])
+    drift = ent.get("drift", 0.0)
+    if not memory or (len(memory) <= MAX_MEMORY_SIZE and drift < DRIFT_THRESHOLD):
+        return ent, None
+
+    pruned, was_pruned = prune_memory(memory)
+    if not was_pruned:
+        return ent, None
+    ent["memory"] = pruned
+    ess_penalty = 0.02 if drift > DRIFT_THRESHOLD else 0.05
+    ent["ess"] = round(max(0.1, ent.get("ess", 1.0) - ess_penalty), 2)
+    ent["drift"] = round(max(0.1, drift - 0.03 if drift > DRIFT_THRESHOLD else drift), 3)
+    return ent, (memory, pruned)
+
 def main():
     """Prune entities with energy tracking and resource monitoring."""
     with EmissionsTracker(project_name="Gnostic_Dawn_Pruning") as tracker:
@@ -128,30 +144,36 @@ def main():
             logging.info("[⏳] Waiting for resources to free up...")
             return
 
-        entities = load_entities()
-        changes = 0
         adjusted = []
 
-        for name, ent in entities.items():
-            memory = ent.get("memory", [])
-            drift = ent.get("drift", 0.0)
-            if not memory or (len(memory) <= MAX_MEMORY_SIZE and drift < DRIFT_THRESHOLD):
-                continue
-
-            original = memory
-            pruned, was_pruned = prune_memory(original)
-
-            if was_pruned:
-                ent["memory"] = pruned
-                ess_penalty = 0.02 if drift > DRIFT_THRESHOLD else 0.05
-                ent["ess"] = round(max(0.1, ent.get("ess", 1.0) - ess_penalty), 2)
-                ent["drift"] = round(max(0.1, drift - 0.03 if drift > DRIFT_THRESHOLD else drift), 3)
-                save_prune_log(name, original, pruned)
-                adjusted.append(name)
-                changes += 1
+        def log_prune(name, note):
+            save_prune_log(name, *note)
+            adjusted.append(name)
+
+        storage = open_storage(str(ENTITY_FILE))
+        try:
+            index = storage.index()
+            if index is not None:
+                with storage.locked():  # read, pruned and written back as one step
+                    # Push the "long memory or high drift" filter down to the mirror's indexes.
+                    entities = dict(index.query(memory_min=MAX_MEMORY_SIZE + 1))
+                    entities.update(index.query(drift_min=DRIFT_THRESHOLD))
+                    for name, ent in entities.items():
+                        ent, note = prune_record(name, ent)
+                        if note is not None:
+                            log_prune(name, note)
+                    if adjusted:
+                        # The file stays primary; its rewrite refreshes the mirror.
+                        storage.upsert((name, entities[name]) for name in adjusted)
+            elif storage.exists():
+                transform_stream(storage, prune_record, sink=log_prune)
+            else:
+                logging.warning(f"[⚠️] {ENTITY_FILE} not found, nothing to prune.")
+        except ValueError as e:
+            logging.error(f"[❌] Failed to parse {ENTITY_FILE}: {e}")
+        changes = len(adjusted)
 
         if changes > 0:
-            save_entities(entities)
             cleanup_old_logs()
             logging.info(f"[✅] Pruned {changes} entities: {', '.join(adjusted)}")
         else:
@@ -6,7 +6,7 @@ from datetime import datetime
 from inventory.inventory_engine import generate_item, add_item_to_inventory
 from config.settings import QUEST_TYPES, QUEST_EXPERIENCE_GAIN, QUEST_FAILURE_DRIFT_PENALTY
 
-def start_quest(entity):
+def start_quest(entity, rng=random):
     """Assign a new quest to the entity based on bias or random type."""
     if "active_quests" not in entity.metadata:
         entity.metadata["active_quests"] = []
@@ -15,8 +15,8 @@ def start_quest(entity):
         logging.info(f"{entity.id} already has max active quests.")
         return
 
-    quest_type = random.choice(QUEST_TYPES)
-    quest_id = f"{quest_type}_{random.randint(1000, 9999)}"
+    quest_type = rng.choice(QUEST_TYPES)
+    quest_id = f"{quest_type}_{rng.randint(1000, 9999)}"
     quest = {
         "id": quest_id,
         "type": quest_type,
@@ -28,23 +28,26 @@ def start_quest(entity):
     entity.metadata["active_quests"].append(quest)
     logging.info(f"🧭 {entity.id} accepted quest: {quest_type} (ID: {quest_id})")
 
-def progress_quest(entity):
-    """Progress the first incomplete quest and grant rewards or penalties."""
+def progress_quest(entity, rng=random):
+    """
+    Progress the first incomplete quest and grant rewards or penalties.
+    rng: any random.Random-like stream (e.g. a per-entity CounterRandom).
+    """
     quests = entity.metadata.get("active_quests", [])
     incomplete = [q for q in quests if not q.get("complete")]
 
     if not incomplete:
-        start_quest(entity)
+        start_quest(entity, rng)
         return
 
     quest = incomplete[0]
-    increment = round(random.uniform(0.1, 0.35), 2)
+    increment = round(rng.uniform(0.1, 0.35), 2)
     quest["progress"] += increment
 
     if quest["progress"] >= 1.0:
         quest["complete"] = True
         quest["completed_at"] = datetime.now().isoformat()
-        reward = generate_item(source="quest", rarity="uncommon")
+        reward = generate_item(source="quest", rarity="uncommon", rng=rng)
         add_item_to_inventory(entity, reward)
         entity.metadata.setdefault("experience", 0)
         entity.metadata["experience"] += QUEST_EXPERIENCE_GAIN
@@ -53,7 +56,7 @@ def progress_quest(entity):
         logging.info(f"🎁 Rewarded with {reward['name']}, +{QUEST_EXPERIENCE_GAIN} XP")
 
     else:
-        if random.random() < 0.1:  # Simulate symbolic disruption
+        if rng.random() < 0.1:  # Simulate symbolic disruption
             drift_penalty = QUEST_FAILURE_DRIFT_PENALTY
             entity.set_drift(entity.drift_level + drift_penalty)
             logging.warning(f"⚠️ {entity.id} destabilized during quest '{quest['type']}' → Drift +{drift_penalty:.2f}")
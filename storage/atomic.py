@@ -0,0 +1,223 @@
+# atomic.py
+
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+GROUP_COMMIT_WINDOW = 0.003  # seconds a commit leader waits for more writes to join
+
+
+def fsync_directory(directory: str):
+    """Make a rename durable; not every platform lets us open a directory."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_file(path: str, mode: str = "w", fsync: bool = True, **open_kwargs):
+    """
+    Open a temp file beside `path`; on a clean exit it is flushed, fsynced and
+    renamed over `path`, so readers only ever see the old or the new file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, mode, **open_kwargs) as f:
+            yield f
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if fsync:
+        fsync_directory(directory)
+
+
+class FileLock:
+    """
+    Advisory fcntl lock on `<path>.lock`, reentrant within a process.
+    Threads of one process are serialized by an RLock; other processes by flock.
+    A nested acquisition keeps the outer mode, so take the exclusive lock first.
+    """
+
+    def __init__(self, path: str):
+        self.path = path if path.endswith(".lock") else path + ".lock"
+        self._thread_lock = threading.RLock()
+        self._fd = None
+        self._depth = 0
+        self._shared = False
+
+    def acquire(self, shared: bool = False, blocking: bool = True) -> bool:
+        if not self._thread_lock.acquire(blocking):
+            return False
+        if self._depth:
+            if self._shared and not shared:
+                self._thread_lock.release()
+                raise RuntimeError(f"Cannot upgrade shared lock on {self.path}")
+            self._depth += 1
+            return True
+        if fcntl is not None:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            flags = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+            try:
+                fcntl.flock(fd, flags if blocking else flags | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                self._thread_lock.release()
+                return False
+            self._fd = fd
+        self._depth = 1
+        self._shared = shared
+        return True
+
+    def release(self):
+        self._depth -= 1
+        if not self._depth and self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+    @contextmanager
+    def held(self, shared: bool = False):
+        self.acquire(shared=shared)
+        try:
+            yield self
+        finally:
+            self.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+_path_locks = {}
+_path_locks_guard = threading.Lock()
+
+
+def lock_for(path: str) -> FileLock:
+    """One FileLock per path per process, so threads share its reentrancy."""
+    key = os.path.abspath(path)
+    with _path_locks_guard:
+        lock = _path_locks.get(key)
+        if lock is None:
+            lock = _path_locks[key] = FileLock(key)
+        return lock
+
+
+class GroupCommit:
+    """
+    Coalesce writes that arrive within a few milliseconds into one commit.
+    The first submitter becomes the leader: it waits `window` seconds for
+    others to join, then runs commit(batch) once for everyone. Batches are
+    dicts, so a later write to the same key replaces an earlier one.
+    submit() returns only after the batch holding its items is committed,
+    and re-raises the commit's error in every submitter.
+    """
+
+    IDLE, COLLECTING, COMMITTING = range(3)
+
+    def __init__(self, commit, window: float = GROUP_COMMIT_WINDOW):
+        self._commit = commit
+        self.window = window
+        self._cond = threading.Condition()
+        self._state = self.IDLE
+        self._pending = {}
+        self._generation = 0
+        self._error = None
+        self.commits = 0
+        self.submitted = 0
+
+    def submit(self, items: dict):
+        with self._cond:
+            while self._state == self.COMMITTING:
+                self._cond.wait()
+            self._pending.update(items)
+            self.submitted += 1
+            if self._state == self.COLLECTING:
+                generation = self._generation
+                while self._generation == generation:
+                    self._cond.wait()
+                if self._error is not None:
+                    raise self._error
+                return
+            self._state = self.COLLECTING
+
+        if self.window:
+            time.sleep(self.window)
+        with self._cond:
+            batch, self._pending = self._pending, {}
+            self._state = self.COMMITTING
+        error = None
+        try:
+            self._commit(batch)
+        except BaseException as ex:
+            error = ex
+        with self._cond:
+            self._error = error
+            self._generation += 1
+            self.commits += 1
+            self._state = self.IDLE
+            self._cond.notify_all()
+        if error is not None:
+            raise error
+
+
+def _write_json_files(batch: dict):
+    for path, (data, indent) in batch.items():
+        with lock_for(path), atomic_file(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent)
+
+
+_json_commits = GroupCommit(_write_json_files)
+
+
+def write_json(path: str, data, indent: int = 2):
+    """
+    Atomically replace a JSON document under its advisory lock.
+    Concurrent saves are group-committed; the last save of a path wins.
+    """
+    _json_commits.submit({os.fspath(path): (data, indent)})
+
+
+@contextmanager
+def updating_json(path: str, indent: int = 2):
+    """
+    Read → modify → replace a JSON document under its advisory lock, so
+    concurrent updaters can't lose each other's changes. Yields the parsed
+    document (None if there is none); on a clean exit an existing document
+    is written straight back, bypassing write_json's group commit (whose
+    leader may be another thread, waiting for the lock held here).
+    """
+    with lock_for(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = None
+        yield data
+        if data is not None:
+            with atomic_file(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=indent)
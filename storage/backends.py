@@ -0,0 +1,287 @@
+# backends.py
+
+import gzip
+import json
+import os
+import tempfile
+
+from storage.atomic import fsync_directory, lock_for
+from storage.json_stream import iter_json_object, JsonObjectWriter
+from utils import sqlite_repository
+
+UPSERT_BATCH = 1000
+
+
+class EntityBackend:
+    """
+    Common interface over every entity persistence format.
+    Records are plain dicts keyed by name (batch files) or id (dashboard log);
+    iter_records() streams them so callers never need the whole population.
+    """
+
+    location = None
+
+    def exists(self) -> bool:
+        return os.path.exists(self.location)
+
+    def iter_records(self):
+        """Yield (key, record) pairs."""
+        raise NotImplementedError
+
+    def get(self, key: str) -> dict | None:
+        for k, record in self.iter_records():
+            if k == key:
+                return record
+        return None
+
+    def load_all(self) -> dict:
+        return dict(self.iter_records())
+
+    def replace_all(self, records) -> int:
+        """Make the stored population exactly `records` (an iterable of pairs)."""
+        raise NotImplementedError
+
+    def upsert(self, records) -> int:
+        """Insert or overwrite some records, leaving the rest untouched."""
+        updates = dict(records)
+        merged = ((k, updates.pop(k, r)) for k, r in self.iter_records())
+        return self.replace_all(_chain_remaining(merged, updates))
+
+    def delete(self, *keys) -> int:
+        doomed = set(keys)
+        return self.replace_all((k, r) for k, r in self.iter_records() if k not in doomed)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.location!r})"
+
+
+def _chain_remaining(pairs, remaining: dict):
+    yield from pairs
+    yield from remaining.items()
+
+
+class JsonFileBackend(EntityBackend):
+    """
+    Name-keyed entities.json, streamed member by member. When the SQLite
+    entity index is enabled, the file is mirrored into it (see index()).
+    """
+
+    def __init__(self, location: str):
+        self.location = location
+
+    def locked(self):
+        """
+        The file's advisory lock (reentrant within a thread). Hold it across a
+        whole read → modify → replace_all() so no other writer lands in between.
+        """
+        return lock_for(self.location)
+
+    def index(self):
+        """
+        The file's SQLite mirror for indexed queries, or None without SQLite.
+        The mirror is rebuilt first if the file was written without it.
+        """
+        if not sqlite_repository.sqlite_enabled() or not self.exists():
+            return None
+        mirror = self._mirror()
+        if mirror.stamp() != sqlite_repository.file_stamp(self.location):
+            self.refresh_index()
+        return mirror
+
+    def _mirror(self, db: str = None):
+        return sqlite_repository.SQLiteEntityRepository(db or sqlite_repository.ENTITY_DB,
+                                                        source=os.path.abspath(self.location))
+
+    def refresh_index(self, db: str = None):
+        """Rebuild the file's SQLite mirror from the file itself."""
+        mirror = self._mirror(db)
+        with self.locked():
+            mirror.replace_all(self.iter_records(), stamp=sqlite_repository.file_stamp(self.location))
+        return mirror
+
+    def _open_read(self):
+        return open(self.location, "r", encoding="utf-8")
+
+    def _open_write(self, path):
+        return open(path, "w", encoding="utf-8")
+
+    def iter_records(self):
+        if not self.exists():
+            return
+        with self._open_read() as f:
+            yield from iter_json_object(f)
+
+    def upsert(self, records) -> int:
+        with self.locked():
+            return super().upsert(records)
+
+    def delete(self, *keys) -> int:
+        with self.locked():
+            return super().delete(*keys)
+
+    def replace_all(self, records, keep_if=None) -> int:
+        """
+        The new file is built beside the old one so iter_records() can still feed it.
+        keep_if, checked once the records are exhausted, can veto the rename.
+        The lock is taken before `records` is first read, so a generator over
+        this file sees the version that is being replaced.
+        """
+        directory = os.path.dirname(os.path.abspath(self.location))
+        with self.locked():
+            fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(self.location)}.", suffix=".tmp", dir=directory)
+            os.close(fd)
+            try:
+                with self._open_write(tmp_path) as f:
+                    writer = JsonObjectWriter(f)
+                    for key, record in records:
+                        writer.write(key, record)
+                    writer.close()
+                if keep_if is not None and not keep_if():
+                    os.remove(tmp_path)
+                    return 0
+                with open(tmp_path, "rb") as f:
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.location)
+                fsync_directory(directory)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            if sqlite_repository.sqlite_enabled():
+                self.refresh_index()
+        return writer.count
+
+
+class GzipJsonBackend(JsonFileBackend):
+    """Gzip-compressed entities.json.gz used by the memory pruner."""
+
+    def _open_read(self):
+        return gzip.open(self.location, "rt", encoding="utf-8")
+
+    def _open_write(self, path):
+        return gzip.open(path, "wt", encoding="utf-8")
+
+
+class EntityLogBackend(EntityBackend):
+    """The dashboard's entity_data/ segment log, keyed by entity id."""
+
+    def __init__(self, location: str = None):
+        from utils import entity_loader
+        self._loader = entity_loader
+        self.location = location or entity_loader.ENTITY_DIR
+
+    @property
+    def segments(self):
+        if os.path.abspath(self.location) == os.path.abspath(self._loader.ENTITY_DIR):
+            return self._loader.get_segment_store()
+        from utils.segment_store import SegmentStore
+        if not hasattr(self, "_segments"):
+            self._segments = SegmentStore(self.location)
+        return self._segments
+
+    def iter_records(self):
+        for key, payload in self.segments.items():
+            yield key, json.loads(payload)
+
+    def get(self, key: str) -> dict | None:
+        payload = self.segments.get(key)
+        return json.loads(payload) if payload is not None else None
+
+    def upsert(self, records) -> int:
+        count = 0
+        batch = []
+        for key, record in records:
+            batch.append((key, record.get("name", ""), json.dumps(record, separators=(",", ":")).encode("utf-8")))
+            if len(batch) >= UPSERT_BATCH:
+                count += self._write(batch)
+                batch = []
+        return count + self._write(batch)
+
+    def _write(self, batch) -> int:
+        if batch:
+            self.segments.write_batch(puts=batch)
+            self._loader.mirror_to_sqlite(batch, [])
+        return len(batch)
+
+    def delete(self, *keys) -> int:
+        self.segments.write_batch(deletes=keys)
+        self._loader.mirror_to_sqlite([], keys)
+        return len(keys)
+
+    def replace_all(self, records) -> int:
+        written = set()
+
+        def tracked():
+            for key, record in records:
+                written.add(key)
+                yield key, record
+
+        count = self.upsert(tracked())
+        stale = [k for k in self.segments.keys() if k not in written]
+        if stale:
+            self.delete(*stale)
+        self.segments.compact_in_background()
+        return count
+
+
+class SQLiteBackend(EntityBackend):
+    """The optional SQLite entity index (see utils.sqlite_repository)."""
+
+    def __init__(self, location: str):
+        self.location = location
+        self.repo = sqlite_repository.SQLiteEntityRepository(location)
+
+    def iter_records(self):
+        yield from self.repo.query()
+
+    def query(self, **filters):
+        yield from self.repo.query(**filters)
+
+    def get(self, key: str) -> dict | None:
+        return self.repo.get(key)
+
+    def upsert(self, records) -> int:
+        count = 0
+        batch = []
+        for pair in records:
+            batch.append(pair)
+            if len(batch) >= UPSERT_BATCH:
+                count += self.repo.upsert(batch)
+                batch = []
+        return count + self.repo.upsert(batch)
+
+    def delete(self, *keys) -> int:
+        return self.repo.delete(*keys)
+
+    def replace_all(self, records) -> int:
+        written = set()
+
+        def tracked():
+            for key, record in records:
+                written.add(key)
+                yield key, record
+
+        count = self.upsert(tracked())
+        stale = [k for k in self.repo.query_ids() if k not in written]
+        if stale:
+            self.repo.delete(*stale)
+        return count
+
+
+def open_storage(location: str) -> EntityBackend:
+    """Pick the backend for a location by its shape."""
+    if location.endswith(".json.gz"):
+        return GzipJsonBackend(location)
+    if location.endswith(".json"):
+        return JsonFileBackend(location)
+    if location.endswith((".db", ".sqlite", ".sqlite3")):
+        return SQLiteBackend(location)
+    return EntityLogBackend(location)
+
+
+def copy_records(source: EntityBackend, dest: EntityBackend, transform=None) -> int:
+    """Stream every record from one backend into another, optionally reshaping (key, record)."""
+    records = source.iter_records()
+    if transform:
+        records = (transform(key, record) for key, record in records)
+    return dest.upsert(records)
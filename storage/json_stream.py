@@ -0,0 +1,92 @@
+# json_stream.py
+
+import json
+
+CHUNK_SIZE = 1 << 16
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+def iter_json_object(f, chunk_size: int = CHUNK_SIZE):
+    """
+    Yield (key, value) pairs of a top-level JSON object read from text stream f,
+    holding roughly one value in memory at a time instead of the whole document.
+    """
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill():
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    def skip_ws():
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            fill()
+
+    def expect(char):
+        nonlocal pos
+        skip_ws()
+        if pos >= len(buf) or buf[pos] != char:
+            found = buf[pos] if pos < len(buf) else "end of file"
+            raise ValueError(f"Expected '{char}' in JSON object stream, found {found!r}")
+        pos += 1
+
+    def decode():
+        nonlocal pos
+        while True:
+            skip_ws()
+            try:
+                value, end = _decoder.raw_decode(buf, pos)
+                # A value touching the end of the buffer may be cut short (e.g. a number).
+                if end < len(buf) or eof:
+                    pos = end
+                    return value
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            fill()
+
+    fill()
+    expect("{")
+    skip_ws()
+    if pos < len(buf) and buf[pos] == "}":
+        return
+    while True:
+        key = decode()
+        expect(":")
+        yield key, decode()
+        skip_ws()
+        if pos < len(buf) and buf[pos] == ",":
+            pos += 1
+            continue
+        expect("}")
+        return
+
+
+class JsonObjectWriter:
+    """Write a top-level JSON object one member at a time."""
+
+    def __init__(self, f):
+        self.f = f
+        self.count = 0
+        f.write("{")
+
+    def write(self, key: str, value):
+        self.f.write(",\n" if self.count else "\n")
+        self.f.write(json.dumps(key))
+        self.f.write(": ")
+        self.f.write(json.dumps(value, separators=(",", ":")))
+        self.count += 1
+
+    def close(self):
+        self.f.write("\n}\n" if self.count else "}\n")
@@ -0,0 +1,111 @@
+# pipeline.py
+
+import os
+import time
+from itertools import islice
+from multiprocessing import Pool
+
+from storage.backends import EntityBackend, JsonFileBackend, open_storage
+
+CHUNK_SIZE = 500
+PIPELINE_WORKERS = int(os.getenv("AGIBUDDY_PIPELINE_WORKERS", "1"))
+
+
+class PipelineStats:
+    def __init__(self):
+        self.read = 0
+        self.changed = 0
+        self.written = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def __repr__(self):
+        return (f"PipelineStats(read={self.read}, changed={self.changed}, "
+                f"written={self.written}, elapsed={self.elapsed:.2f}s)")
+
+
+def iter_chunks(records, size: int):
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def apply_chunk(transform, chunk):
+    """Run transform over one chunk: [(key, record)] → [(key, record, note)]."""
+    out = []
+    for key, record in chunk:
+        record, note = transform(key, record)
+        out.append((key, record, note))
+    return out
+
+
+def _ordered_map(pool, transform, chunks, window: int):
+    """pool.imap with at most `window` chunks in flight, so memory stays bounded."""
+    pending = []
+    for chunk in chunks:
+        pending.append(pool.apply_async(apply_chunk, (transform, chunk)))
+        if len(pending) >= window:
+            yield pending.pop(0).get()
+    for result in pending:
+        yield result.get()
+
+
+def transform_stream(source, transform, dest=None, sink=None, chunk_size: int = CHUNK_SIZE,
+                     workers: int = PIPELINE_WORKERS) -> PipelineStats:
+    """
+    Streaming read → transform → write over any entity backend with bounded memory.
+
+    transform(key, record) returns (record, note); a note of None means the
+    record is unchanged, anything else marks it changed and is handed to
+    sink(key, note) in the parent process, in input order.
+
+    File destinations are rewritten into a temp file and renamed into place at
+    the end (skipped when an in-place run changed nothing). Log and SQLite
+    destinations updated in place only receive the changed records.
+    With workers > 1, chunks are transformed in a process pool; transform
+    must then be a picklable module-level function.
+    """
+    source = open_storage(source) if not isinstance(source, EntityBackend) else source
+    if dest is None:
+        dest = source
+    elif not isinstance(dest, EntityBackend):
+        dest = open_storage(dest)
+    in_place = dest is source
+    stats = PipelineStats()
+
+    chunks = iter_chunks(source.iter_records(), chunk_size)
+    pool = Pool(workers) if workers > 1 else None
+    try:
+        if pool:
+            results = _ordered_map(pool, transform, chunks, window=workers * 2)
+        else:
+            results = (apply_chunk(transform, chunk) for chunk in chunks)
+
+        def accounted():
+            for chunk in results:
+                for key, record, note in chunk:
+                    stats.read += 1
+                    if note is not None:
+                        stats.changed += 1
+                        if sink:
+                            sink(key, note)
+                    yield key, record, note
+
+        if isinstance(dest, JsonFileBackend):
+            stats.written = dest.replace_all(
+                ((key, record) for key, record, _ in accounted()),
+                keep_if=(lambda: stats.changed > 0) if in_place else None)
+        elif in_place:
+            stats.written = dest.upsert((key, record) for key, record, note in accounted() if note is not None)
+        else:
+            stats.written = dest.upsert((key, record) for key, record, _ in accounted())
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    stats.elapsed = time.perf_counter() - stats.started
+    return stats
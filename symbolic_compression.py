@@ -4,6 +4,9 @@ import os
 import re
 from collections import Counter
 from datetime import datetime
+from functools import partial
+from storage.backends import open_storage
+from storage.pipeline import transform_stream
 
 ENTITY_FILE = "entities.json"
 SIGIL_FILE = "sigils.json"
@@ -12,12 +15,10 @@ NGRAM_RANGE = (3, 6)
 MIN_OCCURRENCE = 8
 
 def load_entities():
-    with open(ENTITY_FILE, "r") as f:
-        return json.load(f)
+    return open_storage(ENTITY_FILE).load_all()
 
 def save_entities(data):
-    with open(ENTITY_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+    open_storage(ENTITY_FILE).replace_all(data.items())
 
 def save_sigils(sigils):
     with open(SIGIL_FILE, "w") as f:
@@ -31,8 +32,11 @@ def extract_ngrams(text, n):
     return [" ".join(words[i:i+n]) for i in range(len(words)-n+1)]
 
 def collect_ngrams(entities):
+    """entities: a {name: record} dict or any iterable of records."""
+    if isinstance(entities, dict):
+        entities = entities.values()
     freq = Counter()
-    for ent in entities.values():
+    for ent in entities:
         for line in ent.get("memory", []):
             for n in range(*NGRAM_RANGE):
                 for gram in extract_ngrams(line, n):
@@ -52,10 +56,20 @@ def compress_memory(memory, replacements):
         compressed.append(line)
     return compressed
 
+def compress_record(replacements, name, ent):
+    """Pipeline transform for the second pass; bind replacements with partial()."""
+    old_mem = ent.get("memory", [])
+    new_mem = compress_memory(old_mem, replacements)
+    if new_mem == old_mem:
+        return ent, None
+    ent["memory"] = new_mem
+    return ent, len(old_mem)
+
 def main():
     print("🌀 Running symbolic compression...")
-    entities = load_entities()
-    ngram_freq = collect_ngrams(entities)
+    storage = open_storage(ENTITY_FILE)
+    # Pass 1 only counts phrases; pass 2 rewrites memories. Neither holds the population.
+    ngram_freq = collect_ngrams(ent for _, ent in storage.iter_records())
     common_phrases = [phrase for phrase, count in ngram_freq.items() if count >= MIN_OCCURRENCE]
     top_phrases = sorted(common_phrases, key=lambda p: -ngram_freq[p])[:MAX_SIGILS]
 
@@ -69,15 +83,10 @@ def main():
         print(f" - {v}: “{k}”")
 
     changes = 0
-    for name, ent in entities.items():
-        old_mem = ent.get("memory", [])
-        new_mem = compress_memory(old_mem, replacements)
-        if new_mem != old_mem:
-            ent["memory"] = new_mem
-            changes += 1
+    if replacements:
+        changes = transform_stream(storage, partial(compress_record, replacements)).changed
 
     if changes > 0:
-        save_entities(entities)
         save_sigils(replacements)
         print(f"✅ Compressed {changes} entity memories.")
     else:
@@ -0,0 +1,143 @@
+import json
+import multiprocessing
+import threading
+
+import pytest
+
+from storage.atomic import FileLock, GroupCommit, updating_json, write_json
+
+
+def try_lock_in_child(path, shared, result):
+    result.put(FileLock(path).acquire(shared=shared, blocking=False))
+
+
+def lock_from_other_process(path, shared=False) -> bool:
+    ctx = multiprocessing.get_context("fork")
+    result = ctx.Queue()
+    child = ctx.Process(target=try_lock_in_child, args=(path, shared, result))
+    child.start()
+    child.join()
+    return result.get()
+
+
+def test_file_lock_excludes_other_processes(tmp_path):
+    lock = FileLock(str(tmp_path / "data"))
+    with lock:
+        assert not lock_from_other_process(lock.path)
+    assert lock_from_other_process(lock.path)
+
+
+def test_shared_file_locks_coexist_across_processes(tmp_path):
+    lock = FileLock(str(tmp_path / "data"))
+    with lock.held(shared=True):
+        assert lock_from_other_process(lock.path, shared=True)
+        assert not lock_from_other_process(lock.path, shared=False)
+
+
+def test_file_lock_is_reentrant_per_thread_and_excludes_others(tmp_path):
+    lock = FileLock(str(tmp_path / "data"))
+    seen = []
+    with lock:
+        with lock:
+            other = threading.Thread(target=lambda: seen.append(lock.acquire(blocking=False)))
+            other.start()
+            other.join()
+    assert seen == [False]
+    assert lock.acquire(blocking=False)
+    lock.release()
+
+
+def test_shared_file_lock_cannot_be_upgraded(tmp_path):
+    lock = FileLock(str(tmp_path / "data"))
+    with lock.held(shared=True):
+        with pytest.raises(RuntimeError):
+            lock.acquire()
+
+
+def submit_concurrently(group, batches):
+    errors = []
+    started = threading.Barrier(len(batches))
+
+    def run(batch):
+        started.wait()
+        try:
+            group.submit(batch)
+        except Exception as ex:
+            errors.append(ex)
+
+    threads = [threading.Thread(target=run, args=(b,)) for b in batches]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return errors
+
+
+def test_group_commit_coalesces_and_returns_once_committed():
+    committed = {}
+    durable_before_return = []
+
+    def commit(batch):
+        committed.update(batch)
+
+    group = GroupCommit(commit, window=0.05)
+    original_submit = group.submit
+
+    def checked_submit(batch):
+        original_submit(batch)
+        durable_before_return.append(all(committed.get(k) == v for k, v in batch.items()))
+
+    group.submit = checked_submit
+    errors = submit_concurrently(group, [{f"k{i}": i} for i in range(8)])
+    assert not errors
+    assert committed == {f"k{i}": i for i in range(8)}
+    assert group.commits < 8 and group.submitted == 8
+    assert durable_before_return == [True] * 8
+
+
+def test_group_commit_error_reaches_every_submitter():
+    def commit(batch):
+        raise OSError("disk full")
+
+    group = GroupCommit(commit, window=0.05)
+    errors = submit_concurrently(group, [{"a": 1}, {"b": 2}, {"c": 3}])
+    assert len(errors) == 3 and all(isinstance(e, OSError) for e in errors)
+
+
+def test_group_commit_later_write_to_a_key_wins():
+    batches = []
+    group = GroupCommit(batches.append, window=0.05)
+    first = threading.Thread(target=group.submit, args=({"k": "old"},))
+    first.start()
+    while group._state != GroupCommit.COLLECTING:
+        pass
+    group.submit({"k": "new"})
+    first.join()
+    assert batches == [{"k": "new"}]
+
+
+def test_updating_json_loses_no_concurrent_updates(tmp_path):
+    path = str(tmp_path / "village.json")
+    write_json(path, {"population": 0})
+
+    def bump():
+        for _ in range(25):
+            with updating_json(path) as village:
+                village["population"] += 1
+            write_json(str(tmp_path / "other.json"), {})  # group commits run beside the locked updates
+
+    threads = [threading.Thread(target=bump) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=30)
+    assert not any(t.is_alive() for t in threads)
+    with open(path) as f:
+        assert json.load(f)["population"] == 150
+
+
+def test_updating_json_writes_nothing_for_a_missing_file(tmp_path):
+    path = tmp_path / "missing.json"
+    with updating_json(str(path)) as data:
+        assert data is None
+    assert not path.exists()
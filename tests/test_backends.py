@@ -0,0 +1,54 @@
+import multiprocessing
+
+import pytest
+
+from storage.backends import open_storage
+
+WORKERS = 4
+ROUNDS = 15
+
+
+def upsert_own_keys(path, worker):
+    storage = open_storage(path)
+    for i in range(ROUNDS):
+        storage.upsert([(f"w{worker}-{i}", {"drift": i})])
+
+
+def increment_counter(path):
+    storage = open_storage(path)
+    for _ in range(ROUNDS):
+        with storage.locked():
+            count = storage.get("counter")["count"]
+            storage.upsert([("counter", {"count": count + 1})])
+
+
+def run_workers(target, args_for):
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=target, args=args_for(w)) for w in range(WORKERS)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    assert all(w.exitcode == 0 for w in workers)
+
+
+@pytest.mark.parametrize("name", ["entities.json", "entities.json.gz"])
+def test_concurrent_upserts_lose_no_records(tmp_path, name):
+    path = str(tmp_path / name)
+    open_storage(path).replace_all([])
+    run_workers(upsert_own_keys, lambda w: (path, w))
+    assert len(open_storage(path).load_all()) == WORKERS * ROUNDS
+
+
+def test_locked_read_modify_write_loses_no_updates(tmp_path):
+    path = str(tmp_path / "entities.json")
+    open_storage(path).replace_all([("counter", {"count": 0})])
+    run_workers(increment_counter, lambda w: (path,))
+    assert open_storage(path).get("counter") == {"count": WORKERS * ROUNDS}
+
+
+def test_vetoed_replace_keeps_the_file(tmp_path):
+    storage = open_storage(str(tmp_path / "entities.json"))
+    storage.replace_all([("Ash", {"drift": 0.1})])
+    assert storage.replace_all(iter([("Ash", {"drift": 0.9})]), keep_if=lambda: False) == 0
+    assert storage.load_all() == {"Ash": {"drift": 0.1}}
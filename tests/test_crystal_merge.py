@@ -0,0 +1,164 @@
+import itertools
+import random
+
+import pytest
+
+from memory import memory_crystal
+from memory.memory_crystal import MAX_LAYERS, MemoryCrystal
+
+MOTIFS = [f"motif-{i}" for i in range(12)]
+
+
+class Clock:
+    """Stamps 1.0, 2.0, ... so added times can be compared exactly; `last` is the latest one."""
+
+    def __init__(self):
+        self.ticks = itertools.count(1)
+        self.last = None
+
+    def time(self) -> float:
+        self.last = float(next(self.ticks))
+        return self.last
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(memory_crystal, "time", clock)
+    return clock
+
+
+class EagerCrystal:
+    """The model: what a merged crystal must show, built by copying everything up front."""
+
+    def __init__(self, fragments=(), vault=()):
+        self.fragments = list(fragments)  # (text, added) in order
+        self.vault = list(vault)
+
+    @classmethod
+    def merged(cls, *parents):
+        fragments, seen = [], set()
+        for parent in parents:
+            for text, added in parent.fragments:
+                if text not in seen:
+                    seen.add(text)
+                    fragments.append((text, added))
+        return cls(fragments, [text for text, _ in fragments])
+
+    def embed(self, text, added):
+        if text not in dict(self.fragments):
+            self.fragments.append((text, added))
+            self.vault.append(text)
+
+    def rewrite(self, old, new, added):
+        if old in dict(self.fragments):
+            self.fragments = [(t, a) for t, a in self.fragments if t != old]
+        self.embed(new, added)
+
+
+def state(crystal: MemoryCrystal) -> tuple:
+    entries = list(crystal.fragments.entries())
+    texts = crystal.texts()
+    return list(zip(texts, (added for _, added in entries))), [crystal.retrieve(h) for h in crystal.fragments]
+
+
+def vault_texts(crystal: MemoryCrystal) -> list:
+    by_hash = {crystal.hash_motif(m): m for m in MOTIFS}
+    return [by_hash[h] for h in crystal.vault]
+
+
+def assert_matches(crystal: MemoryCrystal, model: EagerCrystal):
+    fragments, retrieved = state(crystal)
+    assert fragments == model.fragments
+    assert retrieved == [text for text, _ in model.fragments]
+    assert len(crystal.fragments) == len(model.fragments)
+    assert vault_texts(crystal) == model.vault
+    for text in MOTIFS:
+        h = crystal.hash_motif(text)
+        assert (h in crystal.fragments) == (text in dict(model.fragments))
+        assert crystal.in_vault(h) == (text in model.vault)
+    assert state(MemoryCrystal.from_dict(crystal.to_dict()))[0] == model.fragments
+
+
+def make(clock, texts):
+    crystal, model = MemoryCrystal(), EagerCrystal()
+    for text in texts:
+        crystal.embed(text)
+        model.embed(text, clock.last)
+    return crystal, model
+
+
+def test_parent_writes_after_a_merge_stay_private(clock):
+    a, model_a = make(clock, ["motif-0", "motif-1"])
+    b, model_b = make(clock, ["motif-2"])
+    merged = MemoryCrystal.merged(a, b)
+    model_merged = EagerCrystal.merged(model_a, model_b)
+    a.embed("motif-3")
+    model_a.embed("motif-3", clock.last)
+    a.rewrite_fragment(a.hash_motif("motif-0"), "motif-4")
+    model_a.rewrite("motif-0", "motif-4", clock.last)
+    assert_matches(a, model_a)
+    assert_matches(b, model_b)
+    assert_matches(merged, model_merged)
+
+
+def test_merged_crystal_writes_leave_parents_alone(clock):
+    a, model_a = make(clock, ["motif-0", "motif-1"])
+    b, model_b = make(clock, ["motif-1", "motif-2"])
+    merged = MemoryCrystal.merged(a, b)
+    model_merged = EagerCrystal.merged(model_a, model_b)
+    merged.embed("motif-5")
+    model_merged.embed("motif-5", clock.last)
+    merged.rewrite_fragment(merged.hash_motif("motif-2"), "motif-6")
+    model_merged.rewrite("motif-2", "motif-6", clock.last)
+    assert_matches(merged, model_merged)
+    assert_matches(a, model_a)
+    assert_matches(b, model_b)
+
+
+def test_duplicate_motifs_keep_the_earliest_parents_fragment(clock):
+    a, model_a = make(clock, ["motif-0", "motif-1"])
+    b, model_b = make(clock, ["motif-1", "motif-2"])
+    merged = MemoryCrystal.merged(b, a)  # b's motif-1 (added later) is the one shown
+    assert merged.fragments[merged.hash_motif("motif-1")]["added_time"] == b.fragments[b.hash_motif("motif-1")]["added_time"]
+    assert len(merged.fragments) == 3
+    assert_matches(merged, EagerCrystal.merged(model_b, model_a))
+
+
+def test_nested_merges_flatten_past_max_layers(clock):
+    crystal, model = make(clock, ["motif-0"])
+    for i in range(MAX_LAYERS + 3):
+        other, other_model = make(clock, [MOTIFS[(i + 1) % len(MOTIFS)], MOTIFS[(i + 5) % len(MOTIFS)]])
+        crystal, model = MemoryCrystal.merged(crystal, other), EagerCrystal.merged(model, other_model)
+        assert len(crystal._tables) <= MAX_LAYERS
+        assert_matches(crystal, model)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_fuzz_against_an_eager_merge(clock, seed):
+    rng = random.Random(seed)
+    pool = [make(clock, rng.sample(MOTIFS, rng.randint(0, 4))) for _ in range(4)]
+    for _ in range(300):
+        i = rng.randrange(len(pool))
+        crystal, model = pool[i]
+        op = rng.random()
+        if op < 0.35:
+            text = rng.choice(MOTIFS)
+            crystal.embed(text)
+            model.embed(text, clock.last)
+        elif op < 0.55 and model.fragments:
+            old, new = rng.choice(model.fragments)[0], rng.choice(MOTIFS)
+            crystal.rewrite_fragment(crystal.hash_motif(old), new)
+            model.rewrite(old, new, clock.last)
+        elif op < 0.6:
+            texts = rng.sample(MOTIFS, rng.randint(1, 4))
+            crystal.embed_many(texts)
+            for text in texts:
+                model.embed(text, clock.last)
+        else:
+            parents = rng.sample(pool, rng.randint(2, 3))
+            pool.append((MemoryCrystal.merged(*(c for c, _ in parents)), EagerCrystal.merged(*(m for _, m in parents))))
+            if len(pool) > 12:
+                pool.pop(rng.randrange(len(pool) - 1))
+        for crystal, model in pool:
+            assert_matches(crystal, model)
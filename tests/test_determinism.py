@@ -0,0 +1,49 @@
+import logging
+
+from core.sharded_simulation import ShardedSimulation
+from core.simulation_loop import SimulationEngine, demo_entity
+
+logging.disable(logging.WARNING)
+
+POPULATION = 300
+TICKS = 3
+SEED = 7
+
+
+def single_digest():
+    engine = SimulationEngine([demo_entity(i) for i in range(POPULATION)], seed=SEED)
+    engine.run(TICKS)
+    return engine.digest()
+
+
+def sharded_digest(workers):
+    with ShardedSimulation(POPULATION, workers, seed=SEED) as sim:
+        sim.run(TICKS)
+        return sim.digest()
+
+
+def test_same_seed_twice_in_one_process():
+    first = single_digest()
+    assert single_digest() == first
+    assert sharded_digest(2) == first
+    assert sharded_digest(2) == first
+
+
+def test_digest_does_not_depend_on_worker_count():
+    digests = {single_digest()} | {sharded_digest(workers) for workers in (1, 3)}
+    assert len(digests) == 1
+
+
+def test_ids_stay_unique_across_ticks():
+    engine = SimulationEngine([demo_entity(i) for i in range(2000)], seed=1)
+    for _ in range(6):
+        engine.tick()
+        ids = [e.id for e in engine.entities]
+        assert len(ids) == len(set(ids))
+    assert engine.events["fusions"] > 0
+    parents = {pid for e in engine.entities for pid in e.metadata.get("fused_from", ())}
+    assert all(e.fused for e in engine.entities if e.id in parents)
+    with ShardedSimulation(2000, 3, seed=1) as sim:
+        sim.run(6)
+        assert sim.digest() == engine.digest()
+        assert sim.events["fusions"] == engine.events["fusions"]
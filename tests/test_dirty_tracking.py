@@ -0,0 +1,57 @@
+import numpy as np
+
+from core.emotion_engine import mutate_population
+from core.dream_state import evolve_population
+from core.entity import Entity
+from quests.quest_engine import progress_quest, start_quest
+from utils.entity_loader import dirty_entities
+
+
+def loaded(count=3):
+    """Entities as a load leaves them: emotion and dream built, nothing to save."""
+    entities = []
+    for i in range(count):
+        e = Entity(name=f"e{i}", memory_snapshot="veil glyph echo")
+        e.emotion, e.dream
+        entities.append(Entity.from_dict(e.to_dict()))
+    assert not any(e.dirty for e in entities)
+    return entities
+
+
+def test_emotion_writes_mark_the_entity_dirty():
+    a, b, c = loaded()
+    a.emotion.set("dopamine", 1.2)
+    b.emotion.levels["cortisol"] = 0.9
+    assert a.dirty and b.dirty and not c.dirty
+
+
+def test_bulk_emotion_and_dream_ticks_mark_dirty():
+    entities = loaded()
+    mutate_population(entities[:1], np.random.default_rng(0))
+    evolve_population(entities[1:2])
+    by_id = {e.id: e for e in entities}
+    assert [e.id for e in dirty_entities(by_id)] == [e.id for e in entities[:2]]
+
+
+def test_bank_relax_and_fast_forward_mark_dirty():
+    a, b = loaded(2)
+    a.emotion._bank.relax(np.array([a.emotion._row]), 5)
+    b.dream._bank.fast_forward(np.array([b.dream._row]), 7)
+    assert a.dirty and b.dirty
+
+
+def test_mark_clean_clears_bank_rows():
+    (e,) = loaded(1)
+    e.dream.enter("drift")
+    e.mark_clean()
+    assert not e.dirty
+
+
+def test_quest_reward_marks_the_entity_dirty():
+    e, = loaded(1)
+    start_quest(e)
+    e.metadata["active_quests"][0]["progress"] = 0.99
+    e.mark_clean()
+    progress_quest(e)
+    assert e.list_inventory()
+    assert [x.id for x in dirty_entities({e.id: e})] == [e.id]
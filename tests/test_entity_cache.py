@@ -0,0 +1,24 @@
+import json
+
+from core.entity import Entity
+from utils.entity_cache import EntityCache
+from utils.segment_store import SegmentStore
+
+
+def record(e: Entity) -> bytes:
+    return json.dumps(e.to_dict()).encode("utf-8")
+
+
+def test_names_and_lookups_see_other_processes_writes(tmp_path):
+    ours = SegmentStore(str(tmp_path))
+    cache = EntityCache(ours)
+    assert cache.names() == {}
+
+    theirs = SegmentStore(str(tmp_path))  # another worker appending to the same log
+    e = Entity(name="Lumen", eid="e1")
+    theirs.put(e.id, record(e), label=e.name)
+    theirs.close()
+
+    assert cache.names() == {"e1": "Lumen"}
+    assert cache.get("e1").name == "Lumen"
+    ours.close()
@@ -0,0 +1,49 @@
+import sys
+import threading
+
+import pytest
+
+from core.entity import Entity
+from utils import entity_loader
+from utils.segment_store import SegmentStore
+
+
+@pytest.fixture
+def segments(tmp_path, monkeypatch):
+    store = SegmentStore(str(tmp_path / "entity_data"))
+    monkeypatch.setattr(entity_loader, "_segments", store)
+    monkeypatch.setattr(entity_loader, "_pending_writes", {})
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def busy_switching():
+    """Switch threads as often as possible, so races in staging code show up."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_concurrent_stage_and_flush_lose_nothing(segments, busy_switching):
+    threads_count, per_thread = 8, 50
+    entities = [[Entity(name=f"t{t}-{i}") for i in range(per_thread)] for t in range(threads_count)]
+    unsaved = []
+
+    def worker(batch):
+        for e in batch:
+            entity_loader.stage_entity(e)
+            entity_loader.flush()
+            if e.id not in segments:  # flush() returns only once our record is durable
+                unsaved.append(e.id)
+
+    threads = [threading.Thread(target=worker, args=(batch,)) for batch in entities]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not unsaved
+    assert len(segments) == threads_count * per_thread
+    assert entity_loader.flush() == 0
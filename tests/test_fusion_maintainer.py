@@ -0,0 +1,88 @@
+import logging
+import random
+
+import pytest
+
+from core.entity import Entity
+from core.entity_store import EntityStore
+from core.fusion_engine import find_fusion_pairs, select_fusions
+from core.fusion_maintainer import FusionCandidateMaintainer
+
+logging.disable(logging.WARNING)
+
+GLYPHS = [f"g{i}" for i in range(14)]
+CYCLES = 25
+
+
+def population(rng, store, count=400):
+    entities = []
+    for i in range(count):
+        e = Entity(name=f"e{i}", store=store, eid=f"{i:08x}")
+        if rng.random() < 0.7:
+            for glyph in rng.sample(GLYPHS[:12], rng.randint(2, 5)):
+                e.crystal.embed(glyph)
+        e.drift_level = rng.random() * 0.3
+        entities.append(e)
+    return entities
+
+
+def mutate(rng, entities):
+    """Embeds, rewrites, drift and status changes: every change the maintainer must follow."""
+    for _ in range(30):
+        e = rng.choice(entities)
+        r = rng.random()
+        if r < 0.3:
+            e.crystal.embed(rng.choice(GLYPHS))
+        elif r < 0.45 and e._crystal is not None and e._crystal.fragments:
+            e.crystal.rewrite_fragment(rng.choice(list(e._crystal.fragments)), rng.choice(GLYPHS))
+        elif r < 0.7:
+            e.drift_level = rng.random() * 0.3
+        elif r < 0.85:
+            e.status = rng.choice(["active", "quarantined"])
+
+
+def ranked_ids(pairs):
+    return [(a.id, b.id, coherence) for a, b, _, coherence in pairs]
+
+
+def chosen_ids(pairs):
+    return [(a.id, b.id) for a, b, _ in pairs]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_maintainer_matches_brute_force(seed):
+    rng = random.Random(seed)
+    store = EntityStore()
+    entities = population(rng, store)
+    maintainer = FusionCandidateMaintainer(store)
+    for cycle in range(CYCLES):
+        mutate(rng, entities)
+        if cycle % 7 == 3:
+            newcomer = Entity(name="new", store=store, eid=f"n{cycle:07d}")
+            for glyph in rng.sample(GLYPHS[:12], 3):
+                newcomer.crystal.embed(glyph)
+            entities.append(newcomer)
+        maintainer.sync(entities)
+        brute = find_fusion_pairs(entities)
+        assert ranked_ids(maintainer.ranked()) == ranked_ids(brute), cycle
+        assert chosen_ids(maintainer.select()) == chosen_ids(select_fusions(brute)), cycle
+    assert len(maintainer) > 0
+    maintainer.close()
+
+
+def test_discarded_entities_leave_no_pairs():
+    rng = random.Random(11)
+    store = EntityStore()
+    entities = population(rng, store)
+    maintainer = FusionCandidateMaintainer(store)
+    maintainer.sync(entities)
+    gone = {a.id for a, _, _, _ in maintainer.ranked()[:10]}
+    survivors = []
+    for e in entities:
+        if e.id in gone:
+            maintainer.discard(e)
+        else:
+            survivors.append(e)
+    maintainer.sync(survivors)
+    assert ranked_ids(maintainer.ranked()) == ranked_ids(find_fusion_pairs(survivors))
+    maintainer.close()
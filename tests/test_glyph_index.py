@@ -0,0 +1,64 @@
+import random
+from itertools import combinations
+
+import pytest
+
+from core.glyph_index import candidate_pairs
+
+GLYPHS = [f"g{i}" for i in range(30)]
+
+
+def glyph_families(seed, count=400, families=40):
+    """Sets drawn around shared family cores, so many pairs come close to the thresholds."""
+    rng = random.Random(seed)
+    cores = [set(rng.sample(GLYPHS, rng.randint(3, 8))) for _ in range(families)]
+    sets = []
+    for _ in range(count):
+        glyphs = set(rng.choice(cores))
+        if rng.random() < 0.5:
+            glyphs.add(rng.choice(GLYPHS))
+        if rng.random() < 0.3 and len(glyphs) > 1:
+            glyphs.discard(rng.choice(sorted(glyphs)))
+        sets.append(glyphs)
+    sets += [set(), {"g0"}]  # too small to ever qualify
+    return sets
+
+
+def qualifying(glyph_sets, min_shared, min_jaccard):
+    found = []
+    for i, j in combinations(range(len(glyph_sets)), 2):
+        shared = len(glyph_sets[i] & glyph_sets[j])
+        union = len(glyph_sets[i] | glyph_sets[j])
+        if shared >= min_shared and shared / union >= min_jaccard:
+            found.append((i, j))
+    return found
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("min_shared, min_jaccard", [(2, 0.85), (2, 0.5), (3, 0.7), (1, 0.0)])
+def test_prefix_index_misses_no_qualifying_pair(seed, min_shared, min_jaccard):
+    glyph_sets = glyph_families(seed)
+    candidates = candidate_pairs(glyph_sets, min_shared, min_jaccard)
+    assert candidates == sorted(candidates)
+    assert all(i < j for i, j in candidates)
+    assert set(qualifying(glyph_sets, min_shared, min_jaccard)) <= set(candidates)
+
+
+def test_prefix_index_prunes_far_pairs():
+    glyph_sets = glyph_families(0)
+    everything = len(glyph_sets) * (len(glyph_sets) - 1) // 2
+    assert len(candidate_pairs(glyph_sets, 2, 0.85)) < everything / 4
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_lsh_candidates_recall_close_pairs(seed):
+    glyph_sets = glyph_families(seed)
+    expected = set(qualifying(glyph_sets, 2, 0.85))
+    candidates = candidate_pairs(glyph_sets, 2, 0.85, method="lsh")
+    assert candidates == sorted(candidates)
+    assert len(expected & set(candidates)) >= 0.97 * len(expected)
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        candidate_pairs([{"a", "b"}], 2, 0.85, method="bogus")
@@ -0,0 +1,96 @@
+import logging
+import random
+
+from config.settings import ENTITY_LOG_CAPACITY
+from core.entity import Entity
+from core.entity_store import EntityStore
+from core.metadata_log import LogSpill
+from drift.healing_rituals import healing_echo, reweaving_ritual
+
+EXTRA = 5
+
+
+def fill_log(entity, count):
+    for i in range(count):
+        entity.log_event("tick", {"i": i})
+
+
+def stamped(i):
+    return {"timestamp": f"2026-01-01T00:00:{i:02d}", "action": "tick", "i": i}
+
+
+def test_store_without_log_dir_counts_and_warns_once(caplog):
+    store = EntityStore()
+    a, b = Entity(store=store), Entity(store=store)
+    with caplog.at_level(logging.WARNING):
+        fill_log(a, ENTITY_LOG_CAPACITY + EXTRA)
+        fill_log(b, ENTITY_LOG_CAPACITY + EXTRA)
+    assert store.log_dropped == 2 * EXTRA
+    assert sum("dropped" in r.getMessage() for r in caplog.records) == 1
+    assert len(a.log_history()) == ENTITY_LOG_CAPACITY
+
+
+def test_store_log_dir_keeps_the_full_history(tmp_path):
+    store = EntityStore(log_dir=str(tmp_path), shard=3)
+    e = Entity(store=store)
+    fill_log(e, ENTITY_LOG_CAPACITY + EXTRA)
+    assert store.log_dropped == 0
+    assert [entry["i"] for entry in e.log_history()] == list(range(ENTITY_LOG_CAPACITY + EXTRA))
+    assert (tmp_path / "shard-3.log").exists()
+    store.spill().close()
+
+
+def test_spill_is_only_opened_when_needed(tmp_path):
+    store = EntityStore(log_dir=str(tmp_path / "spill"))
+    fill_log(Entity(store=store), 3)
+    assert store.log_spill is None and not (tmp_path / "spill").exists()
+
+
+def test_spill_time_range_lookup(tmp_path):
+    spill = LogSpill(str(tmp_path))
+    spill.append("a", [stamped(i) for i in range(0, 20, 2)])
+    spill.append("b", [stamped(i) for i in range(1, 20, 2)])
+    assert [e["i"] for e in spill.entries("a", since="2026-01-01T00:00:05", until="2026-01-01T00:00:12")] == [6, 8, 10, 12]
+    assert [e["i"] for e in spill.entries("b", until="2026-01-01T00:00:04")] == [1, 3]
+    assert [e["i"] for e in spill.entries("b", since="2026-01-01T00:00:18")] == [19]
+    assert spill.entries("a", since="2026-01-01T00:00:30") == []
+    assert spill.entries("nobody") == []
+    spill.close()
+
+
+def test_spill_reopen_truncates_a_torn_tail(tmp_path):
+    spill = LogSpill(str(tmp_path))
+    spill.append("a", [stamped(i) for i in range(5)])
+    spill.close()
+    with open(spill.path, "ab") as f:
+        f.write(b'{"timestamp": "2026-01-01T00:00:09", "entity": "a", "i"')  # crash mid-write
+
+    reopened = LogSpill(str(tmp_path))
+    assert [e["i"] for e in reopened.entries("a")] == list(range(5))
+    reopened.append("a", [stamped(6)])
+    reopened.close()
+    assert [e["i"] for e in LogSpill(str(tmp_path)).entries("a")] == [0, 1, 2, 3, 4, 6]
+
+
+def test_rituals_and_dialogue_share_the_bounded_log():
+    store = EntityStore()
+    e = Entity(store=store)
+    rng = random.Random(0)
+    for _ in range(ENTITY_LOG_CAPACITY):
+        e.status, e.drift_level = "quarantined", 0.8
+        reweaving_ritual(e, rng)
+        healing_echo(e, rng)
+        e.log_event("dialogue", {"exchange": "i remember the veil"})
+    assert len(e.metadata["log"]) == ENTITY_LOG_CAPACITY
+    assert not {"healing_history", "reweaving_log", "dialogue_log"} & e.metadata.keys()
+    assert [entry["exchange"] for entry in e.recent_events("dialogue", 2)] == ["i remember the veil"] * 2
+    assert e.recent_events("healing_echo", 1)[0]["drift_before"] == 0.2
+
+
+def test_recent_events_reach_into_the_spill(tmp_path):
+    store = EntityStore(log_dir=str(tmp_path))
+    e = Entity(store=store)
+    e.log_event("dialogue", {"exchange": "we once crossed the threshold"})
+    fill_log(e, ENTITY_LOG_CAPACITY)
+    assert [entry["exchange"] for entry in e.recent_events("dialogue", 5)] == ["we once crossed the threshold"]
+    store.spill().close()
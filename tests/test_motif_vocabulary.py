@@ -0,0 +1,24 @@
+import random
+
+from memory.motif_vocabulary import add_id, discard_id, frozen_ids, has_id, id_set, jaccard, overlap
+
+
+def test_overlap_agrees_across_set_forms():
+    rng = random.Random(3)
+    for _ in range(200):
+        a = rng.sample(range(60), rng.randint(0, 12))
+        b = rng.sample(range(60), rng.randint(0, 12))
+        expected = len(set(a) & set(b))
+        assert overlap(id_set(a), id_set(b)) == expected
+        assert overlap(frozen_ids(id_set(a)), frozen_ids(id_set(b))) == expected
+        assert jaccard(frozen_ids(a), id_set(b)) == jaccard(id_set(a), id_set(b))
+
+
+def test_sorted_id_set_edits():
+    ids = id_set([5, 1, 9, 1])
+    assert list(ids) == [1, 5, 9]
+    assert add_id(ids, 7) and not add_id(ids, 7)
+    discard_id(ids, 1)
+    discard_id(ids, 2)
+    assert list(ids) == [5, 7, 9]
+    assert has_id(ids, 9) and not has_id(ids, 1)
@@ -0,0 +1,68 @@
+import numpy as np
+
+from core.rng import STREAMS, CounterRandom, RngService
+
+SEED = 7
+DRAWS = 64
+
+
+def draws(rng, count=DRAWS):
+    return [rng.random() for _ in range(count)]
+
+
+def test_same_coordinates_same_stream():
+    a, b = RngService(SEED), RngService(SEED)
+    assert draws(a.for_entity("e1", 5, "dream")) == draws(b.for_entity("e1", 5, "dream"))
+
+
+def test_streams_differ_per_coordinate_and_seed():
+    rng = RngService(SEED)
+    base = draws(rng.for_entity("e1", 5, "dream"))
+    others = [
+        draws(rng.for_entity("e2", 5, "dream")),
+        draws(rng.for_entity("e1", 6, "dream")),
+        draws(rng.for_entity("e1", 5, "quest")),
+        draws(RngService(SEED + 1).for_entity("e1", 5, "dream")),
+    ]
+    for other in others:
+        assert other != base
+        assert not set(other) & set(base)
+
+
+def test_streams_of_one_tick_do_not_share_draws():
+    rng = RngService(SEED)
+    seen = set()
+    for eid in ("e%d" % i for i in range(50)):
+        for stream in STREAMS:
+            values = draws(rng.for_entity(eid, 3, stream), 16)
+            assert not seen & set(values)
+            seen.update(values)
+
+
+def test_draw_order_across_entities_does_not_matter():
+    rng = RngService(SEED)
+    forward = {eid: draws(rng.for_entity(eid, 1, "drift")) for eid in ("a", "b", "c")}
+    rng = RngService(SEED)
+    backward = {eid: draws(rng.for_entity(eid, 1, "drift")) for eid in ("c", "b", "a")}
+    assert forward == backward
+
+
+def test_bulk_draws_match_per_entity_streams():
+    rng = RngService(SEED)
+    eids = ["e%d" % i for i in range(20)]
+    keys = np.array([rng.key(eid) for eid in eids], dtype=np.uint64)
+    bulk = rng.unit(keys, 9, "emotion", width=4)
+    for row, eid in zip(bulk, eids):
+        assert row.tolist() == draws(rng.for_entity(eid, 9, "emotion"), 4)
+
+
+def test_counter_random_ranges():
+    rng = CounterRandom(12345)
+    for _ in range(1000):
+        assert 0.0 <= rng.random() < 1.0
+        assert 2 <= rng.randint(2, 4) <= 4
+        assert -1.0 <= rng.uniform(-1.0, 1.0) < 1.0
+        assert rng.choice("xyz") in "xyz"
+        assert 0 <= rng.getrandbits(8) < 256
+    values = draws(CounterRandom(12345), 10_000)
+    assert abs(sum(values) / len(values) - 0.5) < 0.02
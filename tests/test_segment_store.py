@@ -0,0 +1,137 @@
+import os
+
+import pytest
+
+from utils.segment_store import MANIFEST, SEGMENT_SUFFIX, SegmentStore
+
+
+def filled(directory, keys=40, rounds=3):
+    """A store over many small segments, with every key overwritten `rounds` times."""
+    store = SegmentStore(str(directory), max_segment_bytes=256)
+    for r in range(rounds):
+        for i in range(keys):
+            store.put(f"k{i}", f"v{r}-{i}".encode(), label=f"name{i}")
+    return store
+
+
+def segment_files(directory):
+    return sorted(f for f in os.listdir(directory) if f.endswith(SEGMENT_SUFFIX))
+
+
+def test_reopen_recovers_every_record(tmp_path):
+    store = filled(tmp_path)
+    store.delete("k3")
+    expected = dict(store.items())
+    store.close()
+
+    reopened = SegmentStore(str(tmp_path))
+    assert dict(reopened.items()) == expected
+    assert "k3" not in reopened and reopened.labels["k4"] == "name4"
+
+
+def test_torn_tail_is_truncated_on_open(tmp_path):
+    store = SegmentStore(str(tmp_path))
+    store.put("a", b"first")
+    store.put("b", b"second")
+    path = store._segment_path(store._active_id)
+    store.close()
+    intact = os.path.getsize(path)
+    with open(path, "ab") as f:
+        f.write(b"\x01\x02\x03")  # a record header cut short
+
+    reopened = SegmentStore(str(tmp_path))
+    assert dict(reopened.items()) == {"a": b"first", "b": b"second"}
+    assert os.path.getsize(path) == intact
+
+
+def test_crc_mismatch_drops_the_damaged_tail(tmp_path):
+    store = SegmentStore(str(tmp_path))
+    store.put("a", b"first")
+    store.put("b", b"second")
+    path = store._segment_path(store._active_id)
+    store.close()
+    with open(path, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+
+    reopened = SegmentStore(str(tmp_path))
+    assert dict(reopened.items()) == {"a": b"first"}
+    reopened.put("c", b"third")  # appends after the truncated record
+    assert SegmentStore(str(tmp_path)).get("c") == b"third"
+
+
+def test_compaction_during_items_keeps_the_snapshot(tmp_path):
+    store = filled(tmp_path)
+    expected = {f"k{i}": f"v2-{i}".encode() for i in range(40)}
+    assert len({seg_id for seg_id, _, _ in store.index.values()}) > 2
+    reading = store.items()
+    first = [next(reading)]
+    store.compact()
+    assert dict(first + list(reading)) == expected
+    assert dict(store.items()) == expected
+    assert store.dead_bytes() == 0
+
+
+def test_repeated_compaction_does_not_add_segments(tmp_path):
+    store = filled(tmp_path)
+    store.compact()
+    after_first = segment_files(tmp_path)
+    store.compact()
+    store.compact()
+    assert segment_files(tmp_path) == after_first
+    assert len(after_first) <= 2  # the compacted segment and the active one
+
+
+class Crash(Exception):
+    pass
+
+
+def crash_on(monkeypatch, name, suffix):
+    """Make os.<name> die on paths ending in suffix, as a power cut at that step would."""
+    real = getattr(os, name)
+
+    def call(path, *args):
+        if str(path).endswith(suffix):
+            raise Crash(path)
+        return real(path, *args)
+    monkeypatch.setattr(os, name, call)
+
+
+def deleted_then_compacting(tmp_path):
+    """A store whose compaction target holds the only tombstone of k0, whose puts sit in older segments."""
+    store = filled(tmp_path)
+    store.delete("k0")
+    expected = {f"k{i}": f"v2-{i}".encode() for i in range(1, 40)}
+    return store, expected
+
+
+def test_crash_after_the_swap_does_not_resurrect_deletes(tmp_path, monkeypatch):
+    store, expected = deleted_then_compacting(tmp_path)
+    before = segment_files(tmp_path)
+    crash_on(monkeypatch, "remove", SEGMENT_SUFFIX)
+    with pytest.raises(Crash):
+        store.compact()
+    monkeypatch.undo()
+    assert len(segment_files(tmp_path)) >= len(before) - 1  # the old segments are still on disk
+
+    reopened = SegmentStore(str(tmp_path))
+    assert dict(reopened.items()) == expected
+    assert not (tmp_path / MANIFEST).exists()
+    assert len(segment_files(tmp_path)) <= 2
+
+
+def test_crash_before_the_swap_keeps_the_old_segments(tmp_path, monkeypatch):
+    store, expected = deleted_then_compacting(tmp_path)
+    crash_on(monkeypatch, "replace", ".compact")
+    with pytest.raises(Crash):
+        store.compact()
+    monkeypatch.undo()
+
+    reopened = SegmentStore(str(tmp_path))
+    assert dict(reopened.items()) == expected
+    assert not (tmp_path / MANIFEST).exists()
+    assert not [f for f in os.listdir(tmp_path) if f.endswith(".compact")]
+    reopened.compact()
+    assert dict(SegmentStore(str(tmp_path)).items()) == expected
@@ -0,0 +1,117 @@
+import json
+import random
+import time
+
+import numpy as np
+import pytest
+
+from core.dream_state import DreamState
+from core.emotion_engine import NEUROCHEMICALS, EmotionState
+from memory.memory_crystal import MAX_LAYERS, MemoryCrystal
+from utils.packing import decode_deltas, decode_varints, encode_deltas, encode_varints, from_b64, to_b64
+
+
+def round_trip(crystal) -> MemoryCrystal:
+    return MemoryCrystal.from_dict(json.loads(json.dumps(crystal.to_dict())))
+
+
+def shown(crystal) -> tuple:
+    """Everything a crystal shows: fragments with their ISO added times, vault and rewrites."""
+    return list(crystal.fragments.items()), crystal.vault, crystal.rewrite_log
+
+
+def test_added_times_survive_exactly():
+    base = time.time()
+    crystals = []
+    for i in range(1000):
+        crystal = MemoryCrystal()
+        crystal.embed(f"motif-{i}")
+        crystal._tables[0].times[0] = base + i * 0.0000137  # arbitrary sub-microsecond fractions
+        crystals.append(crystal)
+    assert [shown(round_trip(c)) for c in crystals] == [shown(c) for c in crystals]
+
+
+def test_plain_crystal_round_trips():
+    crystal = MemoryCrystal()
+    crystal.embed_many(["veil", "glyph", "echo", "veil"])
+    crystal.embed("ash")
+    again = round_trip(crystal)
+    assert shown(again) == shown(crystal)
+    assert shown(round_trip(again)) == shown(crystal)
+
+
+def test_rewritten_crystal_keeps_its_vault():
+    crystal = MemoryCrystal()
+    crystal.embed_many(["veil", "glyph", "echo"])
+    crystal.rewrite_fragment(crystal.hash_motif("glyph"), "mirror")
+    again = round_trip(crystal)
+    assert shown(again) == shown(crystal)
+    assert again.in_vault(crystal.hash_motif("glyph"))
+    assert "glyph" not in again.texts()
+    assert list(again.vault_ids) == list(crystal.vault_ids)
+
+
+def test_merged_crystal_round_trips():
+    parents = []
+    for texts in (["veil", "glyph"], ["glyph", "echo"], ["stars"]):
+        parent = MemoryCrystal()
+        parent.embed_many(texts)
+        parents.append(parent)
+    merged = MemoryCrystal.merged(*parents)
+    merged.embed("bloom")
+    assert shown(round_trip(merged)) == shown(merged)
+    nested = MemoryCrystal.merged(merged, parents[0])
+    assert shown(round_trip(nested)) == shown(nested)
+
+
+def test_emotion_state_round_trips():
+    state = EmotionState()
+    rng = np.random.default_rng(1)
+    state.levels = {name: float(v) for name, v in zip(NEUROCHEMICALS, rng.uniform(0, 2, len(NEUROCHEMICALS)))}
+    again = EmotionState.from_dict(json.loads(json.dumps(state.to_dict())))
+    assert dict(again.levels) == dict(state.levels)
+
+
+def test_dream_state_round_trips():
+    state = DreamState()
+    state.enter("silent")
+    state.tick()
+    state.enter("a hand-entered layer")
+    state.cycles_in = 5
+    again = DreamState.from_dict(json.loads(json.dumps(state.to_dict())))
+    assert (again.current_layer, again.cycles_in, again.entered) == (state.current_layer, state.cycles_in, state.entered)
+    assert again.layer_log == state.layer_log
+
+
+@pytest.mark.parametrize("values", [
+    [],
+    [0, 1, 127, 128, 16_383, 16_384, 2 ** 35, 2 ** 63],
+])
+def test_varints_round_trip(values):
+    encoded = encode_varints(values)
+    assert decode_varints(encoded) == values
+    assert from_b64(to_b64(encoded)) == encoded
+
+
+def test_varints_take_one_byte_per_seven_bits():
+    assert len(encode_varints([127])) == 1
+    assert len(encode_varints([128])) == 2
+    assert len(encode_varints([2 ** 63])) == 10
+
+
+def test_deltas_round_trip_with_negative_steps():
+    rng = random.Random(2)
+    values = [rng.randint(-10 ** 12, 10 ** 12) for _ in range(200)] + [5, 5, 4, -1, 0]
+    assert decode_deltas(encode_deltas(values)) == values
+    ascending = sorted(values)
+    assert len(encode_deltas(ascending)) < len(encode_deltas(values))
+
+
+def test_merged_crystal_past_max_layers_round_trips():
+    crystals = []
+    for i in range(MAX_LAYERS + 2):
+        crystal = MemoryCrystal()
+        crystal.embed_many([f"m{i}", f"m{i + 1}"])
+        crystals.append(crystal)
+    merged = MemoryCrystal.merged(*crystals)
+    assert shown(round_trip(merged)) == shown(merged)
@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from storage.backends import open_storage
+from utils import sqlite_repository
+from utils.sqlite_repository import SQLiteEntityRepository
+
+
+@pytest.fixture
+def entity_db(tmp_path, monkeypatch):
+    path = str(tmp_path / "entities.db")
+    monkeypatch.setattr(sqlite_repository, "ENTITY_DB", path)
+    SQLiteEntityRepository(path)  # creating it enables the index
+    return path
+
+
+def test_batch_file_writes_refresh_its_mirror(tmp_path, entity_db):
+    storage = open_storage(str(tmp_path / "entities.json"))
+    storage.replace_all([("Ash", {"drift": 0.4, "ess": 0.9}), ("Bloom", {"drift": 0.1})])
+    assert sorted(storage.index().query_ids(drift_min=0.25)) == ["Ash"]
+
+    storage.upsert([("Bloom", {"drift": 0.3})])
+    storage.delete("Ash")
+    assert sorted(storage.index().query_ids(drift_min=0.25)) == ["Bloom"]
+
+
+def test_mirror_rebuilds_after_a_write_behind_its_back(tmp_path, entity_db):
+    path = tmp_path / "entities.json"
+    storage = open_storage(str(path))
+    storage.replace_all([("Ash", {"drift": 0.4})])
+    path.write_text(json.dumps({"Ash": {"drift": 0.1}, "Cinder": {"drift": 0.9, "padding": "x" * 10}}))
+    assert storage.index().query_ids(drift_min=0.25) == ["Cinder"]
+
+
+def test_record_shapes_stay_in_separate_tables(tmp_path, entity_db):
+    dashboard = SQLiteEntityRepository(entity_db)
+    dashboard.upsert([("e1", {"name": "Ash", "drift_level": 0.7, "stats": {"ess": 0.5}})])
+    open_storage(str(tmp_path / "a.json")).replace_all([("Ash", {"drift": 0.2, "ess": 0.9})])
+    open_storage(str(tmp_path / "b.json.gz")).replace_all([("Ash", {"drift": 0.6})])
+
+    assert dashboard.query_ids(drift_min=0.5) == ["e1"]
+    assert dashboard.query_ids(ess_min=0.8) == []
+    assert open_storage(str(tmp_path / "a.json")).index().query_ids(ess_min=0.8) == ["Ash"]
+    assert open_storage(str(tmp_path / "b.json.gz")).index().get("Ash") == {"drift": 0.6}
+    assert len(dashboard) == 1
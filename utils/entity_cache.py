@@ -0,0 +1,136 @@
+# entity_cache.py
+
+import json
+import threading
+from core.entity import Entity
+from utils.entity_loader import get_segment_store, stage_entity, delete_entity, flush
+
+
+class EntityCache:
+    """
+    Process-wide entity cache shared by every dashboard blueprint.
+    Before serving, it asks the segment log for records appended by other
+    processes and drops only the cached entities whose record moved.
+    """
+
+    def __init__(self, segments=None):
+        self._segments = segments
+        self._listening = False
+        self._lock = threading.RLock()
+        self.entities = {}    # id -> Entity
+        self._locations = {}  # id -> index location the cached copy was decoded from
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def segments(self):
+        segments = self._segments if self._segments is not None else get_segment_store()  # an empty store is falsy
+        if not self._listening:
+            segments.add_relocation_listener(self._relocated)
+            self._segments = segments
+            self._listening = True
+        return segments
+
+    def _relocated(self, moves: dict):
+        """Compaction moved records without changing them; follow the move."""
+        with self._lock:
+            for eid, (old, new) in moves.items():
+                if self._locations.get(eid) == old:
+                    self._locations[eid] = new
+
+    def refresh(self):
+        """Invalidate entries whose on-disk record changed since they were cached."""
+        with self._lock:
+            changed = self.segments.refresh()
+            index = self.segments.index
+            keys = self._locations.keys() if changed is None else changed & self._locations.keys()
+            stale = [eid for eid in keys if index.get(eid) != self._locations[eid]]
+            for eid in stale:
+                self.entities.pop(eid, None)
+                self._locations.pop(eid, None)
+            self.invalidations += len(stale)
+
+    def _load(self, eid: str) -> Entity | None:
+        loc = self.segments.index.get(eid)
+        payload = self.segments.get(eid)
+        if payload is None:
+            return None
+        e = Entity.from_dict(json.loads(payload))
+        self.entities[eid] = e
+        self._locations[eid] = loc
+        return e
+
+    def get(self, eid: str) -> Entity | None:
+        with self._lock:
+            self.refresh()
+            e = self.entities.get(eid)
+            if e is not None:
+                self.hits += 1
+                return e
+            self.misses += 1
+            return self._load(eid)
+
+    def all(self) -> dict:
+        """{id: Entity} for the whole population, decoding only uncached records."""
+        with self._lock:
+            self.refresh()
+            missing = [eid for eid in self.segments.index if eid not in self.entities]
+            self.hits += len(self.segments.index) - len(missing)
+            self.misses += len(missing)
+            for eid in missing:
+                self._load(eid)
+            return {eid: self.entities[eid] for eid in self.segments.index if eid in self.entities}
+
+    def names(self) -> dict:
+        """id → name from the record labels, including other processes' writes; nothing is decoded."""
+        with self._lock:
+            self.refresh()
+            return dict(self.segments.labels)
+
+    def save(self, entities) -> int:
+        """Write the dirty entities and keep their cached copies current."""
+        if isinstance(entities, Entity):
+            entities = [entities]
+        elif isinstance(entities, dict):
+            entities = list(entities.values())
+        with self._lock:
+            staged = [e for e in entities if e.dirty]
+            for e in staged:
+                stage_entity(e)
+        # The durable write runs unlocked, so readers are not held up behind its fsync.
+        written = flush()
+        with self._lock:
+            for e in staged:
+                self.entities[e.id] = e
+                self._locations[e.id] = self.segments.index.get(e.id)
+        return written
+
+    def delete(self, eid: str) -> int:
+        with self._lock:
+            delete_entity(eid)
+            self.entities.pop(eid, None)
+            self._locations.pop(eid, None)
+        return flush()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.entities),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+def init_app(app) -> EntityCache:
+    """Attach one cache to the Flask app; blueprints reach it via current_cache()."""
+    cache = EntityCache()
+    app.extensions["entity_cache"] = cache
+    return cache
+
+
+def current_cache() -> EntityCache:
+    from flask import current_app
+    return current_app.extensions["entity_cache"]
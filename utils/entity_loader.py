@@ -1,36 +1,140 @@
 import os
 import json
+import threading
 from core.entity import Entity
+from core.entity_store import shared_store
+from storage.atomic import GroupCommit
+from utils.segment_store import SegmentStore
 
 ENTITY_DIR = "entity_data"
+LEGACY_DIR = "legacy"
+
+_segments = None
+
+# Records waiting for flush(): {entity_id: (name, json bytes, or None to delete)}
+_pending_writes = {}
+_pending_lock = threading.Condition()  # staging threads vs. the flush that swaps the dict out
+_flushing = 0  # flushes whose batch is not durable yet
+
+_sqlite_mirror = None
+
+def get_segment_store() -> SegmentStore:
+    """Open the entity log once per process, importing any legacy per-entity JSON files."""
+    global _segments
+    if _segments is None:
+        _segments = SegmentStore(ENTITY_DIR)
+        migrate_legacy_files(_segments)
+    return _segments
+
+def migrate_legacy_files(segments: SegmentStore):
+    """Append old entity_data/<id>.json files to the log and move them to legacy/."""
+    legacy = [f for f in os.listdir(ENTITY_DIR) if f.endswith(".json")]
+    if not legacy:
+        return
+    legacy_dir = os.path.join(ENTITY_DIR, LEGACY_DIR)
+    os.makedirs(legacy_dir, exist_ok=True)
+    puts = []
+    for fname in legacy:
+        path = os.path.join(ENTITY_DIR, fname)
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except Exception as ex:
+            print(f"[⚠️] Failed to load {fname}: {ex}")
+            continue
+        eid = data.get("id") or fname[:-len(".json")]
+        data["id"] = eid
+        puts.append((eid, data.get("name", ""), json.dumps(data, separators=(",", ":")).encode("utf-8")))
+    segments.write_batch(puts=puts)
+    for fname in legacy:
+        if os.path.exists(os.path.join(ENTITY_DIR, fname)):
+            os.replace(os.path.join(ENTITY_DIR, fname), os.path.join(legacy_dir, fname))
+    print(f"[📦] Migrated {len(puts)} entity file(s) into the segment log")
 
 def load_entities() -> dict:
     """Load all entities from disk as a dict of {id: Entity instance}."""
     entities = {}
-    if not os.path.exists(ENTITY_DIR):
-        os.makedirs(ENTITY_DIR)
-    for fname in os.listdir(ENTITY_DIR):
-        if fname.endswith(".json"):
-            path = os.path.join(ENTITY_DIR, fname)
-            try:
-                with open(path, "r") as f:
-                    data = json.load(f)
-                    e = Entity.from_dict(data)
-                    entities[e.id] = e
-            except Exception as ex:
-                print(f"[⚠️] Failed to load {fname}: {ex}")
+    for eid, payload in get_segment_store().items():
+        try:
+            e = Entity.from_dict(json.loads(payload))
+            entities[e.id] = e
+        except Exception as ex:
+            print(f"[⚠️] Failed to load {eid}: {ex}")
     return entities
 
 def load_entity_by_id(eid: str) -> Entity | None:
-    path = os.path.join(ENTITY_DIR, f"{eid}.json")
-    if not os.path.exists(path):
+    payload = get_segment_store().get(eid)
+    if payload is None:
         return None
-    with open(path, "r") as f:
-        return Entity.from_dict(json.load(f))
+    return Entity.from_dict(json.loads(payload))
+
+def dirty_entities(entities: dict) -> list:
+    """Entities changed since they were loaded or last saved."""
+    values = list(entities.values())
+    store = shared_store(values)
+    if store is not None:
+        mask = store.dirty_mask(store.rows_of(values))
+        return [e for e, dirty in zip(values, mask) if dirty or e.states_dirty()]
+    return [e for e in values if getattr(e, "dirty", True)]
+
+def stage_entity(ent: Entity):
+    """Queue one entity for the next flush() and mark it clean."""
+    payload = json.dumps(ent.to_dict(), separators=(",", ":")).encode("utf-8")
+    with _pending_lock:
+        _pending_writes[ent.id] = (ent.name, payload)
+    ent.mark_clean()
+
+def delete_entity(eid: str):
+    """Queue removal of an entity's record for the next flush()."""
+    with _pending_lock:
+        _pending_writes[eid] = ("", None)
+
+def _commit_batch(batch: dict):
+    puts = [(eid, label, payload) for eid, (label, payload) in batch.items() if payload is not None]
+    deletes = [eid for eid, (_, payload) in batch.items() if payload is None]
+    segments = get_segment_store()
+    segments.write_batch(puts=puts, deletes=deletes)
+    segments.compact_in_background()
+    mirror_to_sqlite(puts, deletes)
+
+# Flushes from concurrent request threads within a few ms share one append + fsync.
+_group_commit = GroupCommit(_commit_batch)
+
+def flush() -> int:
+    """Append every staged record to the log; returns the record count once it is durable."""
+    global _pending_writes, _flushing
+    with _pending_lock:
+        batch, _pending_writes = _pending_writes, {}
+        if not batch:
+            # A concurrent flush may have taken our records: wait until they are durable.
+            while _flushing:
+                _pending_lock.wait()
+            return 0
+        _flushing += 1
+    try:
+        _group_commit.submit(batch)
+    finally:
+        with _pending_lock:
+            _flushing -= 1
+            _pending_lock.notify_all()
+    return len(batch)
+
+def mirror_to_sqlite(puts, deletes):
+    """Keep the optional SQLite index in step with the log so list queries stay current."""
+    global _sqlite_mirror
+    from utils import sqlite_repository
+    if not sqlite_repository.sqlite_enabled():
+        return
+    if _sqlite_mirror is None or _sqlite_mirror.path != sqlite_repository.ENTITY_DB:
+        # One repository for the process: it keeps a connection per committing thread.
+        _sqlite_mirror = sqlite_repository.SQLiteEntityRepository(sqlite_repository.ENTITY_DB)
+    repo = _sqlite_mirror
+    repo.upsert((eid, json.loads(payload)) for eid, _, payload in puts)
+    if deletes:
+        repo.delete(*deletes)
 
 def save_entities(entities: dict):
-    if not os.path.exists(ENTITY_DIR):
-        os.makedirs(ENTITY_DIR)
-    for eid, ent in entities.items():
-        with open(os.path.join(ENTITY_DIR, f"{eid}.json"), "w") as f:
-            json.dump(ent.to_dict(), f, indent=2)
+    """Persist only the entities that changed, then flush the batch."""
+    for ent in dirty_entities(entities):
+        stage_entity(ent)
+    return flush()
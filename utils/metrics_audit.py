@@ -2,15 +2,23 @@
 
 import logging
 from statistics import mean, stdev
+from core.entity_store import shared_store
 from quests.quest_engine import entity_quests
 
 def audit_entities(entities):
-    drift_values = [e.drift_level for e in entities]
-    coherent_states = [e.status for e in entities]
-    quarantined = sum(1 for e in entities if e.status == "quarantined")
-
-    drift_avg = mean(drift_values)
-    drift_std = stdev(drift_values) if len(drift_values) > 1 else 0.0
+    entities = list(entities)
+    store = shared_store(entities)
+    if store is not None:
+        rows = store.rows_of(entities)
+        drift_values = store.drift[rows]
+        quarantined = int((store.status[rows] == store.status_code("quarantined")).sum())
+        drift_avg = float(drift_values.mean())
+        drift_std = float(drift_values.std(ddof=1)) if len(rows) > 1 else 0.0
+    else:
+        drift_values = [e.drift_level for e in entities]
+        quarantined = sum(1 for e in entities if e.status == "quarantined")
+        drift_avg = mean(drift_values)
+        drift_std = stdev(drift_values) if len(drift_values) > 1 else 0.0
 
     logging.info("🧠 Entity Metrics Audit")
     logging.info(f"  ↪ Total Entities       : {len(entities)}")
@@ -21,6 +29,10 @@ def audit_entities(entities):
     print("")
 
 def status_report(entities):
+    entities = list(entities)
+    store = shared_store(entities)
+    if store is not None:
+        return store.status_counts(store.rows_of(entities))
     breakdown = {}
     for e in entities:
         breakdown[e.status] = breakdown.get(e.status, 0) + 1
@@ -0,0 +1,60 @@
+# packing.py
+
+import base64
+
+
+def zigzag(value: int) -> int:
+    """Signed → unsigned, small magnitudes staying small."""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+def encode_varints(values) -> bytes:
+    """Unsigned LEB128, 7 bits per byte."""
+    out = bytearray()
+    for value in values:
+        while value > 0x7F:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+
+def decode_varints(data: bytes) -> list:
+    values, value, shift = [], 0, 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value, shift = 0, 0
+    return values
+
+
+def encode_deltas(values) -> bytes:
+    """Integers as zigzag varint deltas from their predecessor: near-sorted runs pack tightly."""
+    previous, deltas = 0, []
+    for value in values:
+        deltas.append(zigzag(value - previous))
+        previous = value
+    return encode_varints(deltas)
+
+
+def decode_deltas(data: bytes) -> list:
+    values, current = [], 0
+    for delta in decode_varints(data):
+        current += unzigzag(delta)
+        values.append(current)
+    return values
+
+
+def to_b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def from_b64(text: str) -> bytes:
+    return base64.b64decode(text)
@@ -0,0 +1,402 @@
+# segment_store.py
+
+import json
+import os
+import struct
+import threading
+import zlib
+from storage.atomic import atomic_file, fsync_directory, lock_for
+
+# Record: crc32, payload length, op, key length, label length | key | label | payload
+RECORD_HEADER = struct.Struct("<IIBHH")
+OP_PUT = 1
+OP_DELETE = 2
+
+SEGMENT_SUFFIX = ".seg"
+MANIFEST = "compaction"  # an in-flight compaction's swap: {"target": id, "obsolete": [ids]}
+MAX_SEGMENT_BYTES = 16 * 1024 * 1024
+COMPACT_GARBAGE_RATIO = 0.5      # compact once half of the log is dead records
+COMPACT_MIN_BYTES = 1024 * 1024  # ...and there is at least this much to reclaim
+
+
+def encode_record(op: int, key: str, label: str, payload: bytes) -> bytes:
+    k = key.encode("utf-8")
+    lb = label.encode("utf-8")[:0xFFFF]
+    body = k + lb + payload
+    return RECORD_HEADER.pack(zlib.crc32(body), len(payload), op, len(k), len(lb)) + body
+
+
+class SegmentStore:
+    """
+    Log-structured key/value store: append-only segment files of length-prefixed
+    records plus an in-memory index of where each key's latest payload lives.
+    Every record carries a short label (the entity name) so listings never have
+    to decode payloads.
+    """
+
+    def __init__(self, directory: str, max_segment_bytes: int = MAX_SEGMENT_BYTES):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.index = {}    # key -> (segment id, payload offset, payload length)
+        self.labels = {}   # key -> label
+        self._segment_bytes = {}
+        self._dead_bytes = {}
+        self._inodes = {}
+        self._readers = {}
+        self._writer = None
+        self._lock = threading.RLock()
+        self._compactor = None
+        self._relocation_listeners = []
+        os.makedirs(directory, exist_ok=True)
+        # Advisory locks shared with every other process using this directory:
+        # appends and segment swaps are exclusive, catching up is shared.
+        self._file_lock = lock_for(os.path.join(directory, "segments"))
+        self._compact_lock = lock_for(os.path.join(directory, "compact"))
+        with self._lock, self._file_lock:
+            self._finish_compaction()
+            self._load(repair=True)
+
+    # === Segment files ===
+    def _segment_path(self, seg_id: int) -> str:
+        return os.path.join(self.directory, f"{seg_id:06d}{SEGMENT_SUFFIX}")
+
+    def _segment_ids(self) -> list:
+        obsolete = self._obsolete()
+        ids = []
+        for fname in os.listdir(self.directory):
+            stem = fname[:-len(SEGMENT_SUFFIX)]
+            if fname.endswith(SEGMENT_SUFFIX) and stem.isdigit() and int(stem) not in obsolete:
+                ids.append(int(stem))
+        return sorted(ids)
+
+    def _manifest(self):
+        try:
+            with open(os.path.join(self.directory, MANIFEST), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _obsolete(self) -> set:
+        """
+        Segments a compaction has superseded but not yet unlinked. Once its
+        target was swapped in (no temp file left), they must not be replayed:
+        the target has shed the tombstones that kept their records deleted.
+        """
+        manifest = self._manifest()
+        if manifest is None or os.path.exists(self._segment_path(manifest["target"]) + ".compact"):
+            return set()
+        return set(manifest["obsolete"])
+
+    def _finish_compaction(self):
+        """Complete or roll back a compaction that was interrupted mid-swap (exclusive lock held)."""
+        manifest = self._manifest()
+        if manifest is None:
+            return
+        tmp_path = self._segment_path(manifest["target"]) + ".compact"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)  # never swapped in: the old segments are still whole
+        else:
+            for seg_id in manifest["obsolete"]:
+                if os.path.exists(self._segment_path(seg_id)):
+                    os.remove(self._segment_path(seg_id))
+        fsync_directory(self.directory)
+        os.remove(os.path.join(self.directory, MANIFEST))
+
+    def _load(self, repair: bool = False):
+        """(Re)build the index from every segment on disk."""
+        self.index.clear()
+        self.labels.clear()
+        self._segment_bytes.clear()
+        self._dead_bytes.clear()
+        self._inodes.clear()
+        self._close_readers()
+        segments = self._segment_ids()
+        for seg_id in segments:
+            self._scan(seg_id, repair=repair)
+        self._open_writer(segments[-1] if segments else 1)
+
+    def _open_writer(self, seg_id: int):
+        if self._writer:
+            self._writer.close()
+        self._active_id = seg_id
+        self._writer = open(self._segment_path(seg_id), "ab")
+        self._segment_bytes.setdefault(seg_id, self._writer.tell())
+        self._inodes[seg_id] = os.fstat(self._writer.fileno()).st_ino
+
+    def _scan(self, seg_id: int, start: int = 0, repair: bool = False, changed: set = None):
+        """
+        Replay one segment from byte `start` into the index.
+        With repair=True (only at open) a torn tail record is truncated away;
+        otherwise a partial tail is assumed to be another writer mid-append.
+        """
+        path = self._segment_path(seg_id)
+        with open(path, "rb") as f:
+            self._inodes[seg_id] = os.fstat(f.fileno()).st_ino
+            f.seek(start)
+            data = f.read()
+        pos = 0
+        while pos + RECORD_HEADER.size <= len(data):
+            crc, length, op, klen, llen = RECORD_HEADER.unpack_from(data, pos)
+            rec = pos + RECORD_HEADER.size
+            end = rec + klen + llen + length
+            if end > len(data) or zlib.crc32(data[rec:end]) != crc:
+                break
+            key = data[rec:rec + klen].decode("utf-8")
+            self._forget(key)
+            if op == OP_PUT:
+                self.index[key] = (seg_id, start + rec + klen + llen, length)
+                self.labels[key] = data[rec + klen:rec + klen + llen].decode("utf-8")
+            else:
+                self._dead_bytes[seg_id] = self._dead_bytes.get(seg_id, 0) + (end - pos)
+            if changed is not None:
+                changed.add(key)
+            pos = end
+        if repair and pos < len(data):
+            print(f"[⚠️] Truncating torn record in {path} at byte {start + pos}")
+            with open(path, "r+b") as f:
+                f.truncate(start + pos)
+        self._segment_bytes[seg_id] = start + pos
+
+    def refresh(self):
+        """
+        Catch up with records other processes appended since we last looked.
+        Returns the set of keys that changed, or None if the log was rewritten
+        underneath us (compaction elsewhere) and the index had to be rebuilt.
+        """
+        with self._lock, self._file_lock.held(shared=True):
+            ids = self._segment_ids()
+            on_disk = {}
+            for seg_id in ids:
+                try:
+                    st = os.stat(self._segment_path(seg_id))
+                except FileNotFoundError:
+                    continue
+                on_disk[seg_id] = st
+            for seg_id, known in self._segment_bytes.items():
+                st = on_disk.get(seg_id)
+                if st is None or st.st_ino != self._inodes.get(seg_id) or st.st_size < known:
+                    self._load()
+                    return None
+
+            changed = set()
+            for seg_id, st in sorted(on_disk.items()):
+                known = self._segment_bytes.get(seg_id, 0)
+                if st.st_size > known:
+                    self._scan(seg_id, start=known, changed=changed)
+            if on_disk and max(on_disk) > self._active_id:
+                self._open_writer(max(on_disk))
+            return changed
+
+    def _forget(self, key: str):
+        old = self.index.pop(key, None)
+        if old is not None:
+            seg_id, _, length = old
+            self._dead_bytes[seg_id] = self._dead_bytes.get(seg_id, 0) + length
+        self.labels.pop(key, None)
+
+    def _reader(self, seg_id: int):
+        f = self._readers.get(seg_id)
+        if f is None:
+            f = self._readers[seg_id] = open(self._segment_path(seg_id), "rb")
+        return f
+
+    def _roll(self):
+        self._open_writer(self._active_id + 1)
+
+    def _close_readers(self):
+        for reader in self._readers.values():
+            reader.close()
+        self._readers.clear()
+
+    # === Key/value API ===
+    def __contains__(self, key: str) -> bool:
+        return key in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def keys(self) -> list:
+        return list(self.index)
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            loc = self.index.get(key)
+            if loc is None:
+                return None
+            seg_id, offset, length = loc
+            if seg_id == self._active_id:
+                self._writer.flush()
+            return os.pread(self._reader(seg_id).fileno(), length, offset)
+
+    def items(self):
+        """
+        Yield (key, payload) for every live key, reading each segment once.
+        The segments are opened under the locks, so a compaction that replaces
+        or unlinks them mid-iteration leaves this snapshot readable.
+        """
+        with self._lock, self._file_lock.held(shared=True):
+            self.refresh()
+            self._writer.flush()
+            by_segment = {}
+            for key, (seg_id, offset, length) in self.index.items():
+                by_segment.setdefault(seg_id, []).append((offset, length, key))
+            files = {seg_id: open(self._segment_path(seg_id), "rb") for seg_id in by_segment}
+        try:
+            for seg_id in sorted(by_segment):
+                with files.pop(seg_id) as f:
+                    data = f.read()
+                for offset, length, key in sorted(by_segment[seg_id]):
+                    yield key, data[offset:offset + length]
+        finally:
+            for f in files.values():
+                f.close()
+
+    def write_batch(self, puts=(), deletes=(), durable: bool = True):
+        """
+        Append puts [(key, label, payload)] and deletes [key] as one write,
+        fsynced unless durable=False. Holds the directory lock, so concurrent
+        processes never interleave records.
+        """
+        with self._lock, self._file_lock:
+            self.refresh()
+            if self._segment_bytes[self._active_id] >= self.max_segment_bytes:
+                self._roll()
+            base = self._segment_bytes[self._active_id]
+            chunks = []
+            pos = base
+            placed = []
+            for key, label, payload in puts:
+                record = encode_record(OP_PUT, key, label, payload)
+                header = RECORD_HEADER.size + len(key.encode("utf-8")) + len(label.encode("utf-8")[:0xFFFF])
+                placed.append((key, label, pos + header, len(payload)))
+                chunks.append(record)
+                pos += len(record)
+            tombstones = [key for key in deletes if key in self.index]
+            for key in tombstones:
+                record = encode_record(OP_DELETE, key, "", b"")
+                chunks.append(record)
+                pos += len(record)
+            if not chunks:
+                return
+            self._writer.write(b"".join(chunks))
+            self._writer.flush()
+            if durable:
+                os.fsync(self._writer.fileno())
+            self._segment_bytes[self._active_id] = pos
+
+            for key, label, offset, length in placed:
+                self._forget(key)
+                self.index[key] = (self._active_id, offset, length)
+                self.labels[key] = label
+            for key in tombstones:
+                self._forget(key)
+
+    def put(self, key: str, payload: bytes, label: str = ""):
+        self.write_batch(puts=[(key, label, payload)])
+
+    def delete(self, key: str):
+        self.write_batch(deletes=[key])
+
+    # === Compaction ===
+    def garbage_ratio(self) -> float:
+        total = sum(self._segment_bytes.values())
+        return self.dead_bytes() / total if total else 0.0
+
+    def dead_bytes(self) -> int:
+        return sum(self._dead_bytes.values())
+
+    def needs_compaction(self) -> bool:
+        return self.dead_bytes() >= COMPACT_MIN_BYTES and self.garbage_ratio() >= COMPACT_GARBAGE_RATIO
+
+    def compact(self):
+        """
+        Rewrite the live records of all sealed segments into one segment.
+        The active segment is sealed first, so writers are never blocked on the copy.
+        Only one process compacts a directory at a time; the others skip.
+        """
+        if not self._compact_lock.acquire(blocking=False):
+            return
+        try:
+            self._compact()
+        finally:
+            self._compact_lock.release()
+
+    def _compact(self):
+        with self._lock, self._file_lock:
+            self._finish_compaction()
+            self.refresh()
+            if self._segment_bytes[self._active_id]:
+                self._roll()  # seal it; an empty active segment is left as it is
+            sealed = sorted(s for s in self._segment_bytes if s != self._active_id)
+            if not sealed or (len(sealed) == 1 and not self._dead_bytes.get(sealed[0])):
+                return  # nothing to merge or reclaim
+            live = [(key, loc) for key, loc in self.index.items() if loc[0] in sealed]
+            sources = {seg_id: open(self._segment_path(seg_id), "rb") for seg_id in sealed}
+
+        target = sealed[-1]
+        tmp_path = self._segment_path(target) + ".compact"
+        moved = {}
+        with open(tmp_path, "wb") as out:
+            pos = 0
+            for key, (seg_id, offset, length) in sorted(live, key=lambda kv: kv[1]):
+                payload = os.pread(sources[seg_id].fileno(), length, offset)
+                label = self.labels.get(key, "")
+                record = encode_record(OP_PUT, key, label, payload)
+                header = len(record) - length
+                moved[key] = ((seg_id, offset, length), (target, pos + header, length))
+                out.write(record)
+                pos += len(record)
+            out.flush()
+            os.fsync(out.fileno())
+        for f in sources.values():
+            f.close()
+
+        with self._lock, self._file_lock:
+            self.refresh()  # records other processes wrote during the copy win
+            for seg_id in sealed:
+                reader = self._readers.pop(seg_id, None)
+                if reader:
+                    reader.close()
+            # The manifest makes the swap and the unlinks one step across a crash.
+            with atomic_file(os.path.join(self.directory, MANIFEST), "w", encoding="utf-8") as f:
+                json.dump({"target": target, "obsolete": sealed[:-1]}, f)
+            os.replace(tmp_path, self._segment_path(target))
+            fsync_directory(self.directory)
+            self._finish_compaction()
+            for seg_id in sealed:
+                self._segment_bytes.pop(seg_id, None)
+                self._dead_bytes.pop(seg_id, None)
+                self._inodes.pop(seg_id, None)
+            self._segment_bytes[target] = pos
+            self._inodes[target] = os.stat(self._segment_path(target)).st_ino
+            relocated = {}
+            for key, (old, new) in moved.items():
+                if self.index.get(key) == old:
+                    self.index[key] = new
+                    relocated[key] = (old, new)
+                else:
+                    self._dead_bytes[target] = self._dead_bytes.get(target, 0) + new[2]
+        # Outside the lock: listeners take their own locks.
+        for listener in self._relocation_listeners:
+            listener(relocated)
+
+    def add_relocation_listener(self, listener):
+        """listener({key: (old location, new location)}) runs after each compaction."""
+        self._relocation_listeners.append(listener)
+
+    def compact_in_background(self) -> bool:
+        """Start a compaction thread if enough garbage has piled up."""
+        if self._compactor and self._compactor.is_alive():
+            return False
+        if not self.needs_compaction():
+            return False
+        self._compactor = threading.Thread(target=self.compact, name="segment-compactor", daemon=True)
+        self._compactor.start()
+        return True
+
+    def close(self):
+        if self._compactor:
+            self._compactor.join()
+        with self._lock:
+            self._writer.close()
+            self._close_readers()
@@ -0,0 +1,257 @@
+# sqlite_repository.py
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+
+ENTITY_DB_ENV_VAR = "AGIBUDDY_ENTITY_DB"
+ENTITY_DB = os.getenv(ENTITY_DB_ENV_VAR, "entities.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entities (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    status TEXT,
+    archetype TEXT,
+    drift REAL,
+    ess REAL,
+    sd REAL,
+    memory_lines INTEGER,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entities_status_drift ON entities (status, drift);
+CREATE INDEX IF NOT EXISTS idx_entities_archetype_drift ON entities (archetype, drift);
+CREATE INDEX IF NOT EXISTS idx_entities_drift ON entities (drift);
+CREATE INDEX IF NOT EXISTS idx_entities_ess ON entities (ess);
+CREATE INDEX IF NOT EXISTS idx_entities_sd ON entities (sd);
+CREATE INDEX IF NOT EXISTS idx_entities_memory_lines ON entities (memory_lines);
+
+CREATE TABLE IF NOT EXISTS batch_entities (
+    source TEXT NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT,
+    status TEXT,
+    archetype TEXT,
+    drift REAL,
+    ess REAL,
+    sd REAL,
+    memory_lines INTEGER,
+    body TEXT NOT NULL,
+    PRIMARY KEY (source, id)
+);
+CREATE INDEX IF NOT EXISTS idx_batch_drift ON batch_entities (source, drift);
+CREATE INDEX IF NOT EXISTS idx_batch_ess ON batch_entities (source, ess);
+CREATE INDEX IF NOT EXISTS idx_batch_memory_lines ON batch_entities (source, memory_lines);
+
+CREATE TABLE IF NOT EXISTS mirrors (
+    source TEXT PRIMARY KEY,
+    mtime_ns INTEGER,
+    size INTEGER
+);
+"""
+
+# query() keyword → SQL predicate on an indexed column
+RANGE_FILTERS = {
+    "drift_min": "drift >= ?", "drift_max": "drift <= ?",
+    "ess_min": "ess >= ?", "ess_max": "ess <= ?",
+    "sd_min": "sd >= ?", "sd_max": "sd <= ?",
+    "memory_min": "memory_lines >= ?",
+}
+
+
+def sqlite_enabled() -> bool:
+    return os.path.exists(ENTITY_DB)
+
+
+def record_columns(key: str, record: dict) -> tuple:
+    """Indexed columns of a dashboard record: id-keyed, with drift_level and stats{ess, sd}."""
+    stats = record.get("stats") or {}
+    return (
+        key,
+        record.get("name", key),
+        record.get("status", "active"),
+        record.get("archetype"),
+        record.get("drift_level"),
+        stats.get("ess"),
+        stats.get("sd"),
+        len(record.get("memory", [])),
+        json.dumps(record, separators=(",", ":")),
+    )
+
+
+def batch_record_columns(key: str, record: dict) -> tuple:
+    """Indexed columns of a batch-file record: name-keyed, with top-level drift/ess/sd."""
+    return (
+        key,
+        record.get("name", key),
+        record.get("status", "active"),
+        record.get("archetype"),
+        record.get("drift"),
+        record.get("ess"),
+        record.get("sd"),
+        len(record.get("memory", [])),
+        json.dumps(record, separators=(",", ":")),
+    )
+
+
+def file_stamp(path: str) -> tuple:
+    """What a mirror remembers of its source file to notice writes made behind its back."""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+class SQLiteEntityRepository:
+    """
+    Entity records in SQLite with indexed status/archetype/drift/ess/sd columns.
+    The two record shapes live in separate tables: by default the dashboard's
+    id-keyed log records (`entities`); with a source, the name-keyed records
+    of that batch file (`batch_entities`). Either way SQLite only mirrors the
+    primary store, which every write goes to first.
+    """
+
+    def __init__(self, path: str = ENTITY_DB, source: str = None):
+        self.path = path
+        self.source = source
+        self._local = threading.local()
+        self.connection.executescript(SCHEMA)
+        if source is None:
+            self._table, self._columns, self._scope = "entities", record_columns, ()
+        else:
+            self._table, self._columns, self._scope = "batch_entities", batch_record_columns, (source,)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _insert(self, records) -> int:
+        rows = [self._scope + self._columns(key, record) for key, record in records]
+        marks = ", ".join("?" * len(rows[0])) if rows else ""
+        if rows:
+            self.connection.executemany(f"INSERT OR REPLACE INTO {self._table} VALUES ({marks})", rows)
+        return len(rows)
+
+    def upsert(self, records) -> int:
+        """records: iterable of (key, record dict)."""
+        with self.connection:
+            return self._insert(records)
+
+    def _by_key(self) -> str:
+        where, _ = self._where()
+        return where + (" AND" if where else " WHERE") + " id = ?"
+
+    def delete(self, *keys) -> int:
+        with self.connection:
+            cur = self.connection.executemany(f"DELETE FROM {self._table}" + self._by_key(),
+                                              [self._scope + (k,) for k in keys])
+        return cur.rowcount
+
+    def replace_all(self, records, stamp: tuple = None) -> int:
+        """
+        Make this table (or this source's rows) exactly `records` in one
+        transaction; stamp, for a batch file's mirror, is its file_stamp().
+        """
+        where, params = self._where()
+        with self.connection:
+            self.connection.execute(f"DELETE FROM {self._table}" + where, params)
+            count = self._insert(records)
+            if self.source is not None:
+                self.connection.execute("INSERT OR REPLACE INTO mirrors VALUES (?, ?, ?)",
+                                        (self.source,) + tuple(stamp or (None, None)))
+        return count
+
+    def stamp(self) -> tuple | None:
+        """The source file_stamp() this mirror was last built from, if any."""
+        row = self.connection.execute("SELECT mtime_ns, size FROM mirrors WHERE source = ?",
+                                      (self.source,)).fetchone()
+        return tuple(row) if row else None
+
+    def get(self, key: str) -> dict | None:
+        row = self.connection.execute(f"SELECT body FROM {self._table}" + self._by_key(),
+                                      self._scope + (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def __len__(self):
+        return self.count()
+
+    def _where(self, status=None, archetype=None, flag=None, **ranges):
+        clauses, params = [], []
+        if self._scope:
+            clauses.append("source = ?")
+            params.extend(self._scope)
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if archetype is not None:
+            clauses.append("archetype = ?")
+            params.append(archetype)
+        if flag is not None:
+            # Not indexed; only narrows rows the other predicates already selected.
+            clauses.append("json_extract(body, ?) = 1")
+            params.append(f"$.{flag}")
+        for name, value in ranges.items():
+            if value is None:
+                continue
+            if name not in RANGE_FILTERS:
+                raise TypeError(f"Unknown query filter: {name}")
+            clauses.append(RANGE_FILTERS[name])
+            params.append(value)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, status=None, archetype=None, flag=None, order_by=None, limit=None, **ranges):
+        """
+        Yield (key, record) for entities matching every filter, e.g.
+        query(status="quarantined", archetype="witch", drift_min=0.4).
+        """
+        where, params = self._where(status, archetype, flag, **ranges)
+        sql = f"SELECT id, body FROM {self._table}" + where
+        if order_by in ("drift", "ess", "sd", "name"):
+            sql += f" ORDER BY {order_by}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        for key, body in self.connection.execute(sql, params):
+            yield key, json.loads(body)
+
+    def query_ids(self, status=None, archetype=None, flag=None, **ranges) -> list:
+        where, params = self._where(status, archetype, flag, **ranges)
+        return [row[0] for row in self.connection.execute(f"SELECT id FROM {self._table}" + where, params)]
+
+    def count(self, status=None, archetype=None, flag=None, **ranges) -> int:
+        where, params = self._where(status, archetype, flag, **ranges)
+        return self.connection.execute(f"SELECT COUNT(*) FROM {self._table}" + where, params).fetchone()[0]
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the SQLite entity index")
+    parser.add_argument("--db", default=ENTITY_DB, help="SQLite database path")
+    parser.add_argument("--import-json", metavar="PATH", help="Mirror a name-keyed entities.json(.gz)")
+    parser.add_argument("--import-entity-data", action="store_true", help="Import the dashboard entity log")
+    args = parser.parse_args()
+
+    repo = SQLiteEntityRepository(args.db)
+    if args.import_json:
+        from storage.backends import open_storage
+        mirror = open_storage(args.import_json).refresh_index(args.db)
+        print(f"✅ Mirrored {len(mirror)} entities from {args.import_json}")
+    if args.import_entity_data:
+        from utils.entity_loader import get_segment_store
+        records = ((key, json.loads(payload)) for key, payload in get_segment_store().items())
+        print(f"✅ Imported {repo.upsert(records)} entities from the entity log")
+    print(f"📊 {len(repo)} entities in {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,8 @@ from flask import Blueprint, request, render_template_string, redirect, url_for
 import os
 import json
 from datetime import datetime
-from utils.entity_loader import load_entities
+from storage.atomic import updating_json, write_json
+from utils.entity_cache import current_cache
 
 village_bp = Blueprint("village_bp", __name__, url_prefix="/village")
 
@@ -26,10 +27,11 @@ def load_villages():
                 villages[data["name"]] = data
     return villages
 
+def village_path(name):
+    return os.path.join(VILLAGE_DIR, f"{name}.json")
+
 def save_village(village):
-    path = os.path.join(VILLAGE_DIR, f"{village['name']}.json")
-    with open(path, "w") as f:
-        json.dump(village, f, indent=2)
+    write_json(village_path(village["name"]), village)
 
 @village_bp.route("/", methods=["GET", "POST"])
 def village_index():
@@ -71,6 +73,32 @@ def village_index():
     </body></html>
     """, villages=villages, message=message)
 
+def update_village(village, form):
+    """Apply a village page POST to the village in place; returns the message to show."""
+    msg = ""
+    if "assign_entity" in form:
+        eid = form.get("entity_id")
+        if eid and eid not in village["entities"]:
+            village["entities"].append(eid)
+            village["stats"]["population"] += 1
+            msg = f"✅ Assigned entity {eid} to {village['name']}"
+
+    if "build_structure" in form:
+        btype = form.get("structure_type")
+        owner = form.get("owner_id")
+        if btype in PREBUILT_STRUCTURES:
+            structure = {
+                "name": btype,
+                "built_at": datetime.now().isoformat(),
+                "owner": owner or "None",
+                "capacity": PREBUILT_STRUCTURES[btype]["capacity"],
+                "prosperity_boost": PREBUILT_STRUCTURES[btype]["prosperity_boost"]
+            }
+            village["buildings"].append(structure)
+            village["stats"]["prosperity"] += structure["prosperity_boost"]
+            msg = f"🏗 Built {btype} (Owner: {owner})"
+    return msg
+
 @village_bp.route("/<name>", methods=["GET", "POST"])
 def village_view(name):
     villages = load_villages()
@@ -78,33 +106,15 @@ def village_view(name):
     if not village:
         return f"❌ Village {name} not found."
 
-    entities = load_entities()
+    names = current_cache().names()
     msg = ""
 
     if request.method == "POST":
-        if "assign_entity" in request.form:
-            eid = request.form.get("entity_id")
-            if eid and eid not in village["entities"]:
-                village["entities"].append(eid)
-                village["stats"]["population"] += 1
-                msg = f"✅ Assigned entity {eid} to {name}"
-
-        if "build_structure" in request.form:
-            btype = request.form.get("structure_type")
-            owner = request.form.get("owner_id")
-            if btype in PREBUILT_STRUCTURES:
-                structure = {
-                    "name": btype,
-                    "built_at": datetime.now().isoformat(),
-                    "owner": owner or "None",
-                    "capacity": PREBUILT_STRUCTURES[btype]["capacity"],
-                    "prosperity_boost": PREBUILT_STRUCTURES[btype]["prosperity_boost"]
-                }
-                village["buildings"].append(structure)
-                village["stats"]["prosperity"] += structure["prosperity_boost"]
-                msg = f"🏗 Built {btype} (Owner: {owner})"
-
-        save_village(village)
+        # Re-read under the file's lock: another request may have saved since.
+        with updating_json(village_path(name)) as village:
+            if village is None:
+                return f"❌ Village {name} not found."
+            msg = update_village(village, request.form)
 
     return render_template_string("""
     <html><body style="background:#111;color:#0f0;font-family:monospace;padding:2rem;">
@@ -117,14 +127,14 @@ def village_view(name):
         <h3>🧍 Assigned Entities</h3>
         <ul>
         {% for eid in village.entities %}
-            <li>{{ eid }} — {{ entities[eid].name if eid in entities else 'Unknown' }}</li>
+            <li>{{ eid }} — {{ names.get(eid, 'Unknown') }}</li>
         {% endfor %}
         </ul>
 
         <form method="post">
             <select name="entity_id">
-                {% for eid, ent in entities.items() %}
-                    <option value="{{ eid }}">{{ ent.name }} ({{ eid }})</option>
+                {% for eid, name in names.items() %}
+                    <option value="{{ eid }}">{{ name }} ({{ eid }})</option>
                 {% endfor %}
             </select>
             <button type="submit" name="assign_entity">➕ Assign to Village</button>
@@ -141,8 +151,8 @@ def village_view(name):
             Owner:
             <select name="owner_id">
                 <option value="">None</option>
-                {% for eid, ent in entities.items() %}
-                    <option value="{{ eid }}">{{ ent.name }}</option>
+                {% for eid, name in names.items() %}
+                    <option value="{{ eid }}">{{ name }}</option>
                 {% endfor %}
             </select>
             <button type="submit" name="build_structure">🏗 Build</button>
@@ -158,4 +168,4 @@ def village_view(name):
 
         <a href="/village">← Back to All Villages</a>
     </body></html>
-    """, village=village, entities=entities, prebuilt=PREBUILT_STRUCTURES, msg=msg)
+    """, village=village, names=names, prebuilt=PREBUILT_STRUCTURES, msg=msg)